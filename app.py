@@ -5,24 +5,179 @@ Serves frontend and provides pathfinding API
 
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
+import hmac
 import os
+import re
 import sys
 import json
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from pathfinding import run_pathfinding
+from pathfinding import run_pathfinding, FloorNavigationConfig
 from multi_floor_pathfinder import find_multi_floor_path
+from fast_json import FastJSONProvider, encode_route
+from workload import WorkloadRecorder
+from floor_registry import FloorRegistry
+from route_cache import RouteCache, route_footprint
+from closures import ClosureStore, DEFAULT_CLOSURES_FILE
+from crowd_weights import parse_departure, slot_key
+from room_search import RoomIndex
+from course_index import CourseIndex
+from campus_router import CampusRouter, CAMPUS_FILE
+from search_pool import SearchPool, SearchPoolBusy, SearchTimeout, DEFAULT_TIMEOUT
 
 # Base paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 STATIC_DIR = os.path.join(BASE_DIR, 'frontend', 'public')
 
 app = Flask(__name__, static_folder=STATIC_DIR, static_url_path='')
+app.json = FastJSONProvider(app)
 CORS(app)
 
 DATA_DIR = os.path.join(BASE_DIR, 'output')
+TILES_DIR = os.path.join(DATA_DIR, 'tiles')
+
+# Tile paths are keyed by content hash, so clients may cache them forever
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+HASHED_TILE_PATH = re.compile(r'[^/]+/[0-9a-f]{16}/')
+
+# Optional workload capture: WORKLOAD_CAPTURE=<file.jsonl> logs routing requests for replay
+# (python benchmarks/replay_workload.py <file.jsonl>)
+workload_recorder = WorkloadRecorder(os.environ['WORKLOAD_CAPTURE']) if os.environ.get('WORKLOAD_CAPTURE') else None
+
+# Optional search processes: SEARCH_WORKERS=<n> runs route searches in n warm worker processes
+# (each holds the floor graphs) instead of request threads, which serialize on the GIL.
+# SEARCH_QUEUE caps searches queued or running (503 beyond it), SEARCH_TIMEOUT is seconds per search (504).
+# Forked here, before the warmup and watcher threads start.
+search_pool = None
+if int(os.environ.get('SEARCH_WORKERS', '0')) > 0:
+    search_pool = SearchPool(int(os.environ['SEARCH_WORKERS']), FloorNavigationConfig.get_available_floors(),
+                             FloorNavigationConfig.get_preload_floors(),
+                             max_pending=int(os.environ.get('SEARCH_QUEUE', '0')) or None,
+                             timeout=float(os.environ.get('SEARCH_TIMEOUT', DEFAULT_TIMEOUT))).start()
+
+# Floor graphs shared across requests, built in the background at startup
+# (WARMUP=0 skips it; requests then build graphs per call as before).
+# Changed DXF/labels/navigation files are rebuilt and swapped in while serving
+# (HOT_RELOAD=0 turns the watcher off); cached routes for that floor are dropped.
+floor_registry = FloorRegistry()
+route_cache = RouteCache()
+floor_registry.add_listener(route_cache.invalidate_floor)
+WARMUP_ENABLED = os.environ.get('WARMUP', '1') != '0'
+if WARMUP_ENABLED:
+    floor_registry.start_warmup()
+    if os.environ.get('HOT_RELOAD', '1') != '0':
+        floor_registry.start_watching()
+
+# Room name search (autocomplete, typo suggestions), rebuilt when a floor's labels are reloaded
+room_index = RoomIndex()
+
+
+def reindex_rooms(floor_name):
+    global room_index
+    room_index = RoomIndex()
+
+
+floor_registry.add_listener(reindex_rooms)
+
+# Class schedule lookups: course title / instructor / start time -> floor and room
+course_index = CourseIndex()
+
+
+
+def home_floors(building, floor_names):
+    """Campus router floor source: this building's floors come from the registry"""
+    if building != FloorNavigationConfig.MANIFEST.get('building'):
+        return None
+    return floor_registry.ensure(*floor_names).pathfinders
+
+
+# Routes between buildings (entrances and outdoor paths from data/campus.json, CAMPUS_FILE overrides)
+try:
+    campus_router = CampusRouter(CAMPUS_FILE, floor_source=home_floors)
+except (OSError, ValueError) as e:
+    print(f"[WARNING] Campus routing disabled: {e}")
+    campus_router = None
+
+# Runtime closures (construction, elevator outages) shared by all workers through one JSON file.
+# Admin endpoints need ADMIN_TOKEN set and sent as the X-Admin-Token header.
+closure_store = ClosureStore(os.environ.get('CLOSURES_FILE', DEFAULT_CLOSURES_FILE))
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+
+def _closure_matcher(entry, loosened):
+    """
+    Predicate(floors, footprint) for cached routes a closure change can affect
+
+    A new or stricter closure only invalidates routes that pass through the
+    element; reopening (or lowering a penalty) can shorten any route, so every
+    route on the floor (or every cross-floor route, for transitions) goes.
+    """
+    if entry['type'] == 'transition':
+        if loosened:
+            return lambda floors, footprint: len(floors) > 1
+        return lambda floors, footprint: ('transition', entry['name']) in footprint
+
+    floor = entry['floor']
+    if loosened:
+        return lambda floors, footprint: floor in floors
+    if entry['type'] == 'node':
+        nodes = [entry['node']]
+    elif entry['type'] == 'edge':
+        nodes = entry['nodes']
+    else:
+        pf = floor_registry.get(floor)
+        if pf is None:
+            return lambda floors, footprint: floor in floors
+        nodes = pf.room_to_nodes.get(entry['room'], [])
+    keys = [('node', floor, node) for node in nodes]
+    # An edge is only used if both ends are; a node or room if any of its nodes is
+    need = all if entry['type'] == 'edge' else any
+    return lambda floors, footprint: ('floor', floor) in footprint or need(key in footprint for key in keys)
+
+
+def invalidate_closed_routes(added, removed):
+    """Closure store listener: drop only the cached routes the change can affect"""
+    matchers = [_closure_matcher(e, False) for e in added] + [_closure_matcher(e, True) for e in removed]
+    dropped = route_cache.invalidate_where(lambda floors, footprint: any(m(floors, footprint) for m in matchers))
+    print(f"[CLOSURES] {len(added)} added, {len(removed)} removed; {dropped} cached route(s) dropped")
+
+
+closure_store.add_listener(invalidate_closed_routes)
+
+
+@app.before_request
+def capture_workload():
+    """Log routing request parameters when workload capture is enabled"""
+    if workload_recorder is not None:
+        workload_recorder.record(request.path, request.args)
+
+
+def route_response(result, etag=None, cache_key=None, floors=(), simplified=False, closures=None):
+    """
+    JSON response for a route result via the direct route serializer
+
+    Cached when cache_key is set, unless the closures the route was searched
+    with (closures) were replaced while it ran.
+    """
+    body = encode_route(result) + '\n'
+    if cache_key is not None:
+        still_valid = None
+        if closures is not None:
+            still_valid = lambda: closure_store.overlay.digest == closures.digest
+        route_cache.put(cache_key, floors, body, route_footprint(result, floors[0], exact=not simplified),
+                        still_valid=still_valid)
+    return encoded_response(body, etag)
+
+
+def encoded_response(body, etag=None):
+    """JSON response for an already encoded body; answers If-None-Match with 304"""
+    response = app.response_class(body, mimetype='application/json')
+    if etag:
+        response.set_etag(etag)
+        response.make_conditional(request)
+    return response
 
 
 @app.route('/')
@@ -40,7 +195,11 @@ def get_pathfinding():
       - start: room ID (e.g. E100) OR
       - start_x, start_y: pixel coordinates to find nearest node
       - end_floor: destination floor name
-      - end: destination room ID
+      - end: destination room ID OR
+      - course: course title from the class schedule (with optional instructor); routes to
+        the room of the meeting in progress at depart_at (default now), else the next one
+      - simplify: 'true' to merge collinear waypoints and add turn-by-turn instructions
+      - depart_at: 'now' or ISO datetime (e.g. 2025-10-20T10:15) to avoid class-change crowds
       
     For backward compatibility, 'floor' param applies to both start and end if start_floor/end_floor not specified
     """
@@ -55,6 +214,19 @@ def get_pathfinding():
         start_x = request.args.get('start_x')
         start_y = request.args.get('start_y')
         start_room = request.args.get('start', '').upper()
+        simplify = request.args.get('simplify', 'false').lower() == 'true'
+        depart_at = request.args.get('depart_at')
+        departure = parse_departure(depart_at) if depart_at else None
+
+        # "Route me to my class": the course's meeting decides the destination floor and room
+        course = request.args.get('course')
+        meeting = None
+        if course and not end:
+            try:
+                meeting = course_index.resolve(course, request.args.get('instructor'), departure)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 404
+            end_floor, end = meeting['floor'], meeting['room']
 
         print(f"\n[DEBUG] Pathfinding request:")
         print(f"  Start floor: {start_floor}")
@@ -64,7 +236,34 @@ def get_pathfinding():
         print(f"  End room: {end}")
 
         if not end:
-            return jsonify({'error': 'Destination room (end) must be specified'}), 400
+            return jsonify({'error': 'Destination room (end) or course must be specified'}), 400
+
+        # One snapshot per request (lazy floors are built first): a floor reload mid-request
+        # does not change its graphs.
+        # The ETag follows the floors' input files and closures; the cache key only the files,
+        # since closure changes drop exactly the cached routes they affect.
+        # (current() re-reads the closures first, so that invalidation happens before the lookup;
+        # a route searched with closures replaced meanwhile is not stored, see route_response.)
+        # Departures key on their crowd time slot, so depart_at=now is not cached across slots.
+        # Course routes key on the resolved meeting, which the response describes and which
+        # changes over the week even when the query string does not.
+        closures = closure_store.current()
+        snapshot = floor_registry.ensure(start_floor, end_floor)
+        floors = (start_floor, end_floor)
+        snapshot.check(floors)
+        data_etag = snapshot.etag(floors)
+        slot = slot_key(departure) if departure else None
+        if data_etag and slot:
+            data_etag = f'{data_etag}-t{slot[0]}.{slot[1]}'
+        if data_etag and meeting:
+            data_etag = f'{data_etag}-m{CourseIndex.meeting_id(meeting)}'
+        cache_key = (data_etag, request.query_string, slot, end_floor, end) if data_etag else None
+        etag = f'{data_etag}-c{closures.etag_part(floors)}' if data_etag and closures.entries else data_etag
+        if cache_key is not None:
+            body = route_cache.get(cache_key)
+            if body is not None:
+                print(f"[DEBUG] Route cache hit ({etag})")
+                return encoded_response(body, etag)
 
         # Determine start point
         if start_x and start_y:
@@ -109,6 +308,12 @@ def get_pathfinding():
         if not start_room:
             return jsonify({'error': 'Start position must be specified (room ID or coordinates)'}), 400
 
+        # Reject unknown rooms from the name index, before any graph work
+        for room_floor, room in ((start_floor, start_room), (end_floor, end)):
+            if room_floor in room_index.floors and not room_index.contains(room_floor, room):
+                return jsonify({'error': f"Room '{room}' not found on {room_floor}",
+                                'suggestions': room_index.suggest(room, room_floor)}), 404
+
         # Check if this is multi-floor pathfinding
         if start_floor != end_floor:
             # Get ADA compliance setting
@@ -118,31 +323,53 @@ def get_pathfinding():
             print(f"[DEBUG] Multi-floor pathfinding: {start_floor}/{start_room} -> {end_floor}/{end}")
             print(f"[DEBUG] Mode: {mode_text.upper()}")
             
-            result = find_multi_floor_path(start_floor, start_room, end_floor, end, ada_compliance)
+            if search_pool is not None:
+                result = search_pool.search(snapshot, start_floor, start_room, end_floor, end, ada_compliance,
+                                            simplify, closures=closures, departure=departure)
+            else:
+                result = find_multi_floor_path(start_floor, start_room, end_floor, end, ada_compliance, simplify,
+                                               multi_floor=snapshot.multi_floor_for(floors), closures=closures,
+                                               departure=departure)
             
             if result is None:
                 print(f"[DEBUG] No path found between floors")
                 return jsonify({'error': f'No {mode_text} path found from {start_floor}/{start_room} to {end_floor}/{end}'}), 404
             
             print(f"[DEBUG] Multi-floor path found! {len(result.get('waypoints', []))} total waypoints")
-            return jsonify(result)
+            if meeting:
+                result['course'] = CourseIndex.describe(meeting)
+            return route_response(result, etag, cache_key, floors, simplify, closures)
         else:
             # Single floor pathfinding
             print(f"[DEBUG] Single floor pathfinding: {start_room} -> {end}")
             
             # Run pathfinding (skip image generation for speed)
-            result = run_pathfinding(start_floor, start_room, end, export_json=False, generate_image=False)
+            if search_pool is not None:
+                result = search_pool.search(snapshot, start_floor, start_room, start_floor, end,
+                                            simplify=simplify, closures=closures, departure=departure)
+            else:
+                result = run_pathfinding(start_floor, start_room, end, export_json=False, generate_image=False,
+                                         simplify=simplify, pathfinder=snapshot.get(start_floor),
+                                         closures=closures.for_floor(start_floor), departure=departure)
 
             if result is None:
                 print(f"[DEBUG] No path found between {start_room} and {end}")
                 return jsonify({'error': f'No path found between {start_room} and {end}'}), 404
 
             print(f"[DEBUG] Path found! {len(result.get('waypoints', []))} waypoints")
-            return jsonify(result)
+            if meeting:
+                result['course'] = CourseIndex.describe(meeting)
+            return route_response(result, etag, cache_key, floors, simplify, closures)
 
     except ValueError as e:
         print(f"[DEBUG] ValueError: {e}")
         return jsonify({'error': str(e)}), 400
+    except SearchPoolBusy as e:
+        print(f"[WARNING] {e}")
+        return jsonify({'error': 'Server busy, try again shortly'}), 503, {'Retry-After': '1'}
+    except SearchTimeout as e:
+        print(f"[WARNING] {e}")
+        return jsonify({'error': str(e)}), 504
     except Exception as e:
         print(f"[DEBUG] Exception in pathfinding: {e}")
         import traceback
@@ -150,6 +377,109 @@ def get_pathfinding():
         return jsonify({'error': f'Pathfinding error: {str(e)}'}), 500
 
 
+@app.route('/api/rooms/search')
+def search_rooms():
+    """
+    Room autocomplete and typo-tolerant lookup
+    Query params: q (text typed so far), floor (optional), limit (default 10)
+    Returns: matches ranked exact, then prefix, then by edit distance
+    """
+    query = request.args.get('q', '')
+    floor = request.args.get('floor', '').lower() or None
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), 100)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    return jsonify({'query': query, 'results': room_index.search(query, floor, limit)})
+
+
+@app.route('/api/courses')
+def find_courses():
+    """
+    Class meetings from the schedule
+    Query params: course (title), instructor, or at (ISO datetime: meetings starting then)
+    """
+    try:
+        at = request.args.get('at')
+        when = parse_departure(at) if at else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    course = request.args.get('course')
+    instructor = request.args.get('instructor')
+    if not (course or instructor or when):
+        return jsonify({'courses': course_index.courses()})
+    meetings = course_index.find(course, instructor, when)
+    return jsonify({'meetings': [CourseIndex.describe(meeting) for meeting in meetings]})
+
+
+@app.route('/api/campus')
+def get_campus():
+    """Buildings on the campus map with their routable floors and entrances"""
+    if campus_router is None:
+        return jsonify({'error': 'No campus map configured'}), 404
+    return jsonify(campus_router.describe())
+
+
+@app.route('/api/campus/route')
+def get_campus_route():
+    """
+    Route between rooms in (possibly) different buildings
+    Query params: start_building, start_floor, start, end_building, end_floor, end,
+      ada_compliance, simplify, depart_at
+    Returns: indoor legs (same format as /api/pathfinding) joined by an outdoor leg
+    """
+    if campus_router is None:
+        return jsonify({'error': 'No campus map configured'}), 404
+    try:
+        args = request.args
+        home = FloorNavigationConfig.MANIFEST.get('building')
+        start_building = args.get('start_building', home)
+        end_building = args.get('end_building', start_building)
+        start, end = args.get('start', ''), args.get('end', '')
+        if not start or not end:
+            return jsonify({'error': 'Start and end rooms must be specified'}), 400
+        depart_at = args.get('depart_at')
+        departure = parse_departure(depart_at) if depart_at else None
+        start_floor = args.get('start_floor', 'floor_1').lower()
+        end_floor = args.get('end_floor', 'floor_1').lower()
+
+        # Routes inside the home building are tagged like /api/pathfinding: floor files,
+        # closures and crowd slot (other buildings' floors are not fingerprinted, so no ETag)
+        closures = closure_store.current()
+        etag = None
+        if start_building == end_building == home:
+            floors = (start_floor, end_floor)
+            etag = floor_registry.ensure(*floors).etag(floors)
+            if etag and departure:
+                slot = slot_key(departure)
+                etag = f'{etag}-t{slot[0]}.{slot[1]}'
+            if etag and closures.entries:
+                etag = f'{etag}-c{closures.etag_part(floors)}'
+
+        result = campus_router.find_route(
+            start_building, start_floor, start,
+            end_building, end_floor, end,
+            ada_compliance=args.get('ada_compliance', 'false').lower() == 'true',
+            simplify=args.get('simplify', 'false').lower() == 'true',
+            departure=departure, closures=closures
+        )
+        print(f"[DEBUG] Campus route {start_building}/{start} -> {end_building}/{end}: "
+              f"{len(result['legs'])} legs, {result['stats']['refined']} entrance pairs refined")
+        response = jsonify(result)
+        if etag:
+            response.set_etag(etag)
+            response.make_conditional(request)
+        return response
+    except ValueError as e:
+        print(f"[DEBUG] ValueError: {e}")
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"[DEBUG] Exception in campus routing: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': f'Campus routing error: {str(e)}'}), 500
+
+
 @app.route('/api/find-closest-node')
 def find_closest_node():
     """
@@ -175,8 +505,8 @@ def find_closest_node():
             nav_data = json.load(f)
         
         # Get calibration data to convert DXF to pixels
-        # Standard scale: 25.4 pixels per DXF unit (based on Scott Lab floor plans)
-        PIXELS_PER_UNIT = 25.4
+        # Pixels per DXF unit (manifest calibration, 25.4 for the Scott Lab floor plans)
+        PIXELS_PER_UNIT = FloorNavigationConfig.pixels_per_unit()
         
         # Find closest node to clicked position
         min_distance = float('inf')
@@ -234,10 +564,17 @@ def get_navigation_data(floor):
         if not os.path.exists(json_file):
             return jsonify({'error': f'Navigation data not found for floor: {floor}'}), 404
 
+        etag = floor_registry.snapshot.etag([floor])
+        if etag and request.if_none_match.contains(etag):
+            return encoded_response('', etag)
+
         with open(json_file, 'r') as f:
             data = json.load(f)
 
-        return jsonify(data)
+        response = jsonify(data)
+        if etag:
+            response.set_etag(etag)
+        return response
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -250,7 +587,7 @@ def get_available_floors():
     """
     try:
         floors = []
-        for floor in ['basement', 'floor_1', 'floor_2']:
+        for floor in FloorNavigationConfig.get_available_floors():
             json_file = os.path.join(DATA_DIR, f'{floor}_navigation.json')
             if os.path.exists(json_file):
                 floors.append(floor)
@@ -261,6 +598,44 @@ def get_available_floors():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/tiles')
+def get_tile_manifest():
+    """
+    Get the floor plan tile manifest (zoom levels, tile URL template, previews)
+    Built by: python src/build_tiles.py
+    """
+    manifest_file = os.path.join(TILES_DIR, 'manifest.json')
+    if not os.path.exists(manifest_file):
+        return jsonify({'error': 'Tiles not built. Run: python src/build_tiles.py'}), 404
+
+    stat = os.stat(manifest_file)
+    with open(manifest_file, 'r') as f:
+        manifest = json.load(f)
+
+    # Revalidated on every use: a rebuild points the manifest at new tile hashes
+    response = jsonify(manifest)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.set_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+    return response.make_conditional(request)
+
+
+@app.route('/tiles/<path:filename>')
+def serve_tile(filename):
+    """
+    Serve floor plan tiles and previews
+
+    Files under <floor>/<content_hash>/ never change and are cached as
+    immutable; anything else (manifest.json) is revalidated by ETag.
+    """
+    if HASHED_TILE_PATH.match(filename):
+        response = send_from_directory(TILES_DIR, filename, max_age=31536000)
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE
+        return response
+    response = send_from_directory(TILES_DIR, filename, max_age=0)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
 @app.route('/output/<path:filename>')
 def serve_output(filename):
     """Serve files from output directory (for navigation JSON)"""
@@ -269,10 +644,60 @@ def serve_output(filename):
 
 @app.route('/health')
 def health():
-    """Health check endpoint"""
+    """Health check endpoint (process is up; see /ready for traffic readiness)"""
     return jsonify({'status': 'ok'})
 
 
+@app.route('/ready')
+def ready():
+    """
+    Readiness check: 200 once every floor graph is built and indexed, 503 before
+    (always 200 with WARMUP=0: graphs are then built per request, nothing to wait for)
+    Reports per-floor status, build/index durations, graph size and process memory
+    """
+    report = floor_registry.report()
+    if not WARMUP_ENABLED:
+        report.update(status='ready', warmup='disabled')
+    report['route_cache'] = route_cache.stats()
+    if search_pool is not None:
+        report['search_pool'] = search_pool.stats()
+    return jsonify(report), (200 if report['status'] == 'ready' else 503)
+
+
+def admin_authorized():
+    """True if the request carries the configured admin token"""
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+@app.route('/api/admin/closures', methods=['GET', 'POST'])
+def admin_closures():
+    """
+    List (GET) or add (POST) runtime closures
+    POST body: {"type": "node"|"edge"|"room"|"transition", "floor": ..., "node": id | "nodes": [a, b] |
+                "room": "W170" | "name": "WElev2", "penalty": extra distance (omit to close), "reason": ...}
+    """
+    if not admin_authorized():
+        return jsonify({'error': 'Admin token required (set ADMIN_TOKEN, send X-Admin-Token)'}), 403
+    if request.method == 'GET':
+        return jsonify({'closures': closure_store.list()})
+    try:
+        closure = closure_store.add(request.get_json(silent=True), floor_registry.floors)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(closure), 201
+
+
+@app.route('/api/admin/closures/<closure_id>', methods=['DELETE'])
+def admin_remove_closure(closure_id):
+    """Reopen: delete a closure by id"""
+    if not admin_authorized():
+        return jsonify({'error': 'Admin token required (set ADMIN_TOKEN, send X-Admin-Token)'}), 403
+    if not closure_store.remove(closure_id):
+        return jsonify({'error': f'No closure with id {closure_id}'}), 404
+    return jsonify({'removed': closure_id})
+
+
 @app.route('/api/routes')
 def list_routes():
     """List all registered routes for debugging"""
@@ -305,8 +730,17 @@ if __name__ == '__main__':
     print("  GET  /                         -> Frontend app")
     print("  GET  /api/pathfinding          -> Calculate route (params: floor, start, end)")
     print("  GET  /api/navigation/<floor>   -> Get floor navigation data")
+    print("  GET  /api/rooms/search         -> Room autocomplete (params: q, floor, limit)")
+    print("  GET  /api/courses              -> Class meetings (params: course, instructor, at)")
+    print("  GET  /api/campus               -> Buildings and entrances on the campus map")
+    print("  GET  /api/campus/route         -> Route between buildings (start_building, start_floor, start, ...)")
     print("  GET  /api/available-floors     -> List available floors")
+    print("  GET  /api/tiles                -> Floor plan tile manifest")
     print("  GET  /health                   -> Health check")
+    print("  GET  /ready                    -> Readiness (floor warmup status)")
+    print("  GET/POST/DELETE /api/admin/closures -> Runtime closures (X-Admin-Token)")
+    if search_pool is not None:
+        print(f"\nSearch pool: {search_pool.workers} worker process(es), queue depth {search_pool.max_pending}")
     print("\nExample Requests:")
     print("  http://localhost:5000/api/pathfinding?floor=floor_1&start=E100&end=W170")
     print("  http://localhost:5000/api/navigation/floor_1")
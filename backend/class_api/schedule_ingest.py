@@ -0,0 +1,346 @@
+"""
+Class Schedule Ingester
+Pages through the OSU class-search API concurrently and keeps the Scott Lab meetings in a room-indexed store
+
+Usage: python schedule_ingest.py [--query Scott] [--output scott_lab_schedule.csv] [--workers 4] [--max-age 3600]
+
+Pages are fetched over keep-alive connections (one per worker thread), cached on disk
+with their ETag/Last-Modified and re-requested conditionally, so an unchanged page
+costs a 304 and is not parsed again.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlencode, urlsplit
+import argparse
+import csv
+import hashlib
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+
+
+BASE_URL = "https://content.osu.edu/v2/classes/search"
+DEFAULT_PARAMS = {"q": "Scott", "campus": "col"}
+FACILITY = "Scott"
+
+CLASS_API_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(CLASS_API_DIR, '.cache')
+OUTPUT_CSV = os.path.join(CLASS_API_DIR, 'scott_lab_schedule.csv')
+
+CSV_COLUMNS = ['Course', 'Instructor', 'Room', 'Days', 'Start', 'End', 'Enrolled', 'Status']
+DAY_FIELDS = (('Mon', 'monday'), ('Tue', 'tuesday'), ('Wed', 'wednesday'), ('Thu', 'thursday'), ('Fri', 'friday'))
+
+# Retries for connection errors and 5xx responses (backoff doubles each time)
+RETRIES = 3
+RETRY_BACKOFF = 0.5
+TIMEOUT = 30
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections to one host, one per thread
+
+    Worker threads each reuse their own connection, so paging through the API
+    costs one TCP/TLS handshake per worker instead of one per page.
+    """
+
+    def __init__(self, base_url, timeout=TIMEOUT):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.netloc
+        self.path = parts.path or '/'
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            factory = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+            conn = factory(self.host, timeout=self.timeout)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def get(self, params, headers=None):
+        """
+        GET base_url?params
+
+        Returns:
+            (status, response headers dict, body bytes)
+        """
+        url = f'{self.path}?{urlencode(params)}'
+        headers = dict(headers or {}, **{'Accept': 'application/json', 'Connection': 'keep-alive'})
+        for attempt in range(RETRIES + 1):
+            conn = self._connection()
+            try:
+                conn.request('GET', url, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+                with self._lock:
+                    self.requests += 1
+                if response.status < 500 or attempt == RETRIES:
+                    return response.status, {k.lower(): v for k, v in response.getheaders()}, body
+            except (OSError, http.client.HTTPException):
+                # Server closed the kept-alive connection (or it failed); reconnect
+                conn.close()
+                self._local.conn = None
+                if attempt == RETRIES:
+                    raise
+            time.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+
+
+class PageCache:
+    """
+    Raw API pages on disk, one JSON file per request: {'url', 'etag', 'last_modified', 'fetched', 'body'}
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest()[:16] + '.json')
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == key else None
+
+    def put(self, key, body, headers):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {
+            'url': key,
+            'etag': headers.get('etag'),
+            'last_modified': headers.get('last-modified'),
+            'fetched': time.time(),
+            'body': body.decode('utf-8'),
+        }
+        path = self._path(key)
+        tmp_file = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_file, path)
+        return entry
+
+    def touch(self, key, entry):
+        """Record that a cached page was revalidated (304) just now"""
+        entry['fetched'] = time.time()
+        path = self._path(key)
+        tmp_file = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_file, path)
+
+
+class ScheduleStore:
+    """
+    Class meetings indexed by room ('E205'), deduplicated
+
+    Rooms are keyed without the building name, which is kept once per room
+    ('Scott Lab') for writing the CSV. Each meeting is a tuple
+    (course, instructor, days, start, end, enrolled, status) with days like
+    'Tue, Thu' and times as the API reports them ('2:20 pm').
+    Strings are interned, so repeated course titles and times are stored once.
+    """
+
+    def __init__(self):
+        self.by_room = {}
+        self.buildings = {}
+        self.count = 0
+
+    def add(self, room, meeting, building='Scott Lab'):
+        """Add a meeting; returns False if the room already had it"""
+        meeting = tuple(sys.intern(v) if isinstance(v, str) else v for v in meeting)
+        room = sys.intern(room)
+        meetings = self.by_room.setdefault(room, {})
+        self.buildings.setdefault(room, building)
+        if meeting in meetings:
+            return False
+        meetings[meeting] = None
+        self.count += 1
+        return True
+
+    def rooms(self):
+        return sorted(self.by_room)
+
+    def meetings(self, room):
+        return list(self.by_room.get(room.upper(), ()))
+
+    def write_csv(self, output_csv):
+        """Write the schedule CSV (same columns as the frontend's scott_lab_schedule.csv)"""
+        tmp_file = f'{output_csv}.{os.getpid()}.tmp'
+        with open(tmp_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_COLUMNS)
+            for room in self.rooms():
+                label = f'{self.buildings[room]} {room}'
+                for course, instructor, days, start, end, enrolled, status in self.by_room[room]:
+                    writer.writerow([course, instructor, label, days, start, end, enrolled, status])
+        os.replace(tmp_file, output_csv)
+        return output_csv
+
+
+def iter_meetings(page, facility=FACILITY):
+    """
+    Yield (room, meeting, building) for every meeting of a page held in the facility
+
+    Args:
+        page: Decoded API response ({'data': {'courses': [...]}})
+        facility: Building name to keep (matched against facilityDescription)
+    """
+    for course in (page.get('data') or {}).get('courses') or []:
+        for section in course.get('sections') or []:
+            meetings = section.get('meetings') or []
+            if not any(facility in (m.get('facilityDescription') or '') for m in meetings):
+                continue
+            title = section.get('courseTitle') or (course.get('course') or {}).get('title') or ''
+            instructor = ', '.join(i.get('displayName') or '' for i in section.get('instructors') or [])
+            enrolled = section.get('enrollmentTotal')
+            status = section.get('enrollmentStatus') or ''
+            for meeting in meetings:
+                if facility not in (meeting.get('facilityDescription') or ''):
+                    continue
+                room = str(meeting.get('room') or '').strip().upper()
+                if not room:
+                    continue
+                days = ', '.join(day for day, field in DAY_FIELDS if meeting.get(field))
+                yield room, (title, instructor, days, meeting.get('startTime') or '',
+                             meeting.get('endTime') or '', enrolled, status), meeting['facilityDescription'].strip()
+
+
+class ScheduleIngester:
+    """
+    Concurrent, cached pager over the class-search API
+
+    The first page is fetched alone to learn the page count; the rest are
+    fetched by a thread pool and parsed into the store as they arrive.
+    A cached page younger than max_age is used without any request
+    (incremental runs); older ones are revalidated with If-None-Match /
+    If-Modified-Since and only re-parsed when the server sends a new body.
+    """
+
+    def __init__(self, base_url=BASE_URL, params=None, cache_dir=CACHE_DIR, workers=4, max_age=0,
+                 facility=FACILITY):
+        self.params = dict(params or DEFAULT_PARAMS)
+        self.pool = ConnectionPool(base_url)
+        self.cache = PageCache(cache_dir) if cache_dir else None
+        self.workers = workers
+        self.max_age = max_age
+        self.facility = facility
+        self.base_url = base_url
+        self.stats = {'pages': 0, 'fetched': 0, 'not_modified': 0, 'cached': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def fetch_page(self, page_number):
+        """Decoded page, from the cache when fresh or unchanged"""
+        params = dict(self.params, p=page_number)
+        key = f'{self.base_url}?{urlencode(sorted(params.items()))}'
+        entry = self.cache.get(key) if self.cache else None
+
+        if entry and self.max_age and time.time() - entry['fetched'] < self.max_age:
+            self._count('cached')
+            return json.loads(entry['body'])
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        status, response_headers, body = self.pool.get(params, headers)
+        if status == 304 and entry:
+            self._count('not_modified')
+            self.cache.touch(key, entry)
+            return json.loads(entry['body'])
+        if status != 200:
+            raise ValueError(f"Class search returned HTTP {status} for page {page_number}")
+
+        self._count('fetched')
+        if self.cache:
+            self.cache.put(key, body, response_headers)
+        return json.loads(body)
+
+    def ingest(self, store=None):
+        """
+        Fetch every page into a ScheduleStore
+
+        Returns:
+            The store (a new one unless given)
+        """
+        store = store if store is not None else ScheduleStore()
+        first = self.fetch_page(1)
+        self.stats['pages'] = total_pages = max(1, int((first.get('data') or {}).get('totalPages') or 1))
+        for room, meeting, building in iter_meetings(first, self.facility):
+            store.add(room, meeting, building)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+                futures = [pool.submit(self.fetch_page, n) for n in range(2, total_pages + 1)]
+                for future in as_completed(futures):
+                    for room, meeting, building in iter_meetings(future.result(), self.facility):
+                        store.add(room, meeting, building)
+        finally:
+            self.pool.close()
+        return store
+
+
+def main():
+    """Command-line interface"""
+    parser = argparse.ArgumentParser(description='Fetch the Scott Lab class schedule from the OSU class-search API')
+    parser.add_argument('--query', default=DEFAULT_PARAMS['q'], help='Search text (default: Scott)')
+    parser.add_argument('--campus', default=DEFAULT_PARAMS['campus'], help='Campus code (default: col)')
+    parser.add_argument('--term', help='Term code (default: the API\'s current term)')
+    parser.add_argument('--output', default=OUTPUT_CSV, help='Schedule CSV to write')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent page requests')
+    parser.add_argument('--max-age', type=float, default=0,
+                        help='Seconds a cached page is used without revalidating (default: always revalidate)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the page cache')
+    parser.add_argument('--base-url', default=BASE_URL, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    params = {'q': args.query, 'campus': args.campus}
+    if args.term:
+        params['term'] = args.term
+
+    print(f"Fetching classes mentioning '{args.query}'...")
+    started = time.perf_counter()
+    ingester = ScheduleIngester(args.base_url, params, cache_dir=None if args.no_cache else CACHE_DIR,
+                                workers=args.workers, max_age=args.max_age)
+    try:
+        store = ingester.ingest()
+    except Exception as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    stats = ingester.stats
+    print(f"[OK] {stats['pages']} page(s): {stats['fetched']} downloaded, {stats['not_modified']} not modified, "
+          f"{stats['cached']} from cache ({time.perf_counter() - started:.2f}s)")
+    if not store.count:
+        print("No results found — try removing campus filters or checking term codes.")
+        return
+    store.write_csv(args.output)
+    print(f"[OK] {store.count} Scott Lab meetings in {len(store.by_room)} rooms -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
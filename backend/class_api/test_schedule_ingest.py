@@ -0,0 +1,182 @@
+"""
+Tests for schedule_ingest.py against a local stand-in for the class-search API
+
+Run: python -m pytest backend/class_api/test_schedule_ingest.py
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import copy
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import schedule_ingest
+from schedule_ingest import ScheduleIngester, ScheduleStore
+
+
+def _meeting(room, facility='Scott Lab', days=('monday', 'wednesday'), start='9:10 am', end='10:05 am'):
+    meeting = {'facilityDescription': facility, 'room': room, 'startTime': start, 'endTime': end}
+    meeting.update({day: True for day in days})
+    return meeting
+
+
+def _section(title, meetings, enrolled=30, instructors=()):
+    return {
+        'courseTitle': title,
+        'instructors': [{'displayName': name} for name in instructors],
+        'enrollmentTotal': enrolled,
+        'enrollmentStatus': 'Open',
+        'meetings': meetings,
+    }
+
+
+PAGES = {
+    1: [{'sections': [_section('Statics', [_meeting('E100')], 120, ['A. Smith'])]}],
+    2: [{'sections': [_section('Dynamics', [_meeting('E205', days=('tuesday', 'thursday'), start='2:20 pm',
+                                                     end='3:40 pm')]),
+                      _section('Poetry', [_meeting('101', facility='Denney Hall')])]}],
+    3: [{'sections': [_section('Statics', [_meeting('E100')], 120, ['A. Smith']),
+                      _section('Thermo', [_meeting('E100', days=('friday',)), _meeting('W286')], 45)]}],
+}
+
+
+class StandInAPI(BaseHTTPRequestHandler):
+    """Paged search endpoint with ETags; behaviour is set on the server object"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        query = parse_qs(urlsplit(self.path).query)
+        page = int(query.get('p', ['1'])[0])
+        with server.lock:
+            server.requests.append((page, dict(self.headers)))
+            server.clients.add(self.client_address)
+            fail = server.failures.get(page, 0)
+            if fail:
+                server.failures[page] = fail - 1
+
+        if fail:
+            return self._send(503, b'{}')
+        body = json.dumps({'data': {'totalPages': len(server.pages), 'courses': server.pages[page]}}).encode()
+        etag = f'"p{page}-v{server.versions.get(page, 1)}"'
+        if self.headers.get('If-None-Match') == etag:
+            return self._send(304, b'', etag)
+        self._send(200, body, etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ScheduleIngestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInAPI)
+        self.server.pages = copy.deepcopy(PAGES)
+        self.server.versions = {}
+        self.server.failures = {}
+        self.server.requests = []
+        self.server.clients = set()
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}/v2/classes/search'
+        self.cache_dir = tempfile.mkdtemp()
+        self._backoff = schedule_ingest.RETRY_BACKOFF
+        schedule_ingest.RETRY_BACKOFF = 0
+
+    def tearDown(self):
+        schedule_ingest.RETRY_BACKOFF = self._backoff
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def ingest(self, **kwargs):
+        ingester = ScheduleIngester(self.base_url, cache_dir=self.cache_dir, workers=2, **kwargs)
+        return ingester, ingester.ingest()
+
+    def test_pages_into_room_index(self):
+        ingester, store = self.ingest()
+        self.assertEqual(ingester.stats['pages'], 3)
+        self.assertEqual(sorted(page for page, _ in self.server.requests), [1, 2, 3])
+        self.assertEqual(store.rooms(), ['E100', 'E205', 'W286'])
+        # The Statics meeting on pages 1 and 3 is stored once; Denney Hall is skipped
+        self.assertEqual(store.count, 4)
+        self.assertIn(('Statics', 'A. Smith', 'Mon, Wed', '9:10 am', '10:05 am', 120, 'Open'), store.meetings('e100'))
+        self.assertEqual(store.meetings('E205')[0][2:5], ('Tue, Thu', '2:20 pm', '3:40 pm'))
+
+    def test_connections_are_reused(self):
+        for page in range(4, 9):
+            self.server.pages[page] = []
+        self.ingest()
+        self.assertEqual(len(self.server.requests), 8)
+        # Page 1 on the calling thread's connection, the rest over one per worker
+        self.assertLessEqual(len(self.server.clients), 3)
+
+    def test_unchanged_pages_revalidate_with_304(self):
+        _, first = self.ingest()
+        self.server.requests.clear()
+        ingester, second = self.ingest()
+        self.assertEqual(ingester.stats['not_modified'], 3)
+        self.assertEqual(ingester.stats['fetched'], 0)
+        self.assertTrue(all(headers.get('If-None-Match') for _, headers in self.server.requests))
+        self.assertEqual(second.by_room, first.by_room)
+
+    def test_changed_page_is_downloaded(self):
+        self.ingest()
+        self.server.versions[2] = 2
+        self.server.pages[2][0]['sections'][0]['enrollmentTotal'] = 31
+        ingester, store = self.ingest()
+        self.assertEqual((ingester.stats['fetched'], ingester.stats['not_modified']), (1, 2))
+        self.assertEqual(store.meetings('E205')[0][5], 31)
+
+    def test_fresh_cache_skips_requests(self):
+        self.ingest()
+        self.server.requests.clear()
+        ingester, store = self.ingest(max_age=3600)
+        self.assertEqual(self.server.requests, [])
+        self.assertEqual(ingester.stats['cached'], 3)
+        self.assertEqual(store.count, 4)
+
+    def test_server_errors_are_retried(self):
+        self.server.failures[2] = 2
+        ingester, store = self.ingest()
+        self.assertEqual(store.count, 4)
+        self.assertEqual([page for page, _ in self.server.requests].count(2), 3)
+
+    def test_write_csv(self):
+        _, store = self.ingest()
+        output_csv = os.path.join(self.cache_dir, 'schedule.csv')
+        store.write_csv(output_csv)
+        with open(output_csv, 'r') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(list(rows[0]), schedule_ingest.CSV_COLUMNS)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual({row['Room'] for row in rows}, {'Scott Lab E100', 'Scott Lab E205', 'Scott Lab W286'})
+
+    def test_store_deduplicates(self):
+        store = ScheduleStore()
+        meeting = ('Statics', '', 'Mon', '9:10 am', '10:05 am', 10, 'Open')
+        self.assertTrue(store.add('E100', meeting))
+        self.assertFalse(store.add('E100', meeting))
+        self.assertEqual(store.count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
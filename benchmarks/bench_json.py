@@ -0,0 +1,95 @@
+"""
+JSON Encoding Benchmark
+Encode time per API response: Flask default provider vs FastJSONProvider vs encode_route
+
+Usage: python benchmarks/bench_json.py [iterations]
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import timeit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import fast_json
+from multi_floor_pathfinder import MultiFloorPathfinder
+
+
+ROUTES = [
+    ('single floor_1 E100->W170', ('floor_1', 'E100', 'floor_1', 'W170', False)),
+    ('stairs floor_1 E100->basement W066', ('floor_1', 'E100', 'basement', 'W066', False)),
+    ('elevator floor_2 E200->basement W066', ('floor_2', 'E200', 'basement', 'W066', True)),
+]
+
+
+def build_responses():
+    """Representative route payloads, raw and simplified"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        mfp = MultiFloorPathfinder()
+        responses = []
+        for name, args in ROUTES:
+            responses.append((name, mfp.find_multi_floor_path(*args)))
+            responses.append((name + ' (simplified)', mfp.find_multi_floor_path(*args, simplify=True)))
+    return responses
+
+
+def time_encoder(fn, iterations):
+    """Mean microseconds per call"""
+    return timeit.timeit(fn, number=iterations) / iterations * 1e6
+
+
+def run(iterations=500):
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = fast_json.FastJSONProvider(app)
+    orjson_module = fast_json.orjson
+
+    results = []
+    for name, route in build_responses():
+        expected = json.loads(default_provider.dumps(route))
+        row = {
+            'response': name,
+            'bytes': len(default_provider.dumps(route)),
+            'flask_default_us': time_encoder(lambda: default_provider.dumps(route), iterations),
+            'fast_provider_us': time_encoder(lambda: fast_provider.dumps(route), iterations),
+            'encode_route_us': time_encoder(lambda: fast_json.encode_route(route), iterations),
+        }
+
+        # Same serializer with orjson disabled (stdlib + printf waypoint templates)
+        fast_json.orjson = None
+        try:
+            row['encode_route_stdlib_us'] = time_encoder(lambda: fast_json.encode_route(route), iterations)
+            assert json.loads(fast_json.encode_route(route)) == expected
+        finally:
+            fast_json.orjson = orjson_module
+
+        assert json.loads(fast_json.encode_route(route)) == expected
+        results.append(row)
+
+    return results
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    results = run(iterations)
+
+    print("\n" + "="*70)
+    print(f"JSON ENCODE TIME PER RESPONSE (us, {iterations} iterations, orjson={'yes' if fast_json.orjson else 'no'})")
+    print("="*70)
+    print(f"  {'response':50s} {'default':>8s} {'provider':>9s} {'route':>7s} {'stdlib':>7s}")
+    for row in results:
+        print(f"  {row['response']:50s} {row['flask_default_us']:8.1f} {row['fast_provider_us']:9.1f} "
+              f"{row['encode_route_us']:7.1f} {row['encode_route_stdlib_us']:7.1f}")
+    print("="*70 + "\n")
+    return results
+
+
+if __name__ == "__main__":
+    main()
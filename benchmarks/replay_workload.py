@@ -0,0 +1,192 @@
+"""
+Workload Replay - Latency Percentiles per Endpoint
+Drives a captured (or generated) request mix against the app through Flask's test client
+
+Usage:
+  WORKLOAD_CAPTURE=workload.jsonl python app.py          # capture real traffic
+  python benchmarks/replay_workload.py workload.jsonl --concurrency 4
+  python benchmarks/replay_workload.py --generate 200 --save workload.jsonl
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from workload import load_workload
+from pathfinding import list_floor_rooms, FloorNavigationConfig
+
+
+# Mix used by --generate: click-to-start, room-to-room, cross-floor, nearest-node lookups
+GENERATED_MIX = (
+    ('click_to_start', 0.25),
+    ('room_to_room', 0.35),
+    ('cross_floor', 0.20),
+    ('closest_node', 0.20),
+)
+
+# Pixel extent of the floor plans (2550x3307 images)
+PIXEL_WIDTH = 2550
+PIXEL_HEIGHT = 3307
+
+
+def generate_workload(count, seed=0):
+    """Synthetic workload with GENERATED_MIX proportions over the configured floors"""
+    rng = random.Random(seed)
+    floors = FloorNavigationConfig.get_available_floors()
+    rooms = {floor: list_floor_rooms(floor) for floor in floors}
+    kinds = [kind for kind, _ in GENERATED_MIX]
+    weights = [weight for _, weight in GENERATED_MIX]
+
+    entries = []
+    for i in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        floor = rng.choice(floors)
+        if kind == 'closest_node':
+            path = '/api/find-closest-node'
+            args = {'floor': floor, 'x': str(rng.uniform(0, PIXEL_WIDTH)), 'y': str(rng.uniform(0, PIXEL_HEIGHT))}
+        elif kind == 'click_to_start':
+            path = '/api/pathfinding'
+            args = {'floor': floor, 'start_x': str(rng.uniform(0, PIXEL_WIDTH)),
+                    'start_y': str(rng.uniform(0, PIXEL_HEIGHT)), 'end': rng.choice(rooms[floor])}
+        elif kind == 'room_to_room':
+            path = '/api/pathfinding'
+            start, end = rng.sample(rooms[floor], 2)
+            args = {'floor': floor, 'start': start, 'end': end}
+        else:
+            end_floor = rng.choice([f for f in floors if f != floor])
+            path = '/api/pathfinding'
+            args = {'start_floor': floor, 'end_floor': end_floor, 'start': rng.choice(rooms[floor]),
+                    'end': rng.choice(rooms[end_floor]), 'ada_compliance': rng.choice(['true', 'false'])}
+        entries.append({'t': float(i), 'path': path, 'args': args})
+    return entries
+
+
+def percentile(ordered, q):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def replay(entries, concurrency=1, repeat=1, route_cache=False):
+    """
+    Send every entry (repeat times) with `concurrency` worker threads
+
+    Args:
+        route_cache: Keep the app's route response cache on; by default it is
+                     disabled so every repeated request runs its search
+
+    Returns:
+        Per-endpoint stats: count, errors, p50/p95/p99/max latency (ms), throughput (req/s)
+    """
+    import app as app_module
+    with contextlib.redirect_stdout(io.StringIO()):
+        app_module.floor_registry.wait_ready()
+    app_module.route_cache.clear()
+    if not route_cache:
+        app_module.route_cache.max_entries = 0
+
+    local = threading.local()
+
+    def client():
+        if not hasattr(local, 'client'):
+            local.client = app_module.app.test_client()
+        return local.client
+
+    def send(entry):
+        url = entry['path'] + ('?' + urlencode(entry['args']) if entry['args'] else '')
+        started = time.perf_counter()
+        response = client().get(url)
+        return entry['path'], time.perf_counter() - started, response.status_code
+
+    work = list(entries) * repeat
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(send, work))
+        elapsed = time.perf_counter() - started
+
+    by_endpoint = {}
+    for path, latency, status in results:
+        by_endpoint.setdefault(path, []).append((latency, status))
+
+    report = {'_overall': {'requests': len(results), 'seconds': round(elapsed, 3),
+                           'throughput_rps': round(len(results) / elapsed, 2) if elapsed else 0.0,
+                           'concurrency': concurrency, 'route_cache': route_cache}}
+    for path, samples in sorted(by_endpoint.items()):
+        ordered = sorted(latency for latency, _ in samples)
+        report[path] = {
+            'count': len(samples),
+            'errors': sum(1 for _, status in samples if status >= 500),
+            'not_found': sum(1 for _, status in samples if status == 404),
+            'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+            'max_ms': round(ordered[-1] * 1000, 3),
+            'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a captured routing workload')
+    parser.add_argument('workload', nargs='?', help='Captured JSON-lines workload (WORKLOAD_CAPTURE output)')
+    parser.add_argument('--generate', type=int, metavar='N', help='Use N generated requests instead of a capture')
+    parser.add_argument('--save', help='Write the (generated) workload to this file')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=1, help='Replay the workload this many times')
+    parser.add_argument('--limit', type=int, help='Only replay the first N entries')
+    parser.add_argument('--route-cache', action='store_true',
+                        help='Keep the route response cache on (repeats then measure cache hits)')
+    parser.add_argument('--output', help='Write the report as JSON')
+    args = parser.parse_args()
+
+    if args.generate:
+        entries = generate_workload(args.generate)
+    elif args.workload:
+        entries = load_workload(args.workload)
+    else:
+        parser.error('pass a workload file or --generate N')
+    if args.limit:
+        entries = entries[:args.limit]
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+    report = replay(entries, args.concurrency, args.repeat, args.route_cache)
+
+    overall = report['_overall']
+    print("\n" + "="*70)
+    print(f"WORKLOAD REPLAY: {overall['requests']} requests, concurrency {overall['concurrency']}, "
+          f"route cache {'on' if overall['route_cache'] else 'off'}")
+    print("="*70)
+    print(f"  {'endpoint':26s} {'count':>6s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'req/s':>8s} {'5xx':>4s}")
+    for path, stats in report.items():
+        if path == '_overall':
+            continue
+        print(f"  {path:26s} {stats['count']:6d} {stats['p50_ms']:9.2f} {stats['p95_ms']:9.2f} "
+              f"{stats['p99_ms']:9.2f} {stats['throughput_rps']:8.2f} {stats['errors']:4d}")
+    print(f"\n  Total: {overall['seconds']}s, {overall['throughput_rps']} req/s")
+    print("="*70 + "\n")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"[OK] Report saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Benchmark Suite - Graph Build, Search and API Endpoints
+Reproducible timings on the shipped DXFs, stored as JSON for commit-to-commit comparison
+
+Usage:
+  python benchmarks/run_benchmarks.py [--quick] [--skip-api] [--output FILE]
+  python benchmarks/run_benchmarks.py --compare OLD.json NEW.json
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from pathfinder import IndoorPathfinder
+from pathfinding import FloorNavigationConfig, get_floor_files
+from multi_floor_pathfinder import MultiFloorPathfinder
+
+RESULTS_DIR = os.path.join(BASE_DIR, 'benchmarks', 'results')
+
+# Rooms sampled per floor for cross-floor and API benchmarks (--quick uses fewer)
+CROSS_FLOOR_SAMPLE = 8
+QUICK_SAMPLE = 3
+
+
+def quiet():
+    """Silence the pathfinder's progress prints while timing"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def summarize(samples):
+    """Timing summary in milliseconds"""
+    if not samples:
+        return {'count': 0}
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        'count': len(samples),
+        'total_ms': round(sum(samples) * 1000, 3),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 4),
+        'p50_ms': round(pick(0.50) * 1000, 4),
+        'p95_ms': round(pick(0.95) * 1000, 4),
+        'max_ms': round(ordered[-1] * 1000, 4),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def real_rooms(pf):
+    """Room names excluding calibration labels"""
+    return sorted(r for r in pf.room_to_nodes if r not in ('ORI', 'ORI-TR', 'TR-ORI', 'REF'))
+
+
+def bench_graph_build(floors, repeat):
+    """Per-stage load_data timings per floor (best of `repeat`)"""
+    results = {}
+    pathfinders = {}
+    for floor in floors:
+        dxf_file, image_file, labels_file = get_floor_files(floor)
+        runs = []
+        for _ in range(repeat):
+            pf = IndoorPathfinder(dxf_file, image_file, labels_file)
+            with quiet():
+                pf.load_data()
+            runs.append(pf.load_timings)
+        best = {stage: round(min(run[stage] for run in runs) * 1000, 3) for stage in IndoorPathfinder.LOAD_STAGES}
+        best['total'] = round(sum(best.values()), 3)
+        results[floor] = {
+            'stages_ms': best,
+            'nodes': len(pf.nodes),
+            'edges': sum(len(n) for n in pf.graph.values()) // 2,
+            'rooms': len(real_rooms(pf)),
+        }
+        pathfinders[floor] = pf
+    return results, pathfinders
+
+
+def bench_single_floor(pathfinders, quick):
+    """find_path over every room pair per floor, Euclidean and ALT"""
+    results = {}
+    for floor, pf in pathfinders.items():
+        rooms = real_rooms(pf)
+        if quick:
+            rooms = rooms[:QUICK_SAMPLE * 3]
+        pairs = [(a, b) for a in rooms for b in rooms if a != b]
+
+        with quiet():
+            started = time.perf_counter()
+            pf.precompute_landmarks()
+            landmark_ms = (time.perf_counter() - started) * 1000
+
+        results[floor] = {'pairs': len(pairs), 'landmarks_ms': round(landmark_ms, 3)}
+        for mode in IndoorPathfinder.SEARCH_MODES:
+            before = dict(pf.search_stats[mode])
+            samples = []
+            with quiet():
+                for start, end in pairs:
+                    started = time.perf_counter()
+                    pf.find_path(start, end, mode)
+                    samples.append(time.perf_counter() - started)
+            stats = summarize(samples)
+            searches = pf.search_stats[mode]['searches'] - before['searches']
+            expanded = pf.search_stats[mode]['expanded'] - before['expanded']
+            stats['avg_expanded'] = round(expanded / searches, 2) if searches else 0
+            results[floor][mode] = stats
+    return results
+
+
+def bench_cross_floor(pathfinders, quick):
+    """
+    find_multi_floor_path between sampled rooms of every floor pair, stairs and ADA
+
+    Shares the graphs built (and indexed) by the earlier benchmarks, as the
+    server's floor registry does.
+    """
+    sample = QUICK_SAMPLE if quick else CROSS_FLOOR_SAMPLE
+    mfp = MultiFloorPathfinder(pathfinders=pathfinders)
+    rooms = {floor: real_rooms(pf)[:sample] for floor, pf in mfp.pathfinders.items()}
+
+    results = {}
+    for ada in (False, True):
+        samples = []
+        failures = 0
+        for start_floor, end_floor in itertools.permutations(rooms, 2):
+            for start, end in itertools.product(rooms[start_floor], rooms[end_floor]):
+                with quiet():
+                    started = time.perf_counter()
+                    try:
+                        mfp.find_multi_floor_path(start_floor, start, end_floor, end, ada)
+                    except ValueError:
+                        failures += 1
+                    samples.append(time.perf_counter() - started)
+        stats = summarize(samples)
+        stats['failures'] = failures
+        results['ada' if ada else 'stairs'] = stats
+    return results
+
+
+def bench_api(quick):
+    """Flask endpoints through the test client"""
+    import app as app_module
+    with quiet():
+        app_module.floor_registry.wait_ready()
+    client = app_module.app.test_client()
+    iterations = 3 if quick else 10
+
+    requests = {
+        'pathfinding_single': '/api/pathfinding?floor=floor_1&start=E100&end=W170',
+        'pathfinding_single_simplified': '/api/pathfinding?floor=floor_1&start=E100&end=W170&simplify=true',
+        'pathfinding_stairs': '/api/pathfinding?start_floor=floor_1&end_floor=basement&start=E100&end=W066',
+        'pathfinding_ada': '/api/pathfinding?start_floor=floor_2&end_floor=basement&start=E200&end=W066&ada_compliance=true',
+        'find_closest_node': '/api/find-closest-node?floor=floor_1&x=1200&y=900',
+        'navigation': '/api/navigation/floor_1',
+        'available_floors': '/api/available-floors',
+        'health': '/health',
+    }
+
+    # Route responses are cached after the first request: time the search with the cache
+    # emptied before every request, and cache hits separately as <name>_cached
+    runs = [(name, url, False) for name, url in requests.items()]
+    runs += [(f'{name}_cached', url, True) for name, url in requests.items() if name.startswith('pathfinding')]
+
+    results = {}
+    for name, url, cached in runs:
+        samples = []
+        status = None
+        app_module.route_cache.clear()
+        if cached:
+            with quiet():
+                client.get(url)
+        for _ in range(iterations):
+            if not cached:
+                app_module.route_cache.clear()
+            with quiet():
+                started = time.perf_counter()
+                response = client.get(url)
+                samples.append(time.perf_counter() - started)
+            status = response.status_code
+        stats = summarize(samples)
+        stats['status'] = status
+        stats['bytes'] = len(response.data)
+        results[name] = stats
+    return results
+
+
+def bench_json_encoding(quick):
+    """Encode time per route response (see bench_json.py)"""
+    import bench_json
+    with quiet():
+        rows = bench_json.run(50 if quick else 300)
+    return {row['response']: {k: (round(v, 2) if isinstance(v, float) else v)
+                              for k, v in row.items() if k != 'response'} for row in rows}
+
+
+def run(quick=False, skip_api=False, repeat=3):
+    floors = FloorNavigationConfig.get_available_floors()
+    report = {
+        'metadata': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'quick': quick,
+        }
+    }
+
+    print("[1/5] Graph build stages...")
+    report['graph_build'], pathfinders = bench_graph_build(floors, 1 if quick else repeat)
+    print("[2/5] Single-floor find_path (all room pairs)...")
+    report['single_floor'] = bench_single_floor(pathfinders, quick)
+    print("[3/5] Cross-floor find_multi_floor_path...")
+    report['cross_floor'] = bench_cross_floor(pathfinders, quick)
+    if not skip_api:
+        print("[4/5] Flask endpoints...")
+        report['api'] = bench_api(quick)
+    print("[5/5] JSON encoding...")
+    report['json_encoding'] = bench_json_encoding(quick)
+    return report
+
+
+def _flatten(data, prefix=''):
+    """{'a': {'b': 1}} -> {'a.b': 1} for comparable timing metrics"""
+    flat = {}
+    for key, value in data.items():
+        path = f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and (
+                path.endswith('_ms') or path.endswith('_us') or 'stages_ms' in path):
+            flat[path] = value
+    return flat
+
+
+def compare(old_file, new_file, threshold=0.10):
+    """Print metrics that moved by more than `threshold` between two result files"""
+    with open(old_file) as f:
+        old = json.load(f)
+    with open(new_file) as f:
+        new = json.load(f)
+
+    old_flat = _flatten({k: v for k, v in old.items() if k != 'metadata'})
+    new_flat = _flatten({k: v for k, v in new.items() if k != 'metadata'})
+
+    print("\n" + "="*70)
+    print(f"BENCHMARK COMPARISON: {old['metadata']['commit']} -> {new['metadata']['commit']}")
+    print("="*70)
+    regressions = 0
+    for key in sorted(set(old_flat) & set(new_flat)):
+        before, after = old_flat[key], new_flat[key]
+        if before <= 0:
+            continue
+        change = (after - before) / before
+        if abs(change) >= threshold:
+            mark = 'SLOWER' if change > 0 else 'faster'
+            regressions += change > 0
+            print(f"  {mark:6s} {change:+7.1%}  {key}: {before} -> {after}")
+    print(f"\n  {regressions} metric(s) slower by >= {threshold:.0%}")
+    print("="*70 + "\n")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pathfinding benchmark suite')
+    parser.add_argument('--quick', action='store_true', help='Sample fewer rooms/iterations')
+    parser.add_argument('--skip-api', action='store_true', help='Skip Flask endpoint timings')
+    parser.add_argument('--repeat', type=int, default=3, help='Graph build repetitions (best of)')
+    parser.add_argument('--output', help='Result file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='Compare two result files')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Relative change to report in --compare')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare, threshold=args.threshold)
+        return
+
+    report = run(quick=args.quick, skip_api=args.skip_api, repeat=args.repeat)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['metadata']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print("\n" + "="*70)
+    print("BENCHMARK SUMMARY")
+    print("="*70)
+    for floor, data in report['graph_build'].items():
+        single = report['single_floor'][floor]
+        print(f"  {floor:10s} build {data['stages_ms']['total']:8.1f} ms | "
+              f"find_path p50 {single['euclidean']['p50_ms']:.3f} ms "
+              f"(alt {single['alt']['p50_ms']:.3f} ms, expanded {single['euclidean']['avg_expanded']} -> "
+              f"{single['alt']['avg_expanded']})")
+    for mode, stats in report['cross_floor'].items():
+        print(f"  cross-floor {mode:6s} p50 {stats['p50_ms']:.3f} ms  p95 {stats['p95_ms']:.3f} ms")
+    for name, stats in report.get('api', {}).items():
+        print(f"  API {name:30s} p50 {stats['p50_ms']:9.3f} ms  [{stats['status']}]")
+    print(f"\n[OK] Results saved: {output}")
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Floor Plan Tile Builder
+Turns each floor plan image into a zoom pyramid of WebP/JPEG tiles plus previews
+
+Usage: python build_tiles.py [floor_name ...]
+Output: output/tiles/<floor>/<content_hash>/{z}/{x}_{y}.{webp,jpg}
+        output/tiles/<floor>/<content_hash>/preview_<width>.{webp,jpg}
+        output/tiles/manifest.json
+"""
+
+from PIL import Image
+import hashlib
+import json
+import math
+import os
+import shutil
+import sys
+
+from pathfinding import FloorNavigationConfig
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE_DIR = os.path.join(BASE_DIR, 'data', 'floor-plans')
+TILES_DIR = os.path.join(BASE_DIR, 'output', 'tiles')
+MANIFEST_FILE = os.path.join(TILES_DIR, 'manifest.json')
+
+TILE_SIZE = 256
+PREVIEW_WIDTHS = (320, 640, 1280)
+FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+
+def get_floor_images():
+    """Map of floor name -> source image path for every floor with a plan (navigable or image only)"""
+    images = {name: cfg['image'] for name, cfg in FloorNavigationConfig.FLOORS.items() if cfg.get('image')}
+    return {name: os.path.join(IMAGE_DIR, image) for name, image in images.items()}
+
+
+def content_hash(path):
+    """Short SHA-256 of the file contents (keys the output directory)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _save(img, path_without_ext):
+    """Save one image in every configured format"""
+    for ext, options in FORMATS.items():
+        img.save(f'{path_without_ext}.{ext}', **options)
+
+
+def build_floor_tiles(floor_name, image_path, force=False):
+    """
+    Build the pyramid and previews for one floor image
+
+    Zoom level max_zoom is the source resolution; each level below halves it,
+    down to level 0 where the whole plan fits in a single tile.
+
+    Returns:
+        Manifest entry for the floor
+    """
+    digest = content_hash(image_path)
+    out_dir = os.path.join(TILES_DIR, floor_name, digest)
+    url_base = f'/tiles/{floor_name}/{digest}'
+
+    with Image.open(image_path) as src:
+        img = src.convert('RGB')
+    width, height = img.size
+    max_zoom = max(0, math.ceil(math.log2(max(width, height) / TILE_SIZE)))
+
+    entry = {
+        'hash': digest,
+        'source': os.path.basename(image_path),
+        'width': width,
+        'height': height,
+        'tile_size': TILE_SIZE,
+        'max_zoom': max_zoom,
+        'formats': list(FORMATS),
+        'tile_url': url_base + '/{z}/{x}_{y}.{ext}',
+        'levels': [],
+        'previews': {},
+    }
+
+    if os.path.isdir(out_dir) and not force:
+        print(f"  [SKIP] {floor_name}: {digest} already built")
+    else:
+        os.makedirs(out_dir, exist_ok=True)
+
+    for z in range(max_zoom, -1, -1):
+        scale = 2 ** (z - max_zoom)
+        level_w = max(1, math.ceil(width * scale))
+        level_h = max(1, math.ceil(height * scale))
+        cols = math.ceil(level_w / TILE_SIZE)
+        rows = math.ceil(level_h / TILE_SIZE)
+        entry['levels'].insert(0, {'z': z, 'width': level_w, 'height': level_h, 'cols': cols, 'rows': rows})
+
+        # Each level is written to <z>.tmp and renamed when complete, so a run cut short
+        # (e.g. a build timeout) leaves no half-built level that later runs would skip
+        level_dir = os.path.join(out_dir, str(z))
+        if os.path.isdir(level_dir) and not force:
+            continue
+        partial_dir = level_dir + '.tmp'
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        os.makedirs(partial_dir)
+
+        level = img if z == max_zoom else img.resize((level_w, level_h), Image.LANCZOS)
+        for y in range(rows):
+            for x in range(cols):
+                box = (x * TILE_SIZE, y * TILE_SIZE,
+                       min((x + 1) * TILE_SIZE, level_w), min((y + 1) * TILE_SIZE, level_h))
+                _save(level.crop(box), os.path.join(partial_dir, f'{x}_{y}'))
+        shutil.rmtree(level_dir, ignore_errors=True)
+        os.rename(partial_dir, level_dir)
+
+    for preview_width in PREVIEW_WIDTHS:
+        if preview_width >= width:
+            continue
+        preview_height = round(height * preview_width / width)
+        name = f'preview_{preview_width}'
+        entry['previews'][str(preview_width)] = {
+            'width': preview_width,
+            'height': preview_height,
+            'urls': {ext: f'{url_base}/{name}.{ext}' for ext in FORMATS},
+        }
+        if force or not all(os.path.exists(os.path.join(out_dir, f'{name}.{ext}')) for ext in FORMATS):
+            _save(img.resize((preview_width, preview_height), Image.LANCZOS), os.path.join(out_dir, name))
+
+    print(f"[OK] {floor_name}: {width}x{height}, zoom 0-{max_zoom}, hash {digest}")
+    return entry
+
+
+def load_manifest():
+    """Read the tile manifest ({} if tiles were never built)"""
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    with open(MANIFEST_FILE, 'r') as f:
+        return json.load(f)
+
+
+def build_all(floor_names=None, force=False):
+    """Build tiles for the given floors (default: all) and rewrite the manifest"""
+    images = get_floor_images()
+    floor_names = floor_names or list(images)
+
+    manifest = load_manifest()
+    for floor_name in floor_names:
+        if floor_name not in images:
+            raise ValueError(f"No floor plan image for '{floor_name}'. Available: {list(images)}")
+        if not os.path.exists(images[floor_name]):
+            print(f"[WARNING] Image file not found: {images[floor_name]}")
+            continue
+        manifest[floor_name] = build_floor_tiles(floor_name, images[floor_name], force)
+
+    os.makedirs(TILES_DIR, exist_ok=True)
+    with open(MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"[OK] Manifest written: {MANIFEST_FILE}")
+    return manifest
+
+
+def main():
+    """Command-line interface"""
+    args = [a for a in sys.argv[1:] if a != '--force']
+    force = '--force' in sys.argv[1:]
+
+    print("\n" + "="*70)
+    print("BUILDING FLOOR PLAN TILES")
+    print("="*70)
+    try:
+        build_all(args or None, force)
+    except Exception as e:
+        print(f"\n[ERROR] {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+"""
+Campus Routing
+Routes between rooms in different buildings: a coarse graph of building entrances and outdoor
+paths on top, each building's floor graphs (MultiFloorPathfinder) underneath
+
+Usage: python campus_router.py <building>/<floor>/<room> <building>/<floor>/<room> [--ada] [--campus FILE]
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+from pathfinding import BASE_DIR, FloorNavigationConfig, load_floor_manifest, floor_files, CALIBRATION_LABELS
+from multi_floor_pathfinder import MultiFloorPathfinder, _load_floor
+from crowd_weights import apply_crowd_weights, crowd_file
+from floor_registry import files_fingerprint
+
+
+# Buildings, their entrances and the outdoor paths between them (CAMPUS_FILE overrides the path)
+CAMPUS_FILE = os.environ.get('CAMPUS_FILE', os.path.join(BASE_DIR, 'data', 'campus.json'))
+
+
+def entrance_id(building, room):
+    """Campus graph node of a building entrance ('scott_lab:E107E')"""
+    return f'{building}:{room.upper()}'
+
+
+def load_campus(path=CAMPUS_FILE):
+    """
+    Read the campus file and each building's floor manifest
+
+    Returns:
+        {'name', 'buildings': {id: {'name', 'manifest', 'data_dir', 'origin', 'entrances'}},
+         'waypoints': {id: (x, y)}, 'paths': [{'from', 'to', 'distance', 'steps'}]}
+        with coordinates in the DXF units of the building plans
+    """
+    with open(path, 'r') as f:
+        campus = json.load(f)
+    campus_dir = os.path.dirname(os.path.abspath(path))
+    for building_id, building in campus.get('buildings', {}).items():
+        manifest_path = os.path.join(campus_dir, building['manifest'])
+        building['manifest'] = load_floor_manifest(manifest_path)
+        building['data_dir'] = os.path.dirname(manifest_path)
+        building.setdefault('name', building['manifest'].get('name', building_id))
+        building['origin'] = tuple(building.get('origin', (0, 0)))
+        building.setdefault('entrances', {})
+    campus['waypoints'] = {name: tuple(point) for name, point in campus.get('waypoints', {}).items()}
+    for path_entry in campus.setdefault('paths', []):
+        path_entry.setdefault('distance', None)
+        path_entry.setdefault('steps', False)
+    campus.setdefault('name', 'Campus')
+    return campus
+
+
+def _read_room_points(labels_file):
+    """{room: [(x, y), ...]} from a labels CSV (one point per door)"""
+    points = {}
+    with open(labels_file, 'r') as f:
+        for row in csv.DictReader(f):
+            room = row['room_name'].strip().split('_')[0].upper()
+            if room and room not in CALIBRATION_LABELS:
+                points.setdefault(room, []).append((float(row['x']), float(row['y'])))
+    return points
+
+
+class CampusRouter:
+    """
+    Two-level router: entrances and outdoor paths, then the floors involved
+
+    The campus graph is small (entrances, waypoints, paths) and built up
+    front from the campus file and the entrance floors' labels CSVs; no floor
+    graph is built for it. A query between buildings runs Dijkstra over it
+    from each exit of the start building, which with a straight-line
+    estimate of the indoor legs gives a lower bound for every (exit,
+    arrival) pair. Pairs are then refined in bound order with exact indoor
+    routes until no remaining bound can beat the best route found, so only
+    the start and end buildings' floors that the route touches are loaded.
+
+    Floor graphs are taken from floor_source(building, floors) when given
+    (e.g. the FloorRegistry's for the home building) and otherwise built here
+    and kept per (building, floor) with the fingerprint of their input files.
+    A floor whose files changed is rebuilt on its next use; if that fails, the
+    previous graph stays until the files change again.
+    """
+
+    def __init__(self, campus_file=CAMPUS_FILE, floor_source=None):
+        """
+        Args:
+            campus_file: Campus file (buildings, entrances, waypoints, outdoor paths)
+            floor_source: Optional callable (building, floor_names) -> {floor_name: IndoorPathfinder}
+                          for floors already loaded elsewhere; missing floors are built here
+        """
+        self.campus = load_campus(campus_file)
+        self.buildings = self.campus['buildings']
+        self.floor_source = floor_source
+        self._floors = {}
+        self._room_points = {}
+        self._lock = threading.Lock()
+
+        self.points = dict(self.campus['waypoints'])
+        self.entrances = {}
+        for building_id, building in self.buildings.items():
+            ox, oy = building['origin']
+            for floor_name, rooms in building['entrances'].items():
+                doors = self.room_points(building_id, floor_name)
+                for room in rooms:
+                    if room.upper() not in doors:
+                        print(f"[WARNING] Campus: entrance {room} not in {building_id}/{floor_name} labels")
+                        continue
+                    node = entrance_id(building_id, room)
+                    x, y = doors[room.upper()][0]
+                    self.entrances[node] = {'building': building_id, 'floor': floor_name, 'room': room.upper()}
+                    self.points[node] = (ox + x, oy + y)
+
+        self.adjacency = {node: [] for node in self.points}
+        for path_entry in self.campus['paths']:
+            a, b = path_entry['from'], path_entry['to']
+            if a not in self.points or b not in self.points:
+                print(f"[WARNING] Campus: path {a} -> {b} has an unknown end")
+                continue
+            distance = path_entry['distance']
+            if distance is None:
+                distance = math.dist(self.points[a], self.points[b])
+            self.adjacency[a].append((b, distance, path_entry['steps']))
+            self.adjacency[b].append((a, distance, path_entry['steps']))
+
+    def building_entrances(self, building_id):
+        return [node for node, entrance in self.entrances.items() if entrance['building'] == building_id]
+
+    def room_points(self, building_id, floor_name):
+        """Door points of each room on a building floor (labels CSV only, cached until the floor is rebuilt)"""
+        key = (building_id, floor_name)
+        if key not in self._room_points:
+            config = self._floor_config(building_id, floor_name)
+            _, _, labels_file = floor_files(config, self.buildings[building_id]['data_dir'])
+            self._room_points[key] = _read_room_points(labels_file)
+        return self._room_points[key]
+
+    def _floor_config(self, building_id, floor_name):
+        building = self.buildings.get(building_id)
+        if building is None:
+            raise ValueError(f"Building '{building_id}' not configured. Available: {list(self.buildings)}")
+        config = building['manifest']['floors'].get(floor_name)
+        if config is None or config['dxf'] is None or config['labels'] is None:
+            raise ValueError(f"Floor '{floor_name}' of {building_id} has no navigation data")
+        return config
+
+    def _estimate(self, building_id, floor_name, room, entrance):
+        """Straight-line distance from a room's nearest door to an entrance (lower bound of the indoor leg)"""
+        doors = self.room_points(building_id, floor_name).get(room)
+        if not doors:
+            raise ValueError(f"Room '{room}' not found on {building_id}/{floor_name}")
+        ex, ey = self.room_points(building_id, entrance['floor'])[entrance['room']][0]
+        return min(math.hypot(x - ex, y - ey) for x, y in doors)
+
+    def _outdoor_search(self, source, ada_compliance=False):
+        """Dijkstra over the campus graph: ({node: distance}, {node: previous node})"""
+        dist = {source: 0.0}
+        previous = {}
+        heap = [(0.0, source)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            for neighbor, length, steps in self.adjacency[node]:
+                if steps and ada_compliance:
+                    continue
+                nd = d + length
+                if nd < dist.get(neighbor, math.inf):
+                    dist[neighbor] = nd
+                    previous[neighbor] = node
+                    heapq.heappush(heap, (nd, neighbor))
+        return dist, previous
+
+    def _building_router(self, building_id, floor_names):
+        """MultiFloorPathfinder over just the given floors of a building (loaded on first use)"""
+        manifest = self.buildings[building_id]['manifest']
+        floor_names = sorted(set(floor_names))
+        pathfinders = dict(self.floor_source(building_id, floor_names) or {}) if self.floor_source else {}
+        for floor_name in floor_names:
+            if pathfinders.get(floor_name) is None:
+                pathfinders[floor_name] = self._floor_graph(building_id, floor_name)
+        return MultiFloorPathfinder(pathfinders={f: pathfinders[f] for f in floor_names}, manifest=manifest)
+
+    def _floor_graph(self, building_id, floor_name):
+        """Floor graph built here, rebuilt when its DXF, labels or (home building) crowd weights change"""
+        key = (building_id, floor_name)
+        home = self.is_home(building_id)
+        files = floor_files(self._floor_config(building_id, floor_name), self.buildings[building_id]['data_dir'])
+        fingerprint = files_fingerprint([files[0], files[2]] + ([crowd_file(floor_name)] if home else []))
+        with self._lock:
+            cached = self._floors.get(key)
+            if cached is None or cached[0] != fingerprint:
+                _, pf, seconds, error = _load_floor(floor_name, *files)
+                if error:
+                    previous = cached[1] if cached else None
+                    self._floors[key] = (fingerprint, previous, error)
+                    print(f"[ERROR] Campus: failed to load {building_id}/{floor_name}: {error}"
+                          + (", keeping the previous graph" if previous is not None else ''))
+                else:
+                    if home:
+                        apply_crowd_weights(floor_name, pf)
+                    self._floors[key] = (fingerprint, pf, None)
+                    self._room_points.pop(key, None)
+                    print(f"[OK] Campus: {'reloaded' if cached else 'loaded'} {building_id}/{floor_name} "
+                          f"({seconds * 1000:.0f} ms)")
+            _, pf, error = self._floors[key]
+        if pf is None:
+            raise ValueError(f"Failed to load {building_id}/{floor_name}: {error}")
+        return pf
+
+    def is_home(self, building_id):
+        """True for the building described by this server's floor manifest"""
+        return self.buildings[building_id]['manifest'].get('building') == FloorNavigationConfig.MANIFEST.get('building')
+
+    def _indoor_leg(self, building_id, start_floor, start_room, end_floor, end_room, ada_compliance, simplify,
+                    departure, closures=None):
+        """Route inside one building, or None when start and end are the same room"""
+        if (start_floor, start_room) == (end_floor, end_room):
+            return None
+        router = self._building_router(building_id, (start_floor, end_floor))
+        # Closures name floors of the home building only
+        closures = closures if self.is_home(building_id) else None
+        return router.find_multi_floor_path(start_floor, start_room, end_floor, end_room, ada_compliance,
+                                            simplify, closures=closures, departure=departure)
+
+    def find_route(self, start_building, start_floor, start_room, end_building, end_floor, end_room,
+                   ada_compliance=False, simplify=False, departure=None, closures=None):
+        """
+        Route between two rooms anywhere on campus
+
+        Args:
+            start_building, start_floor, start_room: Where the route starts
+            end_building, end_floor, end_room: Destination
+            ada_compliance: Elevators only indoors, no outdoor paths with steps
+            simplify: Merge collinear waypoints and add instructions to the indoor legs
+            departure: datetime of departure (crowd weights, where the building has them)
+            closures: ClosureOverlay applied to the indoor legs in the home building
+
+        Returns:
+            {'start', 'end', 'total_distance', 'buildings', 'entrances', 'legs', 'stats'}; legs are
+            {'type': 'indoor', 'building', 'route'} (a MultiFloorPathfinder route) and
+            {'type': 'outdoor', 'distance', 'points'}
+
+        Raises:
+            ValueError for unknown buildings/floors/rooms or when no route exists
+        """
+        started = time.perf_counter()
+        start_room, end_room = start_room.upper(), end_room.upper()
+        for building_id, floor_name, room in ((start_building, start_floor, start_room),
+                                              (end_building, end_floor, end_room)):
+            self._floor_config(building_id, floor_name)
+            if room not in self.room_points(building_id, floor_name):
+                raise ValueError(f"Room '{room}' not found on {building_id}/{floor_name}")
+        result = {
+            'start': {'building': start_building, 'floor': start_floor, 'room': start_room},
+            'end': {'building': end_building, 'floor': end_floor, 'room': end_room},
+        }
+
+        if start_building == end_building:
+            route = self._indoor_leg(start_building, start_floor, start_room, end_floor, end_room,
+                                     ada_compliance, simplify, departure, closures)
+            legs = [{'type': 'indoor', 'building': start_building, 'route': route}] if route else []
+            result.update(total_distance=route['total_distance'] if route else 0.0,
+                          buildings=[start_building], entrances=None, legs=legs,
+                          stats={'candidates': 0, 'refined': 0,
+                                 'seconds': round(time.perf_counter() - started, 4)})
+            return result
+
+        exits = self.building_entrances(start_building)
+        arrivals = self.building_entrances(end_building)
+        if not exits or not arrivals:
+            raise ValueError(f"No entrances configured for {start_building if not exits else end_building}")
+
+        # Top level: lower bound for every (exit, arrival) pair
+        outdoor = {}
+        candidates = []
+        for exit_node in exits:
+            dist, previous = self._outdoor_search(exit_node, ada_compliance)
+            outdoor[exit_node] = (dist, previous)
+            leave = self._estimate(start_building, start_floor, start_room, self.entrances[exit_node])
+            for arrive_node in arrivals:
+                if arrive_node in dist:
+                    enter = self._estimate(end_building, end_floor, end_room, self.entrances[arrive_node])
+                    candidates.append((leave + dist[arrive_node] + enter, exit_node, arrive_node))
+        if not candidates:
+            raise ValueError(f"No outdoor path from {start_building} to {end_building}")
+        candidates.sort()
+
+        # Refinement: exact indoor legs, in bound order, until no bound can win
+        legs_cache = {}
+
+        def leg(building_id, key, *route_args):
+            if key not in legs_cache:
+                try:
+                    route = self._indoor_leg(building_id, *route_args, ada_compliance, simplify, departure,
+                                             closures)
+                    legs_cache[key] = (route['total_distance'] if route else 0.0, route)
+                except ValueError:
+                    legs_cache[key] = (math.inf, None)
+            return legs_cache[key]
+
+        best = None
+        refined = 0
+        for bound, exit_node, arrive_node in candidates:
+            if best is not None and bound >= best[0]:
+                break
+            refined += 1
+            exit_entrance, arrive_entrance = self.entrances[exit_node], self.entrances[arrive_node]
+            leave, first = leg(start_building, ('exit', exit_node), start_floor, start_room,
+                               exit_entrance['floor'], exit_entrance['room'])
+            enter, last = leg(end_building, ('arrive', arrive_node), arrive_entrance['floor'],
+                              arrive_entrance['room'], end_floor, end_room)
+            total = leave + outdoor[exit_node][0][arrive_node] + enter
+            if total < math.inf and (best is None or total < best[0]):
+                best = (total, exit_node, arrive_node, first, last)
+        if best is None:
+            raise ValueError(f"No route found from {start_building}/{start_room} to {end_building}/{end_room}")
+
+        total, exit_node, arrive_node, first, last = best
+        dist, previous = outdoor[exit_node]
+        nodes = [arrive_node]
+        while nodes[-1] != exit_node:
+            nodes.append(previous[nodes[-1]])
+        nodes.reverse()
+        points = [{'id': node, 'campus_coords': {'x': self.points[node][0], 'y': self.points[node][1]},
+                   'distance_so_far': dist[node]} for node in nodes]
+
+        legs = []
+        if first:
+            legs.append({'type': 'indoor', 'building': start_building, 'route': first})
+        legs.append({'type': 'outdoor', 'distance': dist[arrive_node], 'points': points})
+        if last:
+            legs.append({'type': 'indoor', 'building': end_building, 'route': last})
+        result.update(total_distance=total, buildings=[start_building, end_building],
+                      entrances={'exit': exit_node, 'arrive': arrive_node}, legs=legs,
+                      stats={'candidates': len(candidates), 'refined': refined,
+                             'seconds': round(time.perf_counter() - started, 4)})
+        return result
+
+    def describe(self):
+        """Buildings and entrances as a JSON-friendly dict"""
+        return {
+            'name': self.campus['name'],
+            'buildings': {
+                building_id: {
+                    'name': building['name'],
+                    'floors': [f for f, cfg in building['manifest']['floors'].items()
+                               if cfg['dxf'] is not None and cfg['labels'] is not None],
+                    'entrances': [self.entrances[node]['room'] for node in self.building_entrances(building_id)],
+                }
+                for building_id, building in self.buildings.items()
+            },
+            'waypoints': len(self.campus['waypoints']),
+            'paths': len(self.campus['paths']),
+        }
+
+
+def _parse_place(text):
+    parts = text.split('/')
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError(f"expected <building>/<floor>/<room>, got '{text}'")
+    return parts
+
+
+def main():
+    """Command-line interface"""
+    parser = argparse.ArgumentParser(description='Route between rooms across campus buildings')
+    parser.add_argument('start', type=_parse_place, help='<building>/<floor>/<room>')
+    parser.add_argument('end', type=_parse_place, help='<building>/<floor>/<room>')
+    parser.add_argument('--ada', action='store_true', help='Elevators only, no outdoor steps')
+    parser.add_argument('--campus', default=CAMPUS_FILE, help='Campus file')
+    args = parser.parse_args()
+
+    router = CampusRouter(args.campus)
+    print(f"[OK] {router.campus['name']}: {len(router.buildings)} buildings, {len(router.entrances)} entrances, "
+          f"{len(router.campus['paths'])} outdoor paths")
+    try:
+        result = router.find_route(*args.start, *args.end, ada_compliance=args.ada)
+    except ValueError as e:
+        print(f"[X] {e}")
+        sys.exit(1)
+
+    print("=" * 70)
+    for leg in result['legs']:
+        if leg['type'] == 'outdoor':
+            print(f"  outdoor   {leg['distance']:8.2f}  {' -> '.join(point['id'] for point in leg['points'])}")
+        else:
+            route = leg['route']
+            floors = ' -> '.join(route['floors'])
+            print(f"  {leg['building']:<9} {route['total_distance']:8.2f}  {route['start_room']} -> "
+                  f"{route['end_room']} ({floors})")
+    print("=" * 70)
+    stats = result['stats']
+    print(f"[OK] Total {result['total_distance']:.2f} units; refined {stats['refined']} of "
+          f"{stats['candidates']} entrance pairs in {stats['seconds'] * 1000:.0f} ms")
+    print(f"[OK] Floors loaded: {', '.join(f'{b}/{f}' for b, f in sorted(router._floors)) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Closure Overlay
+Runtime node/edge/room/transition closures and penalties consulted at query time,
+stored in a small JSON file shared by every server worker
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process dev server, no cross-worker locking needed
+    fcntl = None
+
+
+CLOSURE_TYPES = ('node', 'edge', 'room', 'transition')
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CLOSURES_FILE = os.path.join(BASE_DIR, 'data', 'closures.json')
+
+
+def _digest(entries):
+    text = json.dumps(sorted(entries, key=lambda e: e['id']), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+
+def validate_closure(entry, floors=None):
+    """
+    Normalize an admin request into a closure entry
+
+    Args:
+        entry: {'type', 'floor', 'node' | 'nodes' | 'room' | 'name', 'penalty'?, 'reason'?}
+               'penalty' is extra distance in DXF units; without it the element is closed.
+               Transitions take an optional 'floors' list (default: every floor).
+        floors: Known floor names to check 'floor' against
+
+    Returns:
+        Normalized entry (without 'id')
+    """
+    if not isinstance(entry, dict):
+        raise ValueError("Closure must be a JSON object")
+    kind = entry.get('type')
+    if kind not in CLOSURE_TYPES:
+        raise ValueError(f"Closure type must be one of {list(CLOSURE_TYPES)}")
+
+    closure = {'type': kind}
+    if kind == 'transition':
+        if not entry.get('name'):
+            raise ValueError("Transition closures need 'name' (e.g. 'WElev2' or 'W101S')")
+        closure['name'] = str(entry['name']).upper()
+        if entry.get('floors'):
+            closure['floors'] = sorted(str(f).lower() for f in entry['floors'])
+    else:
+        floor = str(entry.get('floor', '')).lower()
+        if not floor or (floors is not None and floor not in floors):
+            raise ValueError(f"Closure needs a valid 'floor'. Available: {list(floors or [])}")
+        closure['floor'] = floor
+        try:
+            if kind == 'node':
+                closure['node'] = int(entry['node'])
+            elif kind == 'edge':
+                a, b = (int(n) for n in entry['nodes'])
+                closure['nodes'] = sorted((a, b))
+            else:
+                closure['room'] = str(entry['room']).upper()
+        except (KeyError, TypeError, ValueError):
+            field = {'node': "'node' (node id)", 'edge': "'nodes' ([from, to] node ids)", 'room': "'room'"}[kind]
+            raise ValueError(f"{kind.capitalize()} closures need {field}")
+
+    if entry.get('penalty') is not None:
+        penalty = float(entry['penalty'])
+        if penalty < 0:
+            raise ValueError("Penalty must be >= 0")
+        closure['penalty'] = penalty
+    if entry.get('reason'):
+        closure['reason'] = str(entry['reason'])
+    return closure
+
+
+class FloorClosures:
+    """Closures for one floor, in the form IndoorPathfinder applies to its search arrays"""
+
+    def __init__(self, entries):
+        self.key = _digest(entries)
+        self.closed_nodes = set()
+        self.node_penalty = {}
+        self.closed_edges = set()
+        self.edge_penalty = {}
+        self.closed_rooms = set()
+        self.room_penalty = {}
+        for entry in entries:
+            penalty = entry.get('penalty')
+            if entry['type'] == 'node':
+                target, closed, penalties = entry['node'], self.closed_nodes, self.node_penalty
+            elif entry['type'] == 'edge':
+                target, closed, penalties = frozenset(entry['nodes']), self.closed_edges, self.edge_penalty
+            else:
+                target, closed, penalties = entry['room'], self.closed_rooms, self.room_penalty
+            if penalty is None:
+                closed.add(target)
+            else:
+                penalties[target] = penalties.get(target, 0.0) + penalty
+
+
+class ClosureOverlay:
+    """Immutable view of every active closure, grouped by floor"""
+
+    def __init__(self, entries=()):
+        self.entries = list(entries)
+        self.by_id = {entry['id']: entry for entry in self.entries}
+        self.digest = _digest(self.entries)
+        grouped = {}
+        self.transitions = []
+        for entry in self.entries:
+            if entry['type'] == 'transition':
+                self.transitions.append(entry)
+            else:
+                grouped.setdefault(entry['floor'], []).append(entry)
+        self._floors = {floor: FloorClosures(items) for floor, items in grouped.items()}
+
+    def for_floor(self, floor_name):
+        """FloorClosures for a floor, or None when nothing on it is closed"""
+        return self._floors.get(floor_name)
+
+    def transition_penalty(self, name, from_floor, to_floor):
+        """
+        Extra cost of a stair/elevator between two floors
+
+        Returns:
+            0.0 when open, the summed penalty when penalized, inf when closed
+        """
+        name = name.upper()
+        total = 0.0
+        for entry in self.transitions:
+            if entry['name'] != name:
+                continue
+            if entry.get('floors') and from_floor not in entry['floors'] and to_floor not in entry['floors']:
+                continue
+            if entry.get('penalty') is None:
+                return float('inf')
+            total += entry['penalty']
+        return total
+
+    def etag_part(self, floors):
+        """Short digest of the closures that can affect routes over these floors"""
+        floors = set(floors)
+        relevant = [e for e in self.entries if e.get('floor') in floors or (e['type'] == 'transition' and len(floors) > 1)]
+        return _digest(relevant) if relevant else ''
+
+
+class ClosureStore:
+    """
+    Closure entries persisted as JSON, re-read when the file changes
+
+    Every worker process opens the same file, so an admin change made through
+    one worker is picked up by the others on their next request (one stat()
+    per call to current()). Listeners get (added, removed) entry lists for
+    each change so caches can drop just the routes it affects.
+    """
+
+    def __init__(self, path=DEFAULT_CLOSURES_FILE):
+        self.path = path
+        self.overlay = ClosureOverlay()
+        self._stamp = None
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.refresh()
+
+    def add_listener(self, callback):
+        """Call callback(added, removed) after the active closures change"""
+        self._listeners.append(callback)
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def current(self):
+        """Active overlay, re-read first if the file changed"""
+        if self._file_stamp() != self._stamp:
+            self.refresh()
+        return self.overlay
+
+    def refresh(self):
+        """Reload the file; returns True if the active closures changed"""
+        with self._lock:
+            stamp = self._file_stamp()
+            if stamp == self._stamp:
+                return False
+            entries = self._read() if stamp else []
+            old = self.overlay
+            self._stamp = stamp
+            if _digest(entries) == old.digest:
+                return False
+            self.overlay = ClosureOverlay(entries)
+
+        added = [e for e in self.overlay.entries if old.by_id.get(e['id']) != e]
+        removed = [e for e in old.entries if self.overlay.by_id.get(e['id']) != e]
+        for callback in self._listeners:
+            callback(added, removed)
+        return True
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f).get('closures', [])
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Could not read closures file {self.path}: {e}")
+            return list(self.overlay.entries)
+
+    def _modify(self, change):
+        """Read-modify-write under an exclusive file lock (shared with other workers)"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.lock', 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            entries = self._read() if os.path.exists(self.path) else []
+            entries, result = change(entries)
+            tmp_file = f'{self.path}.{os.getpid()}.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump({'closures': entries}, f, indent=2)
+            os.replace(tmp_file, self.path)
+        self.refresh()
+        return result
+
+    def add(self, entry, floors=None):
+        """Validate and store a closure; returns the stored entry (with 'id' and 'created')"""
+        closure = validate_closure(entry, floors)
+        closure['id'] = uuid.uuid4().hex[:8]
+        closure['created'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        return self._modify(lambda entries: (entries + [closure], closure))
+
+    def remove(self, closure_id):
+        """Delete a closure; returns False if no closure has that id"""
+        def change(entries):
+            kept = [e for e in entries if e.get('id') != closure_id]
+            return kept, len(kept) != len(entries)
+        return self._modify(change)
+
+    def list(self):
+        return list(self.current().entries)
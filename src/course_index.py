@@ -0,0 +1,177 @@
+"""
+Course-to-Room Index
+Resolves a course title, instructor or meeting time from the class schedule to a floor and room
+
+Usage: python course_index.py "<course title>" [YYYY-MM-DDTHH:MM]
+"""
+
+from datetime import datetime
+import hashlib
+import re
+import sys
+
+from crowd_weights import load_schedule, SCHEDULE_CSV, DAY_NAMES, CAMPUS_TZ, campus_time, parse_departure
+from pathfinding import FloorNavigationConfig, list_floor_rooms
+
+
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+# Floor by the first digit of a room number ('E100' -> floor_1), for rooms missing from the labels
+FLOOR_BY_DIGIT = {'0': 'basement', '1': 'floor_1', '2': 'floor_2'}
+
+DAY_LABELS = {number: name for name, number in DAY_NAMES.items()}
+
+
+def course_key(text):
+    """Normalized lookup key: 'Calculus  II' and 'calculus-ii' -> 'calculus ii'"""
+    return ' '.join(re.findall(r'[a-z0-9&]+', text.lower()))
+
+
+def _clock(minutes):
+    hour, minute = divmod(minutes, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'am' if hour < 12 else 'pm'}"
+
+
+class CourseIndex:
+    """
+    Class meetings keyed by course, instructor and start time
+
+    The schedule is parsed once; each meeting's room is resolved to the floor
+    whose labels CSV has it. Lookups are dict hits: by_course and
+    by_instructor map a normalized name to its meetings, by_time maps
+    (weekday, start minute) to the meetings starting then.
+    """
+
+    def __init__(self, schedule_csv=SCHEDULE_CSV, floors=None):
+        room_floors = {}
+        for floor_name in floors or FloorNavigationConfig.get_available_floors():
+            try:
+                for room in list_floor_rooms(floor_name):
+                    room_floors.setdefault(room, floor_name)
+            except (OSError, ValueError) as e:
+                print(f"[WARNING] Course index: no rooms for {floor_name} ({e})")
+
+        self.meetings = []
+        self.by_course = {}
+        self.by_instructor = {}
+        self.by_time = {}
+        self.unresolved = set()
+        for meeting in load_schedule(schedule_csv):
+            floor = room_floors.get(meeting['room'])
+            if floor is None:
+                self.unresolved.add(meeting['room'])
+                floor = FLOOR_BY_DIGIT.get(meeting['room'][1:2])
+                if floor is None:
+                    continue
+            meeting = dict(meeting, floor=floor)
+            self.meetings.append(meeting)
+            self.by_course.setdefault(course_key(meeting['course']), []).append(meeting)
+            for name in meeting['instructor'].split(','):
+                if name.strip():
+                    self.by_instructor.setdefault(course_key(name), []).append(meeting)
+            for day in meeting['days']:
+                self.by_time.setdefault((day, meeting['start']), []).append(meeting)
+
+    def courses(self):
+        return sorted({meeting['course'] for meeting in self.meetings})
+
+    def find(self, course=None, instructor=None, when=None):
+        """
+        Meetings matching a course and/or instructor, or starting at a time
+
+        Args:
+            course: Course title (any case/punctuation)
+            instructor: Instructor display name
+            when: datetime; alone, returns the meetings starting at that weekday and minute (campus time)
+
+        Returns:
+            List of meeting dicts ({'course', 'instructor', 'room', 'floor', 'days', 'start', 'end', 'enrolled'})
+        """
+        if course:
+            meetings = self.by_course.get(course_key(course), [])
+            if instructor:
+                by_instructor = self.by_instructor.get(course_key(instructor), [])
+                meetings = [meeting for meeting in meetings if meeting in by_instructor]
+            return meetings
+        if instructor:
+            return self.by_instructor.get(course_key(instructor), [])
+        if when is not None:
+            when = campus_time(when)
+            return self.by_time.get((when.weekday(), when.hour * 60 + when.minute), [])
+        return []
+
+    def resolve(self, course, instructor=None, when=None):
+        """
+        Room to go to for a course: the meeting in progress at `when`, else the next one to start
+
+        `when` defaults to now on the campus clock; aware datetimes are converted to campus time.
+
+        Returns:
+            The chosen meeting dict (its 'floor' and 'room' are the destination)
+
+        Raises:
+            ValueError if the course is unknown
+        """
+        meetings = self.find(course, instructor)
+        if not meetings:
+            raise ValueError(f"Course '{course}' not found in the schedule")
+        when = campus_time(when) if when is not None else datetime.now(CAMPUS_TZ)
+        now = when.weekday() * DAY_MINUTES + when.hour * 60 + when.minute
+
+        def wait(meeting):
+            # Minutes until the meeting next starts (-1 while it is running)
+            waits = []
+            for day in meeting['days']:
+                start = day * DAY_MINUTES + meeting['start']
+                if start <= now < day * DAY_MINUTES + meeting['end']:
+                    return -1
+                waits.append((start - now) % WEEK_MINUTES)
+            return min(waits)
+
+        return min(meetings, key=lambda meeting: (wait(meeting), meeting['room']))
+
+    @staticmethod
+    def meeting_id(meeting):
+        """Short digest identifying a meeting (for response cache keys and ETags)"""
+        text = '|'.join(str(meeting[field]) for field in ('course', 'instructor', 'room', 'days', 'start', 'end'))
+        return hashlib.sha1(text.encode()).hexdigest()[:8]
+
+    @staticmethod
+    def describe(meeting):
+        """Meeting as JSON-friendly dict with readable days and times"""
+        return {
+            'course': meeting['course'],
+            'instructor': meeting['instructor'],
+            'room': meeting['room'],
+            'floor': meeting['floor'],
+            'days': ', '.join(DAY_LABELS[day] for day in meeting['days']),
+            'start': _clock(meeting['start']),
+            'end': _clock(meeting['end']),
+            'enrolled': meeting['enrolled'],
+        }
+
+
+def main():
+    """Command-line interface"""
+    if len(sys.argv) < 2:
+        print('Usage: python course_index.py "<course title>" [YYYY-MM-DDTHH:MM]')
+        sys.exit(1)
+    index = CourseIndex()
+    print(f"[OK] {len(index.meetings)} meetings, {len(index.by_course)} courses")
+    if index.unresolved:
+        print(f"[WARNING] Rooms not in any labels CSV: {', '.join(sorted(index.unresolved))}")
+    try:
+        when = parse_departure(sys.argv[2]) if len(sys.argv) > 2 else None
+        chosen = index.resolve(sys.argv[1], when=when)
+    except ValueError as e:
+        print(f"[X] {e}")
+        sys.exit(1)
+    for meeting in index.find(sys.argv[1]):
+        info = index.describe(meeting)
+        marker = '->' if meeting is chosen else '  '
+        print(f"{marker} {info['floor']:<9} {info['room']:<6} {info['days']:<14} {info['start']}-{info['end']}")
+
+
+if __name__ == "__main__":
+    main()
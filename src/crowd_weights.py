@@ -0,0 +1,249 @@
+"""
+Crowd-Aware Routing Weights
+Turns the class schedule into per-time-slot corridor congestion multipliers for each floor graph
+
+Usage: python crowd_weights.py [--schedule CSV] [floor_name ...]
+Output: output/crowd/<floor>.npz (slot keys + float32 multiplier matrix over the graph's edges)
+"""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import argparse
+import csv
+import hashlib
+import math
+import os
+import sys
+
+import numpy as np
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEDULE_CSV = os.path.join(BASE_DIR, 'frontend', 'public', 'scott_lab_schedule.csv')
+CROWD_DIR = os.path.join(BASE_DIR, 'output', 'crowd')
+
+# Time slots: (weekday, minute of day // SLOT_MINUTES), Monday = 0
+SLOT_MINUTES = 5
+
+# Students arrive in the WINDOW_BEFORE minutes before a class starts and leave
+# in the WINDOW_AFTER minutes after it ends
+WINDOW_BEFORE = 10
+WINDOW_AFTER = 10
+
+# Crowd spreads from a room's doors along corridors, fading with walking distance (DXF units)
+DECAY_DISTANCE = 25.0
+CUTOFF_DISTANCE = 3 * DECAY_DISTANCE
+
+# Edge cost multiplier = 1 + (MAX_MULTIPLIER - 1) * load / (load + CORRIDOR_CAPACITY)
+MAX_MULTIPLIER = 2.0
+CORRIDOR_CAPACITY = 40.0
+
+# Schedule times are campus local time; 'now' and timezone-aware departures are converted to it
+CAMPUS_TZ = ZoneInfo(os.environ.get('CAMPUS_TZ', 'America/New_York'))
+
+DAY_NAMES = {'Mon': 0, 'Tue': 1, 'Wed': 2, 'Thu': 3, 'Fri': 4, 'Sat': 5, 'Sun': 6}
+
+
+def campus_time(moment):
+    """Datetime in campus local time (naive datetimes are taken as campus local already)"""
+    return moment.astimezone(CAMPUS_TZ) if moment.tzinfo is not None else moment
+
+
+def slot_key(departure):
+    """Time slot of a departure datetime"""
+    departure = campus_time(departure)
+    return departure.weekday(), (departure.hour * 60 + departure.minute) // SLOT_MINUTES
+
+
+def parse_departure(value):
+    """
+    'now' or an ISO datetime ('2025-10-20T10:15') -> datetime in campus time; ValueError otherwise
+
+    An ISO time without an offset is campus local time; one with an offset
+    (e.g. '2025-10-20T14:15Z') is converted to it.
+    """
+    if value == 'now':
+        return datetime.now(CAMPUS_TZ)
+    try:
+        return campus_time(datetime.fromisoformat(value))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid departure time '{value}'. Use 'now' or ISO format, e.g. 2025-10-20T10:15")
+
+
+def _minutes(text):
+    """'2:20 pm' -> minutes after midnight"""
+    parsed = datetime.strptime(text.strip().lower(), '%I:%M %p')
+    return parsed.hour * 60 + parsed.minute
+
+
+def load_schedule(schedule_csv=SCHEDULE_CSV):
+    """
+    Distinct class meetings from the schedule CSV
+
+    Returns:
+        List of {'course', 'instructor', 'room', 'days', 'start', 'end', 'enrolled'}
+        (room like 'E205', days as weekday numbers, times in minutes after midnight)
+    """
+    meetings = {}
+    with open(schedule_csv, 'r') as f:
+        for row in csv.DictReader(f):
+            try:
+                enrolled = int(row['Enrolled'] or 0)
+                start, end = _minutes(row['Start']), _minutes(row['End'])
+            except (KeyError, ValueError):
+                continue
+            room = row['Room'].replace('Scott Lab', '').strip().upper()
+            days = tuple(DAY_NAMES[d.strip()] for d in row['Days'].split(',') if d.strip() in DAY_NAMES)
+            if not room or not days:
+                continue
+            key = (row['Course'], room, days, start, end)
+            meetings[key] = {'course': row['Course'].strip(), 'instructor': (row.get('Instructor') or '').strip(),
+                             'room': room, 'days': days, 'start': start, 'end': end, 'enrolled': enrolled}
+    return list(meetings.values())
+
+
+def slot_crowds(meetings):
+    """
+    People moving per slot: {slot: {room: count}}
+
+    A meeting adds its enrollment to every slot overlapping the arrival window
+    before it starts and the departure window after it ends.
+    """
+    crowds = {}
+    for meeting in meetings:
+        if meeting['enrolled'] <= 0:
+            continue
+        windows = ((meeting['start'] - WINDOW_BEFORE, meeting['start']),
+                   (meeting['end'], meeting['end'] + WINDOW_AFTER))
+        for day in meeting['days']:
+            slots = set()
+            for begin, finish in windows:
+                slots.update(range(begin // SLOT_MINUTES, (finish - 1) // SLOT_MINUTES + 1))
+            for slot in slots:
+                rooms = crowds.setdefault((day, slot), {})
+                rooms[meeting['room']] = rooms.get(meeting['room'], 0) + meeting['enrolled']
+    return crowds
+
+
+def graph_signature(pf):
+    """Hash of the flattened adjacency, so stored multipliers are only applied to the graph they fit"""
+    digest = hashlib.sha1(repr(pf._neighbors).encode())
+    return digest.hexdigest()[:16]
+
+
+def edge_multipliers(pf, crowds):
+    """
+    Multiplier matrix for one floor
+
+    Returns:
+        (slots, matrix) with matrix[i] aligned to the concatenated neighbor
+        tuples of pf._neighbors (one float32 per directed edge)
+    """
+    rooms = {room for rooms in crowds.values() for room in rooms if room in pf.room_to_nodes}
+
+    # Spread factor of each room's crowd over the floor's nodes (by walking distance)
+    spread = {}
+    for room in rooms:
+        factors = np.zeros(len(pf._xs))
+        for door in pf.room_to_nodes[room]:
+            for node_id, dist in enumerate(pf._shortest_distances(door)):
+                if dist <= CUTOFF_DISTANCE:
+                    factors[node_id] = max(factors[node_id], math.exp(-dist / DECAY_DISTANCE))
+        spread[room] = factors
+
+    sources = np.array([node for node, neighbors in enumerate(pf._neighbors) for _ in neighbors], dtype=np.int64)
+    targets = np.array([neighbor for neighbors in pf._neighbors for neighbor in neighbors], dtype=np.int64)
+
+    slots = []
+    rows = []
+    for slot in sorted(crowds):
+        floor_rooms = {room: count for room, count in crowds[slot].items() if room in spread}
+        if not floor_rooms:
+            continue
+        load = np.zeros(len(pf._xs))
+        for room, count in floor_rooms.items():
+            load += count * spread[room]
+        edge_load = (load[sources] + load[targets]) / 2
+        rows.append(1 + (MAX_MULTIPLIER - 1) * edge_load / (edge_load + CORRIDOR_CAPACITY))
+        slots.append(slot)
+
+    matrix = np.array(rows, dtype=np.float32).reshape(len(rows), len(sources))
+    return slots, matrix
+
+
+def save_multipliers(floor_name, pf, slots, matrix, output_dir=CROWD_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, f'{floor_name}.npz')
+    np.savez_compressed(output_file, slots=np.array(slots, dtype=np.int16).reshape(len(slots), 2),
+                        multipliers=matrix, signature=np.array(graph_signature(pf)))
+    return output_file
+
+
+def crowd_file(floor_name):
+    return os.path.join(CROWD_DIR, f'{floor_name}.npz')
+
+
+def load_multipliers(floor_name, pf):
+    """
+    Stored (slots, matrix) for a floor, or None if missing or built for a different graph
+    """
+    path = crowd_file(floor_name)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        if str(data['signature']) != graph_signature(pf):
+            print(f"[WARNING] {os.path.basename(path)} was built for a different graph; "
+                  f"rerun crowd_weights.py")
+            return None
+        return [tuple(int(v) for v in slot) for slot in data['slots']], data['multipliers']
+
+
+def apply_crowd_weights(floor_name, pf):
+    """Install a floor's stored multipliers on a loaded pathfinder; returns the slot count (0 if none)"""
+    stored = load_multipliers(floor_name, pf)
+    if stored is None:
+        return 0
+    try:
+        return pf.load_crowd_weights(*stored)
+    except ValueError as e:
+        print(f"[WARNING] Crowd weights for {floor_name} not applied: {e}")
+        return 0
+
+
+def build_all(floor_names=None, schedule_csv=SCHEDULE_CSV):
+    """Precompute multipliers for the given floors (default: all with a graph)"""
+    from pathfinding import FloorNavigationConfig, get_floor_files
+    from pathfinder import IndoorPathfinder
+
+    crowds = slot_crowds(load_schedule(schedule_csv))
+    print(f"[OK] {len(crowds)} busy time slots from {os.path.basename(schedule_csv)}")
+
+    for floor_name in floor_names or FloorNavigationConfig.get_available_floors():
+        pf = IndoorPathfinder(*get_floor_files(floor_name))
+        pf.load_data()
+        slots, matrix = edge_multipliers(pf, crowds)
+        output_file = save_multipliers(floor_name, pf, slots, matrix)
+        peak = float(matrix.max()) if matrix.size else 1.0
+        print(f"[OK] {floor_name}: {len(slots)} slots x {matrix.shape[1]} edges, "
+              f"peak multiplier {peak:.2f} -> {os.path.relpath(output_file, BASE_DIR)}")
+
+
+def main():
+    """Command-line interface"""
+    parser = argparse.ArgumentParser(description='Precompute crowd-aware edge weights from the class schedule')
+    parser.add_argument('floors', nargs='*', help='Floors to build (default: all)')
+    parser.add_argument('--schedule', default=SCHEDULE_CSV, help='Schedule CSV')
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("BUILDING CROWD WEIGHTS")
+    print("="*70)
+    try:
+        build_all(args.floors or None, args.schedule)
+    except Exception as e:
+        print(f"\n[ERROR] {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
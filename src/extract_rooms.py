@@ -3,26 +3,71 @@ Extract Room Coordinates from DXF Floor Plans
 Generates CSV template for manual room labeling
 
 Usage: python extract_rooms.py <floor_name>
+       python extract_rooms.py --all [--workers N] [--output-dir DIR]
 Example: python extract_rooms.py floor_3
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import argparse
 import ezdxf
 import csv
+import json
 import os
 import sys
+import time
 
 
-def analyze_dxf_structure(dxf_file):
-    """Analyze DXF file structure"""
-    print(f"\n[ANALYSIS] Scanning {os.path.basename(dxf_file)}...")
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BATCH_DIR = os.path.join(BASE_DIR, 'output', 'extract')
+
+TEMPLATE_FIELDS = ['point_id', 'x', 'y', 'room_name', 'notes']
+
+
+def scan_dxf(dxf_file):
+    """
+    Read a DXF once and collect everything extraction needs in a single pass
     
+    Returns:
+        {'file', 'entities': {type: count}, 'points': [(x, y)], 'texts': [(x, y, text)],
+         'lines': LINE count, 'errors': [message], 'seconds'}
+    """
+    started = time.perf_counter()
     doc = ezdxf.readfile(dxf_file)
-    msp = doc.modelspace()
     
     entity_types = {}
-    for entity in msp:
+    points = []
+    texts = []
+    errors = []
+    for entity in doc.modelspace():
         entity_type = entity.dxftype()
         entity_types[entity_type] = entity_types.get(entity_type, 0) + 1
+        try:
+            if entity_type == 'POINT':
+                points.append((entity.dxf.location.x, entity.dxf.location.y))
+            elif entity_type == 'TEXT':
+                texts.append((entity.dxf.insert.x, entity.dxf.insert.y, entity.dxf.text))
+            elif entity_type == 'MTEXT':
+                texts.append((entity.dxf.insert.x, entity.dxf.insert.y, entity.text))
+        except Exception as e:
+            errors.append(f"{entity_type}: {e}")
+    
+    return {
+        'file': dxf_file,
+        'entities': entity_types,
+        'points': points,
+        'texts': texts,
+        'lines': entity_types.get('LINE', 0),
+        'errors': errors,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def analyze_dxf_structure(dxf_file, scan=None):
+    """Analyze DXF file structure (from scan_dxf output when already read)"""
+    print(f"\n[ANALYSIS] Scanning {os.path.basename(dxf_file)}...")
+    
+    entity_types = (scan or scan_dxf(dxf_file))['entities']
     
     print(f"\n[ENTITIES FOUND]")
     for entity_type in sorted(entity_types.keys()):
@@ -30,42 +75,34 @@ def analyze_dxf_structure(dxf_file):
         print(f"  {entity_type}: {count}")
 
 
-def extract_point_entities(dxf_file, output_csv):
-    """Extract POINT entities from DXF and save to CSV"""
+def write_label_template(points, output_path):
+    """Write POINT coordinates as a labels CSV template (ROOM_# placeholders)"""
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=TEMPLATE_FIELDS)
+        writer.writeheader()
+        for point_id, (x, y) in enumerate(points):
+            writer.writerow({
+                'point_id': point_id,
+                'x': x,
+                'y': y,
+                'room_name': f'ROOM_{point_id}',
+                'notes': f'Room {point_id} - needs labeling'
+            })
+
+
+def extract_point_entities(dxf_file, output_csv, scan=None):
+    """Extract POINT entities from DXF and save to CSV (from scan_dxf output when already read)"""
     print(f"\n[EXTRACTION] Loading POINT entities...")
     
-    doc = ezdxf.readfile(dxf_file)
-    msp = doc.modelspace()
-    
-    point_entities = []
-    point_id = 0
-    
-    for entity in msp:
-        if entity.dxftype() == 'POINT':
-            try:
-                x = entity.dxf.location.x
-                y = entity.dxf.location.y
-                point_entities.append({
-                    'point_id': point_id,
-                    'x': x,
-                    'y': y,
-                    'room_name': f'ROOM_{point_id}',
-                    'notes': f'Room {point_id} - needs labeling'
-                })
-                point_id += 1
-            except Exception as e:
-                print(f"  Warning: Could not extract point - {e}")
+    scan = scan or scan_dxf(dxf_file)
+    for error in scan['errors']:
+        print(f"  Warning: Could not extract point - {error}")
     
     # Save to CSV
-    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    output_path = os.path.join(base_path, 'data', output_csv)
-    
-    with open(output_path, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['point_id', 'x', 'y', 'room_name', 'notes'])
-        writer.writeheader()
-        writer.writerows(point_entities)
+    output_path = os.path.join(BASE_DIR, 'data', output_csv)
+    write_label_template(scan['points'], output_path)
     
-    print(f"\n[OK] Extracted {len(point_entities)} POINT entities")
+    print(f"\n[OK] Extracted {len(scan['points'])} POINT entities")
     print(f"     Saved to: {output_path}")
     print(f"\n[ACTION REQUIRED]")
     print(f"  1. Edit {output_csv} and replace:")
@@ -78,20 +115,157 @@ def extract_point_entities(dxf_file, output_csv):
     print(f"  4. Update pathfinding.py configuration")
 
 
+def _scan_floor(floor_name, dxf_file):
+    """Scan one floor's DXF (runs in a pool worker): (floor_name, scan or None, error or None)"""
+    try:
+        return floor_name, scan_dxf(dxf_file), None
+    except Exception as e:
+        return floor_name, None, str(e)
+
+
+def manifest_dxf_files():
+    """(floor_name, DXF path) for every manifest floor with a DXF: its 'dxf', else data/floor-plans/<floor>.DXF"""
+    from pathfinding import FloorNavigationConfig
+    
+    floors = []
+    for floor_name, config in FloorNavigationConfig.FLOORS.items():
+        dxf_path = os.path.join(BASE_DIR, 'data', 'floor-plans', config['dxf'] or f'{floor_name}.DXF')
+        if os.path.exists(dxf_path):
+            floors.append((floor_name, dxf_path))
+    return floors
+
+
+def _count_labels(floor_name):
+    """Rows in a floor's existing labels CSV (None if it has none)"""
+    from pathfinding import FloorNavigationConfig, CALIBRATION_LABELS
+    
+    labels = FloorNavigationConfig.FLOORS[floor_name]['labels']
+    labels_path = os.path.join(BASE_DIR, 'data', labels) if labels else None
+    if not labels_path or not os.path.exists(labels_path):
+        return None
+    with open(labels_path, 'r') as f:
+        return sum(1 for row in csv.DictReader(f)
+                   if row['room_name'].strip().split('_')[0].upper() not in CALIBRATION_LABELS)
+
+
+def batch_extract(floors=None, workers=None, output_dir=None):
+    """
+    Scan every floor's DXF in parallel and write label templates plus a summary
+    
+    Each DXF is read once (scan_dxf); the worker processes return plain lists
+    and the parent writes <floor>_rooms.csv templates and summary.json.
+    
+    Args:
+        floors (list): (floor_name, dxf_path) pairs (default: every manifest floor with a DXF)
+        workers (int): Process count (default: one per floor, capped at the CPU count)
+        output_dir (str): Destination (default: output/extract)
+    
+    Returns:
+        Summary dict ({'floors': [per-floor report], 'workers', 'seconds'})
+    """
+    floors = floors if floors is not None else manifest_dxf_files()
+    if not floors:
+        raise ValueError("No floor DXF files found")
+    output_dir = output_dir or DEFAULT_BATCH_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(floors)))
+    
+    print(f"\n[BATCH] {len(floors)} DXF files with {workers} worker(s) -> {output_dir}")
+    started = time.perf_counter()
+    results = None
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_scan_floor, *zip(*floors)))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"[WARNING] Parallel extraction unavailable ({e}), scanning serially")
+    if results is None:
+        results = [_scan_floor(*floor) for floor in floors]
+    
+    reports = []
+    for (floor_name, dxf_path), (_, scan, error) in zip(floors, results):
+        report = {'floor': floor_name, 'dxf': os.path.basename(dxf_path)}
+        if error:
+            report['error'] = error
+            print(f"  [X] {floor_name}: {error}")
+            reports.append(report)
+            continue
+        template = os.path.join(output_dir, f'{floor_name}_rooms.csv')
+        write_label_template(scan['points'], template)
+        report.update(
+            entities=dict(sorted(scan['entities'].items())),
+            points=len(scan['points']),
+            lines=scan['lines'],
+            texts=[{'x': x, 'y': y, 'text': text} for x, y, text in scan['texts']],
+            labelled=_count_labels(floor_name),
+            errors=scan['errors'],
+            template=os.path.basename(template),
+            seconds=round(scan['seconds'], 4),
+        )
+        reports.append(report)
+        print(f"  [OK] {floor_name}: {report['points']} points, {report['lines']} lines, "
+              f"{len(report['texts'])} texts ({scan['seconds'] * 1000:.0f} ms)")
+    
+    summary = {'workers': workers, 'seconds': round(time.perf_counter() - started, 3), 'floors': reports}
+    with open(os.path.join(output_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    print_summary(summary)
+    return summary
+
+
+def print_summary(summary):
+    """Per-floor table of the batch report"""
+    print("\n" + "="*70)
+    print(f"{'FLOOR':<10} {'DXF':<28} {'POINTS':>6} {'LABELLED':>8} {'LINES':>6} {'TEXTS':>6}")
+    print("="*70)
+    for report in summary['floors']:
+        if 'error' in report:
+            print(f"{report['floor']:<10} {report['dxf']:<28} [ERROR] {report['error']}")
+            continue
+        labelled = '-' if report['labelled'] is None else report['labelled']
+        print(f"{report['floor']:<10} {report['dxf']:<28} {report['points']:>6} {labelled:>8} "
+              f"{report['lines']:>6} {len(report['texts']):>6}")
+        for entity_type, count in report['entities'].items():
+            if entity_type not in ('POINT', 'LINE', 'TEXT', 'MTEXT'):
+                print(f"{'':<10} {entity_type}: {count}")
+    print("="*70)
+    print(f"[OK] {len(summary['floors'])} floors in {summary['seconds']:.2f}s with {summary['workers']} worker(s)")
+
+
+def batch_main(argv):
+    """Command-line interface for all-floors extraction"""
+    parser = argparse.ArgumentParser(prog='extract_rooms.py --all',
+                                     description='Extract label templates from every floor DXF')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--output-dir', default=None, help='Output directory (default: output/extract)')
+    args = parser.parse_args(argv)
+    try:
+        batch_extract(workers=args.workers, output_dir=args.output_dir)
+    except ValueError as e:
+        print(f"\n[ERROR] {e}")
+        sys.exit(1)
+
+
 def main():
     """Command-line interface"""
+    if len(sys.argv) > 1 and sys.argv[1] == '--all':
+        batch_main(sys.argv[2:])
+        return
+    
     if len(sys.argv) < 2:
         print("\n" + "="*70)
         print("EXTRACT ROOM COORDINATES FROM DXF")
         print("="*70)
         print("\nUSAGE:")
         print("  python extract_rooms.py <floor_name>")
+        print("  python extract_rooms.py --all [--workers N] [--output-dir DIR]")
         print("\nEXAMPLES:")
         print("  python extract_rooms.py floor_3")
         print("  python extract_rooms.py floor_4")
         print("  python extract_rooms.py floor_5")
         print("\nOUTPUT:")
         print("  Creates: data/<floor_name>_rooms.csv")
+        print("  --all:   output/extract/<floor_name>_rooms.csv for every floor, plus summary.json")
         print("\nNEXT STEPS:")
         print("  1. Edit CSV file with real room names")
         print("  2. Rename to *_labels.csv")
@@ -100,8 +274,7 @@ def main():
         sys.exit(1)
     
     floor_name = sys.argv[1].lower()
-    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    dxf_path = os.path.join(base_path, f'data/floor-plans/{floor_name}.DXF')
+    dxf_path = os.path.join(BASE_DIR, f'data/floor-plans/{floor_name}.DXF')
     
     if not os.path.exists(dxf_path):
         print(f"\n[ERROR] DXF file not found: {dxf_path}")
@@ -112,8 +285,9 @@ def main():
         print(f"EXTRACTING ROOMS FROM: {floor_name.upper()}")
         print("="*70)
         
-        analyze_dxf_structure(dxf_path)
-        extract_point_entities(dxf_path, f'{floor_name}_rooms.csv')
+        scan = scan_dxf(dxf_path)
+        analyze_dxf_structure(dxf_path, scan)
+        extract_point_entities(dxf_path, f'{floor_name}_rooms.csv', scan)
         
         print(f"\n{'='*70}")
         print("EXTRACTION COMPLETE")
@@ -0,0 +1,187 @@
+"""
+Fast JSON Encoding for API Responses
+Flask JSON provider with native NumPy support plus a direct route serializer
+"""
+
+import json
+import math
+from json.encoder import encode_basestring_ascii
+
+from flask.json.provider import DefaultJSONProvider
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional - stdlib fallback below
+    orjson = None
+
+
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _default(obj):
+    """Fallback for types the stdlib encoder doesn't know"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _finite(obj):
+    """Copy of obj with NaN/Infinity floats replaced by None (orjson writes them as null)"""
+    if isinstance(obj, (float, np.floating)):
+        return float(obj) if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return [_finite(value) for value in obj]
+    if isinstance(obj, np.ndarray):
+        return _finite(obj.tolist())
+    return obj
+
+
+def dumps(obj):
+    """Compact JSON string for obj (orjson when installed); non-finite floats become null"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode()
+    try:
+        return json.dumps(obj, default=_default, separators=(',', ':'), allow_nan=False)
+    except ValueError:
+        return json.dumps(_finite(obj), default=_default, separators=(',', ':'))
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Drop-in replacement for Flask's default provider
+
+    Encodes NumPy scalars/arrays natively and skips key sorting. Indented
+    output (debug mode / compact=False) still goes through the stdlib path.
+    """
+
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get('indent') or kwargs.get('sort_keys'):
+            kwargs.setdefault('default', _default)
+            return json.dumps(obj, **kwargs)
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+
+def _encode_value(value):
+    """Encode a scalar (or anything else via dumps) for hand-written JSON"""
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return repr(value) if math.isfinite(value) else 'null'
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    return dumps(value)
+
+
+# Waypoint fields with a fixed numeric shape get a printf slot instead of a type dispatch
+_INT_FIELDS = ('index', 'node_id')
+_FLOAT_FIELDS = ('distance_so_far',)
+_COORD_FIELDS = ('dxf_coords', 'pixel_coords')
+
+_waypoint_templates = {}
+
+
+def _waypoint_template(keys):
+    """Build (format string, field plan) for one waypoint key layout, cached per layout"""
+    template = _waypoint_templates.get(keys)
+    if template is None:
+        parts = []
+        plan = []
+        for key in keys:
+            name = encode_basestring_ascii(key)
+            if key in _INT_FIELDS:
+                parts.append(f'{name}:%d')
+                plan.append((key, 'int'))
+            elif key in _FLOAT_FIELDS:
+                parts.append(f'{name}:%.17g')
+                plan.append((key, 'float'))
+            elif key in _COORD_FIELDS:
+                parts.append(f'{name}:{{"x":%.17g,"y":%.17g}}')
+                plan.append((key, 'coords'))
+            else:
+                parts.append(f'{name}:%s')
+                plan.append((key, 'value'))
+        template = ('{' + ','.join(parts) + '}', plan)
+        _waypoint_templates[keys] = template
+    return template
+
+
+def _encode_waypoints(waypoints):
+    """Write a waypoint array straight to JSON text with one printf per waypoint"""
+    parts = []
+    isfinite = math.isfinite
+    for waypoint in waypoints:
+        template, plan = _waypoint_template(tuple(waypoint))
+        args = []
+        try:
+            for key, kind in plan:
+                value = waypoint[key]
+                if kind == 'coords':
+                    x, y = value['x'], value['y']
+                    if not (isfinite(x) and isfinite(y)):
+                        raise ValueError('non-finite coordinate')
+                    args.append(x)
+                    args.append(y)
+                elif kind == 'value':
+                    args.append(_encode_value(value))
+                elif kind == 'float':
+                    if not isfinite(value):
+                        raise ValueError('non-finite distance')
+                    args.append(value)
+                else:
+                    args.append(value)
+            parts.append(template % tuple(args))
+        except (TypeError, KeyError, ValueError):
+            # Unexpected shape (e.g. None coordinate, NaN) - fall back to the generic encoder
+            parts.append(dumps(waypoint))
+    return '[' + ','.join(parts) + ']'
+
+
+def encode_route(route):
+    """
+    Serialize a route result (single- or multi-floor) to a JSON string
+
+    Uses orjson when installed. Otherwise waypoint arrays are written directly
+    from the waypoint records through a cached per-layout printf template
+    instead of the generic recursive encoder.
+    """
+    if orjson is not None:
+        return dumps(route)
+
+    fields = []
+    for key, value in route.items():
+        if key == 'waypoints':
+            encoded = _encode_waypoints(value)
+        elif key == 'segments':
+            encoded = '[' + ','.join(
+                '{' + ','.join(
+                    encode_basestring_ascii(seg_key) + ':' +
+                    (_encode_waypoints(seg_value) if seg_key == 'waypoints' else _encode_value(seg_value))
+                    for seg_key, seg_value in segment.items()
+                ) + '}'
+                for segment in value
+            ) + ']'
+        else:
+            encoded = _encode_value(value)
+        fields.append(encode_basestring_ascii(key) + ':' + encoded)
+    return '{' + ','.join(fields) + '}'
@@ -0,0 +1,444 @@
+"""
+Floor Registry
+Process-wide floor graphs shared by API requests, built by a background warmup
+and rebuilt in the background when a floor's input files change
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+from pathfinding import FloorNavigationConfig, get_floor_files, CALIBRATION_LABELS
+from multi_floor_pathfinder import MultiFloorPathfinder, _load_floor
+from crowd_weights import apply_crowd_weights, crowd_file
+
+try:
+    import resource
+except ImportError:  # Windows: no RSS figure in /ready or the warmup log
+    resource = None
+
+
+# Floor status values reported by /ready
+PENDING = 'pending'
+LAZY = 'lazy'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+# Seconds between input file checks when watching for changes
+WATCH_INTERVAL = 2.0
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+
+
+def _rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable; None if neither is)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError):
+        if resource is None:
+            return None
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def floor_input_files(floor_name):
+    """Files a floor's graph and API responses are built from: DXF, labels CSV, navigation export, crowd weights"""
+    dxf_file, _, labels_file = get_floor_files(floor_name)
+    prefix = FloorNavigationConfig.get_floor_config(floor_name)['output_prefix']
+    return [dxf_file, labels_file, os.path.join(OUTPUT_DIR, f'{prefix}_navigation.json'), crowd_file(floor_name)]
+
+
+def floor_fingerprint(floor_name):
+    """Short hash of the input files' sizes and mtimes (same in every worker process)"""
+    return files_fingerprint(floor_input_files(floor_name))
+
+
+def files_fingerprint(paths):
+    """Short hash of these files' sizes and mtimes (missing files included as such)"""
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            digest.update(f'{path}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+        except OSError:
+            digest.update(f'{path}:missing;'.encode())
+    return digest.hexdigest()[:12]
+
+
+class FloorSnapshot:
+    """
+    One immutable generation of the loaded floors
+
+    Requests take the registry's current snapshot once and use it throughout,
+    so a reload that swaps in a new snapshot never changes the graph under a
+    request that is already running.
+    """
+
+    def __init__(self, version, pathfinders, fingerprints, multi_floor=None, errors=None):
+        self.version = version
+        self.pathfinders = pathfinders
+        self.fingerprints = fingerprints
+        self.multi_floor = multi_floor
+        self.errors = errors or {}
+
+    def get(self, floor_name):
+        """Loaded pathfinder for a floor, or None"""
+        return self.pathfinders.get(floor_name)
+
+    def check(self, floors):
+        """Raise ValueError if any of these floors failed to build (and its files have not changed since)"""
+        for floor_name in sorted(set(floors)):
+            if floor_name in self.errors:
+                raise ValueError(f"Floor '{floor_name}' could not be loaded: {self.errors[floor_name]}")
+
+    def multi_floor_for(self, floors):
+        """
+        MultiFloorPathfinder covering these floors
+
+        The shared one when every floor is loaded. A floor whose build failed
+        raises ValueError (it is not rebuilt until its files change). Otherwise
+        one for this call, with the missing floors built per call as
+        run_pathfinding does without a pathfinder. None before warmup has
+        finished: find_multi_floor_path then builds every floor.
+        """
+        if self.multi_floor is None:
+            return None
+        self.check(floors)
+        missing = sorted(floor for floor in set(floors) if floor not in self.pathfinders)
+        if not missing:
+            return self.multi_floor
+        pathfinders = dict(self.pathfinders)
+        for floor_name in missing:
+            _, pf, _, error = _load_floor(floor_name, *get_floor_files(floor_name))
+            if error:
+                raise ValueError(f"Floor '{floor_name}' could not be loaded: {error}")
+            apply_crowd_weights(floor_name, pf)
+            pathfinders[floor_name] = pf
+        return MultiFloorPathfinder(pathfinders=pathfinders)
+
+    def etag(self, floors):
+        """Entity tag for a response built from these floors (None if any is not loaded)"""
+        floors = sorted(set(floors))
+        if not all(floor in self.fingerprints for floor in floors):
+            return None
+        return '-'.join(f'{floor}.{self.fingerprints[floor]}' for floor in floors)
+
+
+class FloorRegistry:
+    """
+    Loaded IndoorPathfinders per floor plus a MultiFloorPathfinder sharing them
+
+    warmup() builds the manifest's preload floors (in a process pool when
+    there is more than one CPU), precomputes ALT landmarks and runs one search
+    per floor so the per-thread scratch arrays exist before the first real
+    request. Other floors stay LAZY until ensure() builds them on first use,
+    so adding floors does not add to startup time or idle memory. Until a
+    floor is ready, get() returns None and callers fall back to building the
+    graph themselves. A floor whose build fails is FAILED with the
+    fingerprint it was built from (snapshot.check() then refuses it) and is
+    only retried once the watcher sees its files change.
+
+    start_watching() polls each floor's input files; a floor whose files
+    changed (and then stayed unchanged for one more poll) is rebuilt in the
+    background and swapped in as a new FloorSnapshot. Listeners registered
+    with add_listener() are called with the floor name after each swap.
+    """
+
+    def __init__(self, floors=None, load_workers=None, preload=None):
+        """
+        Args:
+            floors: Navigable floors to serve (default: every floor in the manifest with a DXF and labels)
+            load_workers: Processes for the warmup build (default: one per floor, capped at the CPU count)
+            preload: Floors built by warmup (default: the manifest's preload floors); the rest load lazily
+        """
+        self.floors = list(floors or FloorNavigationConfig.get_available_floors())
+        if preload is None:
+            preload = FloorNavigationConfig.get_preload_floors()
+        self.preload = [floor for floor in self.floors if floor in preload]
+        self.load_workers = load_workers
+        self.snapshot = FloorSnapshot(0, {}, {})
+        self.started = None
+        self.finished = None
+        self.status = {floor: {'status': PENDING if floor in self.preload else LAZY} for floor in self.floors}
+        self._lock = threading.Lock()
+        self._floor_locks = {floor: threading.Lock() for floor in self.floors}
+        self._ready = threading.Event()
+        self._thread = None
+        self._watcher = None
+        self._stop = threading.Event()
+        self._pending = {}
+        self._seen = {}
+        self._listeners = []
+
+    @property
+    def pathfinders(self):
+        return self.snapshot.pathfinders
+
+    @property
+    def multi_floor(self):
+        return self.snapshot.multi_floor
+
+    def get(self, floor_name):
+        """Ready pathfinder for a floor, or None"""
+        return self.snapshot.get(floor_name)
+
+    def add_listener(self, callback):
+        """Call callback(floor_name) after a floor's graph is swapped"""
+        self._listeners.append(callback)
+
+    def is_ready(self):
+        return self._ready.is_set() and all(s['status'] in (READY, LAZY) for s in self.status.values())
+
+    def wait_ready(self, timeout=None):
+        """Block until warmup has finished (True if every floor is ready; False at once if never started)"""
+        if self._thread is not None:
+            self._ready.wait(timeout)
+        return self.is_ready()
+
+    def start_warmup(self):
+        """Run warmup() in a daemon thread (no-op if already started)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.warmup, name='floor-warmup', daemon=True)
+                self._thread.start()
+        return self._thread
+
+    def warmup(self):
+        """Build, index and exercise every preload floor"""
+        self.started = time.time()
+        lazy = [floor for floor in self.floors if floor not in self.preload]
+        print(f"[WARMUP] Building {len(self.preload)} floor(s): {', '.join(self.preload)}"
+              + (f" (on first request: {', '.join(lazy)})" if lazy else ''))
+
+        jobs = []
+        fingerprints = {}
+        for floor_name in self.preload:
+            self.status[floor_name] = {'status': LOADING}
+            try:
+                fingerprints[floor_name] = self._seen[floor_name] = floor_fingerprint(floor_name)
+                jobs.append((floor_name,) + get_floor_files(floor_name))
+            except Exception as e:
+                self.status[floor_name] = {'status': FAILED, 'error': str(e)}
+
+        for floor_name, pf, seconds, error in self._build(jobs):
+            try:
+                if error:
+                    raise ValueError(error)
+                self._install(floor_name, pf, fingerprints[floor_name], self._prepare(floor_name, pf, seconds))
+            except Exception as e:
+                self._fail(floor_name, fingerprints[floor_name], str(e), build_seconds=round(seconds, 3))
+                print(f"[ERROR] Warmup failed for {floor_name}: {e}")
+
+        self.finished = time.time()
+        self._publish()
+        self._ready.set()
+        state = 'ready' if self.is_ready() else 'finished with errors'
+        rss = _rss_mb()
+        print(f"[WARMUP] {state} in {self.finished - self.started:.2f}s" + (f" ({rss} MB RSS)" if rss is not None else ''))
+
+    def ensure(self, *floor_names):
+        """
+        Build lazy floors that a request needs (once; concurrent callers wait for the same build)
+
+        Floors still being built by warmup are left to it, failed floors wait
+        for their files to change, and nothing is built before warmup has
+        started (WARMUP=0 serves every request with per-call builds). Returns
+        the current snapshot.
+        """
+        if self.started is None:
+            return self.snapshot
+        for floor_name in floor_names:
+            if self.status.get(floor_name, {}).get('status') != LAZY:
+                continue
+            with self._floor_locks[floor_name]:
+                if self.status[floor_name]['status'] != LAZY:
+                    continue
+                self.status[floor_name] = {'status': LOADING}
+                print(f"[LAZY] Building {floor_name} on first request...")
+                fingerprint = self._seen[floor_name] = floor_fingerprint(floor_name)
+                _, pf, seconds, error = _load_floor(floor_name, *get_floor_files(floor_name))
+                try:
+                    if error:
+                        raise ValueError(error)
+                    status = self._prepare(floor_name, pf, seconds)
+                except Exception as e:
+                    # Retried by check_for_changes() once the floor's files change
+                    self._fail(floor_name, fingerprint, str(e))
+                    print(f"[ERROR] Lazy build failed for {floor_name}: {e}")
+                    continue
+                self._install(floor_name, pf, fingerprint, status)
+                print(f"[LAZY] {floor_name} ready ({seconds * 1000:.0f} ms)")
+        return self.snapshot
+
+    def _build(self, jobs):
+        """Floor graphs via the process pool, or serially on one CPU"""
+        workers = self.load_workers or min(len(jobs), os.cpu_count() or 1)
+        if workers > 1 and len(jobs) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    return list(pool.map(_load_floor, *zip(*jobs)))
+            except (OSError, BrokenProcessPool) as e:
+                print(f"[WARNING] Parallel warmup unavailable ({e}), building serially")
+        return [_load_floor(*job) for job in jobs]
+
+    def _prepare(self, floor_name, pf, build_seconds):
+        """Precompute search indexes, install crowd weights and run one search; returns the floor status"""
+        started = time.perf_counter()
+        pf.precompute_landmarks()
+        crowd_slots = apply_crowd_weights(floor_name, pf)
+        rooms = sorted(room for room in pf.room_to_nodes if room not in CALIBRATION_LABELS)
+        if len(rooms) >= 2:
+            pf.find_path(rooms[0], rooms[-1])
+        index_seconds = time.perf_counter() - started
+
+        return {
+            'status': READY,
+            'build_seconds': round(build_seconds, 3),
+            'index_seconds': round(index_seconds, 3),
+            'nodes': len(pf.nodes),
+            'rooms': len(rooms),
+            'crowd_slots': crowd_slots,
+            'graph_kb': round(len(pickle.dumps(pf, pickle.HIGHEST_PROTOCOL)) / 1024, 1),
+        }
+
+    def _install(self, floor_name, pf, fingerprint, status):
+        """Swap a built floor into a new snapshot, then notify listeners"""
+        with self._lock:
+            current = self.snapshot
+            pathfinders = dict(current.pathfinders)
+            pathfinders[floor_name] = pf
+            fingerprints = dict(current.fingerprints)
+            fingerprints[floor_name] = fingerprint
+            errors = {floor: error for floor, error in current.errors.items() if floor != floor_name}
+            version = current.version + 1
+            status['version'] = version
+            status['fingerprint'] = fingerprint
+            self.snapshot = self._snapshot(version, pathfinders, fingerprints, errors)
+            self.status[floor_name] = status
+        for callback in self._listeners:
+            callback(floor_name)
+
+    def _fail(self, floor_name, fingerprint, error, **details):
+        """Mark a floor that has no graph as FAILED for the files it was built from"""
+        with self._lock:
+            current = self.snapshot
+            errors = dict(current.errors)
+            errors[floor_name] = error
+            self.snapshot = self._snapshot(current.version, current.pathfinders, current.fingerprints, errors)
+            self.status[floor_name] = dict(details, status=FAILED, error=error, fingerprint=fingerprint)
+
+    def _publish(self):
+        """Re-issue the current snapshot (adds the shared MultiFloorPathfinder once warmup is done)"""
+        with self._lock:
+            current = self.snapshot
+            self.snapshot = self._snapshot(current.version, current.pathfinders, current.fingerprints,
+                                           current.errors)
+
+    def _snapshot(self, version, pathfinders, fingerprints, errors=None):
+        multi_floor = MultiFloorPathfinder(pathfinders=pathfinders) if self.finished else None
+        return FloorSnapshot(version, pathfinders, fingerprints, multi_floor, errors)
+
+    def start_watching(self, interval=WATCH_INTERVAL):
+        """Poll floor input files in a daemon thread and reload floors that changed"""
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch, args=(interval,),
+                                                 name='floor-watcher', daemon=True)
+                self._watcher.start()
+        return self._watcher
+
+    def stop_watching(self):
+        self._stop.set()
+
+    def _watch(self, interval):
+        self._ready.wait()
+        while not self._stop.wait(interval):
+            try:
+                self.check_for_changes()
+            except Exception as e:
+                print(f"[ERROR] Floor watcher: {e}")
+
+    def check_for_changes(self):
+        """
+        Reload floors whose input files changed
+
+        A change is acted on once the new fingerprint has been seen on two
+        consecutive checks, so a file still being written is not loaded half-way.
+
+        Returns:
+            Names of the floors reloaded
+        """
+        reloaded = []
+        for floor_name in self.floors:
+            if floor_name not in self._seen:
+                continue  # lazy floor not loaded yet: it reads its files when first built
+            fingerprint = floor_fingerprint(floor_name)
+            if fingerprint == self._seen.get(floor_name):
+                self._pending.pop(floor_name, None)
+                continue
+            if self._pending.get(floor_name) != fingerprint:
+                self._pending[floor_name] = fingerprint
+                continue
+            del self._pending[floor_name]
+            if self.reload(floor_name):
+                reloaded.append(floor_name)
+        return reloaded
+
+    def reload(self, floor_name):
+        """
+        Rebuild one floor and swap it in; the old graph keeps serving until then
+        and stays in place if the rebuild fails
+
+        Returns:
+            True if the new graph was swapped in
+        """
+        # Recorded before the build: edits made while it runs trigger another reload
+        fingerprint = self._seen[floor_name] = floor_fingerprint(floor_name)
+        print(f"[RELOAD] {floor_name} inputs changed, rebuilding...")
+        self.status[floor_name] = dict(self.status.get(floor_name, {}), reloading=True)
+
+        _, pf, seconds, error = _load_floor(floor_name, *get_floor_files(floor_name))
+        try:
+            if error:
+                raise ValueError(error)
+            status = self._prepare(floor_name, pf, seconds)
+        except Exception as e:
+            if floor_name not in self.snapshot.pathfinders:
+                self._fail(floor_name, fingerprint, str(e))
+                print(f"[ERROR] Reload failed for {floor_name}: {e}")
+                return False
+            previous = {k: v for k, v in self.status.get(floor_name, {}).items() if k != 'reloading'}
+            self.status[floor_name] = dict(previous, reload_error=str(e))
+            print(f"[ERROR] Reload failed for {floor_name}, keeping the previous graph: {e}")
+            return False
+
+        self._install(floor_name, pf, fingerprint, status)
+        print(f"[RELOAD] {floor_name} swapped in as version {status['version']} ({seconds * 1000:.0f} ms)")
+        return True
+
+    def report(self):
+        """Readiness report: overall state, per-floor status and process memory"""
+        if self.is_ready():
+            state = READY
+        elif self._ready.is_set():
+            state = FAILED
+        elif self.started is None:
+            state = PENDING
+        else:
+            state = LOADING
+        report = {
+            'status': state,
+            'version': self.snapshot.version,
+            'floors': self.status,
+            'warmup_seconds': round((self.finished or time.time()) - self.started, 3) if self.started else None,
+        }
+        rss = _rss_mb()
+        if rss is not None:
+            report['rss_mb'] = rss
+        return report
@@ -4,30 +4,39 @@ Handles pathfinding across multiple floors using stairwells and elevators
 """
 
 from pathfinder import IndoorPathfinder
-from pathfinding import FloorNavigationConfig
+from pathfinding import FloorNavigationConfig, get_floor_files
+from crowd_weights import apply_crowd_weights
+from route_instructions import simplify_route, DEFAULT_TOLERANCE
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import os
-import numpy as np
+import time
+
+
+PIXELS_PER_UNIT = FloorNavigationConfig.pixels_per_unit()
 
 
 class ElevatorMapper:
-    """Maps elevator connections between all floors"""
+    """Maps elevator connections between floors (manifest 'elevators': {name: [floors served]})"""
+    
+    def __init__(self, manifest=None):
+        self.manifest = manifest or FloorNavigationConfig.MANIFEST
     
-    @staticmethod
-    def get_elevators():
+    def get_elevators(self):
         """
-        Get list of all elevators that connect all floors
-        Elevators have the same name across all floors and can go to any floor
+        Get list of all elevators
+        Elevators have the same name on every floor they serve
         """
-        return ['WElev2', 'WElev3', 'EElev1']
+        return list(self.manifest['elevators'])
     
-    @staticmethod
-    def can_connect_floors(from_floor, to_floor):
+    def can_connect_floors(self, from_floor, to_floor, elevator=None):
         """
-        Check if elevators can connect two floors
-        Elevators connect all floors bidirectionally
+        Check if elevators can connect two floors (a given one, or any)
+        Elevators connect the floors they serve bidirectionally
         """
-        valid_floors = ['basement', 'floor_1', 'floor_2']
-        return from_floor in valid_floors and to_floor in valid_floors and from_floor != to_floor
+        elevators = self.manifest['elevators']
+        served = [elevators.get(elevator, [])] if elevator else elevators.values()
+        return from_floor != to_floor and any(from_floor in floors and to_floor in floors for floors in served)
 
 
 class StairwellMapper:
@@ -37,127 +46,18 @@ class StairwellMapper:
     # - Stairs ending with S: Direct connection (W101S floor_1 <-> W201S floor_2 <-> W001S basement)
     # - SS/SN/SW/SE: Special directional stairs with specific mappings
     
-    @staticmethod
-    def get_stair_connections():
+    def __init__(self, manifest=None):
+        self.manifest = manifest or FloorNavigationConfig.MANIFEST
+    
+    def get_stair_connections(self):
         """
-        Define all stairwell connections between floors
-        Returns dict of {stair_name: {floor: connected_stair}}
+        All stairwell connections between floors (manifest 'stairs')
+        Returns dict of {stair_name: {'<from>_to_<to>': connected_stair}}; a stair whose
+        exit and arrival differ (W103SN) uses '<from>_to_<to>_exit' / '_arrive' keys
         """
-        connections = {
-            # W101S: basement W001S <-> floor_1 W101S <-> floor_2 W201S
-            'W101S': {
-                'floor_1_to_basement': 'W001S',
-                'floor_1_to_floor_2': 'W201S',
-            },
-            'W001S': {
-                'basement_to_floor_1': 'W101S',
-                'basement_to_floor_2': 'W201S',  # Direct basement to 2nd floor connection
-            },
-            'W201S': {
-                'floor_2_to_floor_1': 'W101S',
-                'floor_2_to_basement': 'W001S',  # Direct 2nd floor to basement connection
-            },
-            
-            # W102SS/W002SS/W202SS connections
-            'W102SS': {
-                'floor_1_to_basement': 'W002SS',
-                'floor_1_to_floor_2': 'W202SS',
-            },
-            'W002SS': {
-                'basement_to_floor_1': 'W102SS',
-                'basement_to_floor_2': 'W202SS',  # Direct basement to 2nd floor connection
-            },
-            'W202SS': {
-                'floor_2_to_floor_1': 'W102SS',
-                'floor_2_to_basement': 'W002SS',  # Direct 2nd floor to basement connection
-            },
-            
-            # W103SN special case
-            'W103SN': {
-                'floor_1_to_basement': 'W003S',  # Down to W003S (if exists)
-                'floor_1_to_floor_2_exit': 'W103SS',  # Exit via W103SS
-                'floor_1_to_floor_2_arrive': 'W203SN',  # Arrive at W203SN
-            },
-            'W003S': {
-                'basement_to_floor_1': 'W103SN',
-                'basement_to_floor_2': 'W203SN',  # Direct basement to 2nd floor connection
-            },
-            'W203SN': {
-                'floor_2_to_floor_1': 'W103SN',
-                'floor_2_to_basement': 'W003S',  # Direct 2nd floor to basement connection
-            },
-            
-            # W104S: basement W004S <-> floor_1 W104S <-> floor_2 W204S
-            'W104S': {
-                'floor_1_to_basement': 'W004S',
-                'floor_1_to_floor_2': 'W204S',
-            },
-            'W004S': {
-                'basement_to_floor_1': 'W104S',
-                'basement_to_floor_2': 'W204S',  # Direct basement to 2nd floor connection
-            },
-            'W204S': {
-                'floor_2_to_floor_1': 'W104S',
-                'floor_2_to_basement': 'W004S',  # Direct 2nd floor to basement connection
-            },
-            
-            # E102S: basement E002S <-> floor_1 E102S <-> floor_2 E202S
-            'E102S': {
-                'floor_1_to_basement': 'E002S',
-                'floor_1_to_floor_2': 'E202S',
-            },
-            'E002S': {
-                'basement_to_floor_1': 'E102S',
-                'basement_to_floor_2': 'E202S',  # Direct basement to 2nd floor connection
-            },
-            'E202S': {
-                'floor_2_to_floor_1': 'E102S',
-                'floor_2_to_basement': 'E002S',  # Direct 2nd floor to basement connection
-            },
-            
-            # E103S: basement E003S <-> floor_1 E103S <-> floor_2 E203S
-            'E103S': {
-                'floor_1_to_basement': 'E003S',
-                'floor_1_to_floor_2': 'E203S',
-            },
-            'E003S': {
-                'basement_to_floor_1': 'E103S',
-                'basement_to_floor_2': 'E203S',  # Direct basement to 2nd floor connection
-            },
-            'E203S': {
-                'floor_2_to_floor_1': 'E103S',
-                'floor_2_to_basement': 'E003S',  # Direct 2nd floor to basement connection
-            },
-            
-            # E104S: floor_1 E104S <-> floor_2 E204S
-            'E104S': {
-                'floor_1_to_floor_2': 'E204S',
-            },
-            'E204S': {
-                'floor_2_to_floor_1': 'E104S',
-            },
-            
-            # E105SW/SE special case
-            'E105SW': {
-                'floor_1_to_basement': 'E005S',
-            },
-            'E105SE': {
-                'floor_1_to_floor_2': 'E205S',
-            },
-            'E005S': {
-                'basement_to_floor_1': 'E105SW',
-                'basement_to_floor_2': 'E205S',  # Direct basement to 2nd floor connection
-            },
-            'E205S': {
-                'floor_2_to_floor_1': 'E105SE',
-                'floor_2_to_basement': 'E005S',  # Direct 2nd floor to basement connection
-            },
-        }
-        
-        return connections
+        return self.manifest['stairs']
     
-    @staticmethod
-    def get_connected_stair(stair_name, from_floor, to_floor):
+    def get_connected_stair(self, stair_name, from_floor, to_floor):
         """
         Get the connected stairwell when moving between floors
         
@@ -169,7 +69,7 @@ class StairwellMapper:
         Returns:
             Dictionary with 'exit_stair' and 'arrive_stair' (may be same or different)
         """
-        connections = StairwellMapper.get_stair_connections()
+        connections = self.get_stair_connections()
         
         if stair_name not in connections:
             return None
@@ -198,36 +98,82 @@ class StairwellMapper:
         return None
 
 
+def _load_floor(floor_name, dxf_file, image_file, labels_file):
+    """
+    Build one floor's graph (runs in a pool worker; the pathfinder pickles compactly)
+
+    Returns:
+        (floor_name, pathfinder or None, seconds, error message or None)
+    """
+    started = time.perf_counter()
+    try:
+        pf = IndoorPathfinder(dxf_file, image_file, labels_file)
+        pf.load_data()
+    except Exception as e:
+        return floor_name, None, time.perf_counter() - started, str(e)
+    return floor_name, pf, time.perf_counter() - started, None
+
+
 class MultiFloorPathfinder:
     """Pathfinding across multiple floors using stairs and elevators"""
     
-    def __init__(self):
+    def __init__(self, load_workers=None, pathfinders=None, manifest=None):
+        """
+        Args:
+            load_workers: Processes used to build the floor graphs (default: one per
+                          floor, capped at the CPU count; 1 loads serially in-process)
+            pathfinders: Already loaded {floor_name: IndoorPathfinder} to share
+                         instead of loading (e.g. from FloorRegistry)
+            manifest: Floor manifest of the building (default: data/floors.json);
+                      another building's floors must be passed in as pathfinders
+        """
         self.pathfinders = {}
-        self.stair_mapper = StairwellMapper()
-        self.elevator_mapper = ElevatorMapper()
-        self._load_all_floors()
-    
-    def _load_all_floors(self):
-        """Load pathfinder for each available floor"""
-        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
-        for floor_name in ['basement', 'floor_1', 'floor_2']:
+        self.load_seconds = {}
+        self.manifest = manifest or FloorNavigationConfig.MANIFEST
+        self.pixels_per_unit = self.manifest['calibration'].get('pixels_per_unit', PIXELS_PER_UNIT)
+        self.stair_mapper = StairwellMapper(self.manifest)
+        self.elevator_mapper = ElevatorMapper(self.manifest)
+        self._component_links = {}
+        if pathfinders is not None:
+            self.pathfinders = dict(pathfinders)
+        else:
+            self._load_all_floors(load_workers)
+
+    def _load_all_floors(self, workers=None):
+        """Load pathfinder for each available floor, in parallel when possible"""
+        floors = []
+        for floor_name in FloorNavigationConfig.get_available_floors():
             try:
-                config = FloorNavigationConfig.get_floor_config(floor_name)
-                
-                dxf_file = os.path.join(base_path, 'data/floor-plans', config['dxf'])
-                image_file = os.path.join(base_path, 'data/floor-plans', config['image'])
-                labels_file = os.path.join(base_path, 'data', config['labels'])
-                
+                dxf_file, image_file, labels_file = get_floor_files(floor_name)
                 if os.path.exists(dxf_file) and os.path.exists(labels_file):
-                    pf = IndoorPathfinder(dxf_file, image_file, labels_file)
-                    pf.load_data()
-                    self.pathfinders[floor_name] = pf
-                    print(f"[OK] Loaded {floor_name}")
+                    floors.append((floor_name, dxf_file, image_file, labels_file))
             except Exception as e:
                 print(f"[ERROR] Failed to load {floor_name}: {e}")
+
+        if workers is None:
+            workers = min(len(floors), os.cpu_count() or 1)
+
+        results = None
+        if workers > 1 and len(floors) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(_load_floor, *zip(*floors)))
+            except (OSError, BrokenProcessPool) as e:
+                print(f"[WARNING] Parallel floor loading unavailable ({e}), loading serially")
+        if results is None:
+            results = [_load_floor(*floor) for floor in floors]
+
+        for floor_name, pf, seconds, error in results:
+            if error:
+                print(f"[ERROR] Failed to load {floor_name}: {error}")
+                continue
+            apply_crowd_weights(floor_name, pf)
+            self.pathfinders[floor_name] = pf
+            self.load_seconds[floor_name] = seconds
+            print(f"[OK] Loaded {floor_name} ({seconds * 1000:.0f} ms)")
     
-    def find_multi_floor_path(self, start_floor, start_room, end_floor, end_room, ada_compliance=False):
+    def find_multi_floor_path(self, start_floor, start_room, end_floor, end_room, ada_compliance=False,
+                              simplify=False, tolerance=DEFAULT_TOLERANCE, closures=None, departure=None):
         """
         Find path across multiple floors
         
@@ -237,10 +183,31 @@ class MultiFloorPathfinder:
             end_floor: Destination floor name
             end_room: Destination room name
             ada_compliance: If True, use only elevators for floor changes (default: False)
+            simplify: If True, merge collinear waypoints and add turn-by-turn instructions
+            tolerance: Collinearity tolerance in DXF units (with simplify)
+            closures: ClosureOverlay of closed/penalized nodes, edges, rooms and transitions
+            departure: datetime of departure, to avoid corridors crowded by class changes
             
         Returns:
             Dictionary with path segments for each floor and transition points
         """
+        result = self._find_route(start_floor, start_room, end_floor, end_room, ada_compliance, closures, departure)
+        if simplify:
+            simplify_route(
+                result, tolerance,
+                landmark_lookup=self._nearest_room_label,
+                floor_order=list(self.manifest['floors'])
+            )
+        return result
+    
+    def _nearest_room_label(self, floor_name, x, y):
+        """Room name near a point on a floor (turn naming for instructions)"""
+        pf = self.pathfinders.get(floor_name)
+        return pf.nearest_room_label(x, y) if pf else None
+    
+    def _find_route(self, start_floor, start_room, end_floor, end_room, ada_compliance=False, closures=None,
+                    departure=None):
+        """Dispatch to single-floor or cross-floor search"""
         start_room = start_room.upper()
         end_room = end_room.upper()
         
@@ -250,9 +217,12 @@ class MultiFloorPathfinder:
             if not pf:
                 raise ValueError(f"Floor '{start_floor}' not loaded")
             
-            path, distance = pf.find_path(start_room, end_room)
+            floor_closures = closures.for_floor(start_floor) if closures else None
+            path, cumulative = pf.find_path_with_distances(start_room, end_room, closures=floor_closures,
+                                                           departure=departure)
             if not path:
                 raise ValueError(f"No path found on {start_floor}")
+            distance = cumulative[-1]
             
             # Convert to waypoints format
             waypoints = []
@@ -263,8 +233,9 @@ class MultiFloorPathfinder:
                     'index': idx,
                     'node_id': node_id,
                     'dxf_coords': {'x': x, 'y': y},
-                    'pixel_coords': {'x': x * 25.4, 'y': y * 25.4},
-                    'label': label
+                    'pixel_coords': {'x': x * self.pixels_per_unit, 'y': y * self.pixels_per_unit},
+                    'label': label,
+                    'distance_so_far': cumulative[idx]
                 })
             
             return {
@@ -282,9 +253,11 @@ class MultiFloorPathfinder:
             }
         
         # Multi-floor pathfinding
-        return self._find_cross_floor_path(start_floor, start_room, end_floor, end_room, ada_compliance)
+        return self._find_cross_floor_path(start_floor, start_room, end_floor, end_room, ada_compliance, closures,
+                                           departure)
     
-    def _find_cross_floor_path(self, start_floor, start_room, end_floor, end_room, ada_compliance=False):
+    def _find_cross_floor_path(self, start_floor, start_room, end_floor, end_room, ada_compliance=False,
+                               closures=None, departure=None):
         """Find path across multiple floors using stairs or elevators"""
         # For now, implement simple one-transition logic (start floor -> transition -> end floor)
         # TODO: Implement multi-hop pathfinding for more than 2 floors
@@ -295,50 +268,48 @@ class MultiFloorPathfinder:
         if not start_pf or not end_pf:
             raise ValueError("One or both floors not loaded")
         
-        # Get transition points based on ADA compliance mode
-        if ada_compliance:
-            # Use elevators only
-            transition_points = self.elevator_mapper.get_elevators()
-            transition_type = 'elevator'
-        else:
-            # Use stairwells
-            transition_points = self._get_stairs_on_floor(start_floor)
-            transition_type = 'stairs'
+        transition_type = 'elevator' if ada_compliance else 'stairs'
+        transitions = self._viable_transitions(start_floor, start_room, end_floor, end_room, ada_compliance)
+        if not transitions:
+            # No transition joins the rooms' connected components (O(1) rejection, no search)
+            mode_text = "elevator" if ada_compliance else "stairwell"
+            raise ValueError(f"No {mode_text} path found from {start_floor}/{start_room} to {end_floor}/{end_room}")
+        
+        start_closures = closures.for_floor(start_floor) if closures else None
+        end_closures = closures.for_floor(end_floor) if closures else None
         
         # Try to find a path using each available transition point
         best_path = None
         best_distance = float('inf')
+        best_cost = float('inf')
         best_transition = None
         
-        for transition_name in transition_points:
-            if ada_compliance:
-                # Elevators: same name on all floors, direct connection
-                exit_point = transition_name
-                arrive_point = transition_name
-            else:
-                # Stairwells: check connection mapping
-                connection = self.stair_mapper.get_connected_stair(
-                    transition_name, start_floor, end_floor
-                )
-                
-                if not connection:
+        for exit_point, arrive_point in transitions:
+            # Out-of-service or penalized stairs/elevators (closure overlay)
+            penalty = 0.0
+            if closures:
+                penalty = max(closures.transition_penalty(exit_point, start_floor, end_floor),
+                              closures.transition_penalty(arrive_point, start_floor, end_floor))
+                if penalty == float('inf'):
                     continue
-                
-                exit_point = connection['exit_stair']
-                arrive_point = connection['arrive_stair']
             
             try:
                 # Segment 1: Start room to exit point on start floor
-                path1, dist1 = start_pf.find_path(start_room, exit_point.upper())
+                path1, cumulative1, cost1 = start_pf.find_path_with_distances(start_room, exit_point.upper(),
+                                                                              closures=start_closures,
+                                                                              departure=departure, with_cost=True)
                 
                 # Segment 2: Arrival point to end room on end floor
-                path2, dist2 = end_pf.find_path(arrive_point.upper(), end_room)
+                path2, cumulative2, cost2 = end_pf.find_path_with_distances(arrive_point.upper(), end_room,
+                                                                            closures=end_closures,
+                                                                            departure=departure, with_cost=True)
                 
                 if path1 and path2:
-                    total_dist = dist1 + dist2
-                    if total_dist < best_distance:
-                        best_distance = total_dist
-                        best_path = (path1, path2)
+                    # Compare search costs (closure penalties, crowd weights); report walking distance
+                    if cost1 + cost2 + penalty < best_cost:
+                        best_cost = cost1 + cost2 + penalty
+                        best_distance = cumulative1[-1] + cumulative2[-1]
+                        best_path = (path1, cumulative1, path2, cumulative2)
                         best_transition = {
                             'exit_point': exit_point,
                             'arrive_point': arrive_point,
@@ -355,23 +326,25 @@ class MultiFloorPathfinder:
             raise ValueError(f"No {mode_text} path found from {start_floor}/{start_room} to {end_floor}/{end_room}")
         
         # Build the complete path data
-        path1, path2 = best_path
+        path1, cumulative1, path2, cumulative2 = best_path
+        dist1 = cumulative1[-1]
         segments = []
         all_waypoints = []
         waypoint_idx = 0
         
         # Segment 1: Start floor
         segment1_waypoints = []
-        for node_id in path1:
+        for node_id, distance_so_far in zip(path1, cumulative1):
             x, y, label = start_pf.nodes[node_id]
             waypoint = {
                 'floor': start_floor,
                 'index': waypoint_idx,
                 'node_id': node_id,
                 'dxf_coords': {'x': x, 'y': y},
-                'pixel_coords': {'x': x * 25.4, 'y': y * 25.4},
+                'pixel_coords': {'x': x * self.pixels_per_unit, 'y': y * self.pixels_per_unit},
                 'label': label,
-                'is_transition': label and label.upper() == best_transition['exit_point'].upper()
+                'is_transition': label and label.upper() == best_transition['exit_point'].upper(),
+                'distance_so_far': distance_so_far
             }
             segment1_waypoints.append(waypoint)
             all_waypoints.append(waypoint)
@@ -380,10 +353,7 @@ class MultiFloorPathfinder:
         segments.append({
             'floor': start_floor,
             'waypoints': segment1_waypoints,
-            'distance': sum(np.linalg.norm(
-                np.array([start_pf.nodes[path1[i]][:2]]) - 
-                np.array([start_pf.nodes[path1[i+1]][:2]])
-            ) for i in range(len(path1)-1)) if len(path1) > 1 else 0
+            'distance': dist1
         })
         
         # Add transition marker
@@ -394,22 +364,24 @@ class MultiFloorPathfinder:
             'from_floor': start_floor,
             'to_floor': end_floor,
             'exit_point': best_transition['exit_point'],
-            'arrive_point': best_transition['arrive_point']
+            'arrive_point': best_transition['arrive_point'],
+            'distance_so_far': dist1
         })
         waypoint_idx += 1
         
-        # Segment 2: End floor
+        # Segment 2: End floor (distances continue from the end of segment 1)
         segment2_waypoints = []
-        for node_id in path2:
+        for node_id, segment_distance in zip(path2, cumulative2):
             x, y, label = end_pf.nodes[node_id]
             waypoint = {
                 'floor': end_floor,
                 'index': waypoint_idx,
                 'node_id': node_id,
                 'dxf_coords': {'x': x, 'y': y},
-                'pixel_coords': {'x': x * 25.4, 'y': y * 25.4},
+                'pixel_coords': {'x': x * self.pixels_per_unit, 'y': y * self.pixels_per_unit},
                 'label': label,
-                'is_transition': label and label.upper() == best_transition['arrive_point'].upper()
+                'is_transition': label and label.upper() == best_transition['arrive_point'].upper(),
+                'distance_so_far': dist1 + segment_distance
             }
             segment2_waypoints.append(waypoint)
             all_waypoints.append(waypoint)
@@ -418,10 +390,7 @@ class MultiFloorPathfinder:
         segments.append({
             'floor': end_floor,
             'waypoints': segment2_waypoints,
-            'distance': sum(np.linalg.norm(
-                np.array([end_pf.nodes[path2[i]][:2]]) - 
-                np.array([end_pf.nodes[path2[i+1]][:2]])
-            ) for i in range(len(path2)-1)) if len(path2) > 1 else 0
+            'distance': cumulative2[-1]
         })
         
         return {
@@ -436,6 +405,118 @@ class MultiFloorPathfinder:
             'waypoints': all_waypoints  # All waypoints across all floors
         }
     
+    def _transitions(self, start_floor, end_floor, ada_compliance=False):
+        """(exit point, arrive point) of every elevator or stairwell joining two floors"""
+        transitions = []
+        if ada_compliance:
+            # Elevators: same name on every floor served, direct connection
+            for elevator in self.elevator_mapper.get_elevators():
+                if self.elevator_mapper.can_connect_floors(start_floor, end_floor, elevator):
+                    transitions.append((elevator, elevator))
+        else:
+            # Stairwells: check connection mapping
+            for stair in self._get_stairs_on_floor(start_floor):
+                connection = self.stair_mapper.get_connected_stair(stair, start_floor, end_floor)
+                if connection:
+                    transitions.append((connection['exit_stair'], connection['arrive_stair']))
+        return transitions
+    
+    def _transition_components(self, start_floor, end_floor, ada_compliance=False):
+        """
+        Transitions between two floors keyed by the component pair they join
+        
+        Returns (cached per floor pair and mode):
+            {(start floor component, end floor component): [transition index, ...]}
+        """
+        key = (start_floor, end_floor, ada_compliance)
+        if key not in self._component_links:
+            start_pf = self.pathfinders[start_floor]
+            end_pf = self.pathfinders[end_floor]
+            links = {}
+            for index, (exit_point, arrive_point) in enumerate(self._transitions(start_floor, end_floor,
+                                                                                  ada_compliance)):
+                for start_component in start_pf.room_components(exit_point.upper()):
+                    for end_component in end_pf.room_components(arrive_point.upper()):
+                        links.setdefault((start_component, end_component), []).append(index)
+            self._component_links[key] = links
+        return self._component_links[key]
+    
+    def _viable_transitions(self, start_floor, start_room, end_floor, end_room, ada_compliance=False):
+        """
+        Transitions that can join the two rooms, in the usual trial order
+        
+        A transition whose exit is not in a start-room component, or whose
+        arrival is not in an end-room component, could only fail its search.
+        """
+        links = self._transition_components(start_floor, end_floor, ada_compliance)
+        start_components = self.pathfinders[start_floor].room_components(start_room)
+        end_components = self.pathfinders[end_floor].room_components(end_room)
+        indices = set()
+        for start_component in start_components:
+            for end_component in end_components:
+                indices.update(links.get((start_component, end_component), ()))
+        transitions = self._transitions(start_floor, end_floor, ada_compliance)
+        return [transitions[index] for index in sorted(indices)]
+    
+    def connectivity_report(self, ignore=()):
+        """
+        Per-floor orphaned doors plus components linked across floors
+        
+        Floor components are joined through every stairwell and elevator
+        connection; those outside the largest cross-floor group cannot be
+        reached from the rest of the building by any route.
+        
+        Returns:
+            {'floors': {floor: IndoorPathfinder.connectivity_report()},
+             'groups': cross-floor groups holding rooms (1 when everything is connected),
+             'unreachable': [{'floor', 'component', 'size', 'rooms'}]}
+        """
+        parent = {}
+        
+        def find(item):
+            parent.setdefault(item, item)
+            while parent[item] != item:
+                parent[item] = parent[parent[item]]
+                item = parent[item]
+            return item
+        
+        for floor_name, pf in self.pathfinders.items():
+            for component in range(len(pf.component_sizes)):
+                find((floor_name, component))
+        for start_floor in self.pathfinders:
+            for end_floor in self.pathfinders:
+                if start_floor == end_floor:
+                    continue
+                for ada_compliance in (False, True):
+                    for start_component, end_component in self._transition_components(start_floor, end_floor,
+                                                                                       ada_compliance):
+                        parent[find((start_floor, start_component))] = find((end_floor, end_component))
+        
+        group_sizes = {}
+        rooms_by_component = {}
+        for floor_name, pf in self.pathfinders.items():
+            for component, size in enumerate(pf.component_sizes):
+                root = find((floor_name, component))
+                group_sizes[root] = group_sizes.get(root, 0) + size
+            for room, door_nodes in pf.room_to_nodes.items():
+                if room not in ignore:
+                    for node_id in door_nodes:
+                        rooms_by_component.setdefault((floor_name, pf.component[node_id]), set()).add(room)
+        main_group = max(group_sizes, key=group_sizes.get) if group_sizes else None
+        
+        unreachable = []
+        for (floor_name, component), rooms in sorted(rooms_by_component.items()):
+            if find((floor_name, component)) != main_group:
+                unreachable.append({'floor': floor_name, 'component': component,
+                                    'size': self.pathfinders[floor_name].component_sizes[component],
+                                    'rooms': sorted(rooms)})
+        
+        return {
+            'floors': {floor_name: pf.connectivity_report(ignore) for floor_name, pf in self.pathfinders.items()},
+            'groups': len({find(key) for key in rooms_by_component}),
+            'unreachable': unreachable,
+        }
+    
     def _get_stairs_on_floor(self, floor_name):
         """Get list of all stairwells on a given floor"""
         pf = self.pathfinders.get(floor_name)
@@ -453,7 +534,8 @@ class MultiFloorPathfinder:
         return stairs
 
 
-def find_multi_floor_path(start_floor, start_room, end_floor, end_room, ada_compliance=False):
+def find_multi_floor_path(start_floor, start_room, end_floor, end_room, ada_compliance=False, simplify=False,
+                          multi_floor=None, closures=None, departure=None):
     """
     Convenience function for multi-floor pathfinding
     
@@ -463,6 +545,10 @@ def find_multi_floor_path(start_floor, start_room, end_floor, end_room, ada_comp
         end_floor: Destination floor
         end_room: Destination room name
         ada_compliance: If True, use only elevators for floor changes (default: False)
+        simplify: If True, merge collinear waypoints and add turn-by-turn instructions
+        multi_floor: Loaded MultiFloorPathfinder to reuse (default: load all floors)
+        closures: ClosureOverlay to route around
+        departure: datetime of departure (crowd-aware weights for that time slot)
     
     Returns:
         Path data dictionary with segments for each floor
@@ -475,8 +561,9 @@ def find_multi_floor_path(start_floor, start_room, end_floor, end_room, ada_comp
     print(f"Mode: {'ELEVATOR ONLY (ADA)' if ada_compliance else 'STAIRS'}")
     print(f"{'='*70}\n")
     
-    mfp = MultiFloorPathfinder()
-    result = mfp.find_multi_floor_path(start_floor, start_room, end_floor, end_room, ada_compliance)
+    mfp = multi_floor or MultiFloorPathfinder()
+    result = mfp.find_multi_floor_path(start_floor, start_room, end_floor, end_room, ada_compliance, simplify,
+                                       closures=closures, departure=departure)
     
     if result:
         print(f"\n[OK] Multi-floor path found!")
@@ -486,7 +573,7 @@ def find_multi_floor_path(start_floor, start_room, end_floor, end_room, ada_comp
             trans = result['transition']
             trans_type = trans.get('type', 'stairs')
             print(f"  Transition ({trans_type}): {trans['exit_point']} -> {trans['arrive_point']}")
-        print(f"  Total waypoints: {len(result['waypoints'])}")
+        print(f"  Total waypoints: {len(result.get('waypoints', []))}")
     
     return result
 
@@ -5,17 +5,87 @@ Improved graph with line endpoints + intermediate points on lines
 
 import ezdxf
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.image import imread
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import heapq
+import math
+import threading
+import time
 import csv
 import os
 
+from route_renderer import RouteRenderer
+import crowd_weights
+
+
+class _SearchState:
+    """Per-thread scratch arrays reused across A* queries
+
+    Entries are only trusted when their stamp matches the current generation,
+    so nothing has to be cleared between searches.
+    """
+    
+    def __init__(self, node_count):
+        self.generation = 0
+        self.g_score = [0.0] * node_count
+        self.came_from = [-1] * node_count
+        self.came_weight = [0.0] * node_count
+        self.seen = [0] * node_count
+        self.closed = [0] * node_count
+
+
+class _LRUCache:
+    """Small thread-safe least-recently-used map for derived search arrays"""
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
 
 class IndoorPathfinder:
     """A* pathfinding with enhanced geometry"""
     
+    SEARCH_MODES = ('euclidean', 'alt')
+    
+    # Crowd slots whose edge costs (and contracted graph) are kept built at a time
+    CROWD_CACHE_SLOTS = 8
+    
+    # Closure indexes kept, keyed by (closure set, crowd slot)
+    CLOSURE_CACHE_ENTRIES = 8
+    
+    # Graph build pipeline, in order (timed per stage into self.load_timings)
+    LOAD_STAGES = (
+        '_load_dxf_lines',
+        '_build_corridor_network_enhanced',
+        '_add_door_points',
+        '_build_graph_with_intermediate_nodes',
+        '_connect_doors_to_corridors',
+        '_build_search_index',
+        '_label_components',
+        '_contract_chains',
+    )
+    
     def __init__(self, dxf_path, image_path, labels_csv):
         self.dxf_path = dxf_path
         self.image_path = image_path
@@ -26,15 +96,40 @@ class IndoorPathfinder:
         self.room_to_nodes = defaultdict(list)
         self.origin_point = None
         self.all_lines = []
+        
+        # Flattened search index (built by _build_search_index)
+        self._xs = []
+        self._ys = []
+        self._neighbors = []
+        self._weights = []
+        self._scratch = threading.local()
+        self._closure_cache = _LRUCache(self.CLOSURE_CACHE_ENTRIES)
+        
+        # Search graph with degree-2 corridor chains contracted (built by _contract_chains)
+        self._core = None
+        self.contraction_stats = {}
+        
+        # Crowd multipliers per time slot (loaded by load_crowd_weights); edge costs are
+        # built per slot on first use and kept for the most recent CROWD_CACHE_SLOTS slots
+        self.crowd_slots = {}
+        self.crowd_multipliers = None
+        self._crowd_offsets = []
+        self._crowd_cache = _LRUCache(self.CROWD_CACHE_SLOTS)
+        
+        # ALT landmarks (built by precompute_landmarks)
+        self.search_mode = 'euclidean'
+        self.landmarks = []
+        self._landmark_dist = []
+        self.search_stats = {mode: {'searches': 0, 'expanded': 0} for mode in self.SEARCH_MODES}
+        self.load_timings = {}
     
     def load_data(self):
         """Load and process DXF data"""
         print("Loading navigation data...")
-        self._load_dxf_lines()
-        self._build_corridor_network_enhanced()
-        self._add_door_points()
-        self._build_graph_with_intermediate_nodes()
-        self._connect_doors_to_corridors()
+        for stage in self.LOAD_STAGES:
+            started = time.perf_counter()
+            getattr(self, stage)()
+            self.load_timings[stage] = time.perf_counter() - started
         
         labeled_rooms = len(self.room_to_nodes)
         total_nodes = len(self.nodes)
@@ -235,8 +330,295 @@ class IndoorPathfinder:
         
         print(f"  * {connections_added} door-to-corridor connections")
     
-    def find_path(self, start_room, end_room):
-        """Find path with A*"""
+    def _build_search_index(self):
+        """Flatten nodes and graph into index arrays used by the A* kernel"""
+        node_count = max(self.nodes) + 1 if self.nodes else 0
+        
+        self._xs = [0.0] * node_count
+        self._ys = [0.0] * node_count
+        for node_id, (x, y, _) in self.nodes.items():
+            self._xs[node_id] = float(x)
+            self._ys[node_id] = float(y)
+        
+        # Neighbor order matches self.graph so ties break exactly as before
+        self._neighbors = [()] * node_count
+        self._weights = [()] * node_count
+        for node_id, neighbors in self.graph.items():
+            self._neighbors[node_id] = tuple(neighbor for neighbor, _ in neighbors)
+            self._weights[node_id] = tuple(float(weight) for _, weight in neighbors)
+        
+        self._scratch = threading.local()
+    
+    def _label_components(self):
+        """
+        Connected-component id of every node (-1 for unused ids)
+        
+        Two doors in different components have no path between them, so
+        find_path_with_distances skips such pairs instead of letting A* exhaust
+        the start's whole component first.
+        """
+        component = [-1] * len(self._xs)
+        sizes = []
+        all_neighbors = self._neighbors
+        for node_id in self.nodes:
+            if component[node_id] != -1:
+                continue
+            component_id = len(sizes)
+            component[node_id] = component_id
+            stack = [node_id]
+            size = 0
+            while stack:
+                current = stack.pop()
+                size += 1
+                for neighbor in all_neighbors[current]:
+                    if component[neighbor] == -1:
+                        component[neighbor] = component_id
+                        stack.append(neighbor)
+            sizes.append(size)
+        
+        self.component = component
+        self.component_sizes = sizes
+        print(f"  * {len(sizes)} connected components (largest {max(sizes, default=0)} nodes)")
+    
+    def room_components(self, room):
+        """Component ids of a room's doors (empty if the room is unknown)"""
+        return {self.component[node_id] for node_id in self.room_to_nodes.get(room, ())}
+    
+    def can_reach(self, start_room, end_room):
+        """Whether any door of start_room shares a component with a door of end_room"""
+        return not self.room_components(start_room).isdisjoint(self.room_components(end_room))
+    
+    def connectivity_report(self, ignore=()):
+        """
+        Doors and rooms cut off from the main (largest) component
+        
+        Args:
+            ignore: Room names to leave out (calibration labels)
+        
+        Returns:
+            {'components', 'component_sizes', 'main_component', 'orphaned_doors',
+             'orphaned_rooms', 'partially_connected_rooms'}
+        """
+        sizes = self.component_sizes
+        main = max(range(len(sizes)), key=lambda c: sizes[c]) if sizes else -1
+        orphaned_doors = []
+        orphaned_rooms = []
+        partial_rooms = []
+        for room, door_nodes in sorted(self.room_to_nodes.items()):
+            if room in ignore:
+                continue
+            cut_off = [node_id for node_id in door_nodes if self.component[node_id] != main]
+            for node_id in cut_off:
+                x, y, label = self.nodes[node_id]
+                orphaned_doors.append({
+                    'room': room, 'label': label, 'node_id': node_id, 'x': float(x), 'y': float(y),
+                    'component': self.component[node_id], 'degree': len(self._neighbors[node_id])
+                })
+            if cut_off:
+                (orphaned_rooms if len(cut_off) == len(door_nodes) else partial_rooms).append(room)
+        return {
+            'components': len(sizes),
+            'component_sizes': sorted(sizes, reverse=True),
+            'main_component': main,
+            'orphaned_doors': orphaned_doors,
+            'orphaned_rooms': orphaned_rooms,
+            'partially_connected_rooms': partial_rooms,
+        }
+    
+    def _contract_chains(self):
+        """Build the contracted search graph and record its size against the full graph"""
+        self._core = self._contract(self._neighbors, self._weights)
+        core_neighbors = self._core[0]
+        nodes = sum(1 for neighbors in self._neighbors if neighbors)
+        core_nodes = sum(1 for neighbors in core_neighbors if neighbors)
+        self.contraction_stats = {
+            'nodes': nodes,
+            'edges': sum(len(neighbors) for neighbors in self._neighbors) // 2,
+            'search_nodes': core_nodes,
+            'search_edges': sum(len(neighbors) for neighbors in core_neighbors) // 2,
+        }
+        print(f"  * {nodes - core_nodes} pass-through nodes contracted "
+              f"({nodes} -> {core_nodes} searchable nodes)")
+    
+    def _contract(self, neighbors, weights):
+        """
+        Collapse chains of degree-2 pathway nodes into single weighted edges
+        
+        A pathway node (no label) with exactly two distinct neighbors can only
+        be passed through, so A* need not expand it: each chain between two
+        other nodes becomes one edge whose weight is the chain's sum, and the
+        chain's interior node ids are kept to put back into found paths
+        (_expand_path). Node ids are unchanged; contracted nodes have no edges.
+        Of parallel edges between the same two nodes the cheapest is kept.
+        Path lengths match the full graph; among equal-length paths A* may
+        settle on a different (but still deterministic) one.
+        
+        Args:
+            neighbors, weights: Per-node adjacency in _neighbors layout (symmetric)
+        
+        Returns:
+            (neighbors, weights, via) where via maps (from, to) to the interior node ids
+        """
+        nodes = self.nodes
+        
+        def passable(node_id):
+            node_neighbors = neighbors[node_id]
+            return (len(node_neighbors) == 2 and node_neighbors[0] != node_neighbors[1]
+                    and node_id in nodes and nodes[node_id][2] is None)
+        
+        core_neighbors = [()] * len(neighbors)
+        core_weights = [()] * len(neighbors)
+        via = {}
+        for node_id, node_neighbors in enumerate(neighbors):
+            if not node_neighbors or passable(node_id):
+                continue
+            targets = []
+            target_weights = []
+            target_index = {}
+            for first, weight in zip(node_neighbors, weights[node_id]):
+                interior = []
+                previous = node_id
+                current = first
+                total = weight
+                while current != node_id and passable(current):
+                    interior.append(current)
+                    a, b = neighbors[current]
+                    following = b if a == previous else a
+                    total += weights[current][1 if following == b else 0]
+                    previous, current = current, following
+                if current == node_id:
+                    continue
+                if current in target_index:
+                    i = target_index[current]
+                    if total >= target_weights[i]:
+                        continue
+                    target_weights[i] = total
+                    via.pop((node_id, current), None)
+                else:
+                    target_index[current] = len(targets)
+                    targets.append(current)
+                    target_weights.append(total)
+                if interior:
+                    via[(node_id, current)] = tuple(interior)
+            core_neighbors[node_id] = tuple(targets)
+            core_weights[node_id] = tuple(target_weights)
+        return core_neighbors, core_weights, via
+    
+    def _crowd_graph(self, slot):
+        """
+        (edge costs, contracted graph) for a crowd slot, or None when it has no crowd weights
+        
+        Built from the slot's row of the multiplier matrix on first use; only
+        the most recently used CROWD_CACHE_SLOTS slots are kept.
+        """
+        row = self.crowd_slots.get(slot)
+        if row is None:
+            return None
+        crowd = self._crowd_cache.get(slot)
+        if crowd is None:
+            multipliers = self.crowd_multipliers[row].tolist()
+            offsets = self._crowd_offsets
+            costs = [
+                tuple(w * m for w, m in zip(weights, multipliers[offsets[i]:offsets[i + 1]]))
+                for i, weights in enumerate(self._weights)
+            ]
+            crowd = (costs, self._contract(self._neighbors, costs))
+            self._crowd_cache.put(slot, crowd)
+        return crowd
+    
+    def _core_graph(self, slot=None):
+        """Contracted search graph for a crowd slot (the plain one without crowd costs)"""
+        crowd = self._crowd_graph(slot)
+        return crowd[1] if crowd else self._core
+    
+    @staticmethod
+    def _expand_path(path, via):
+        """Put the contracted chain nodes back into a path found on the search graph"""
+        if not via or len(path) < 2:
+            return path
+        expanded = [path[0]]
+        for previous, node_id in zip(path, path[1:]):
+            expanded.extend(via.get((previous, node_id), ()))
+            expanded.append(node_id)
+        return expanded
+    
+    def _search_state(self):
+        """Get this thread's scratch arrays, allocating them on first use"""
+        state = getattr(self._scratch, 'state', None)
+        if state is None or len(state.g_score) != len(self._xs):
+            state = _SearchState(len(self._xs))
+            self._scratch.state = state
+        return state
+
+    # Graph build intermediates, not needed once load_data has finished
+    _BUILD_ONLY = ('all_lines', 'endpoint_to_node')
+
+    def __getstate__(self):
+        """
+        Compact picklable form of a loaded pathfinder (for process pool loading)
+
+        Drops the DXF line list, endpoint map, per-thread scratch and crowd weights
+        (reloaded from output/crowd by whoever installs the graph), stores node
+        coordinates as plain floats and leaves the adjacency lists out: they are
+        rebuilt from the flattened search index, which keeps the same order.
+        """
+        state = {k: v for k, v in self.__dict__.items()
+                 if k not in self._BUILD_ONLY and k not in ('_scratch', '_closure_cache', 'graph', '_core',
+                                                           'crowd_slots', 'crowd_multipliers', '_crowd_offsets',
+                                                           '_crowd_cache')}
+        state['nodes'] = {node_id: (float(x), float(y), label) for node_id, (x, y, label) in self.nodes.items()}
+        state['room_to_nodes'] = dict(self.room_to_nodes)
+        state['_graph_keys'] = list(self.graph)
+        return state
+
+    def __setstate__(self, state):
+        graph_keys = state.pop('_graph_keys')
+        self.__dict__.update(state)
+        self.room_to_nodes = defaultdict(list, self.room_to_nodes)
+        self.graph = defaultdict(list)
+        for node_id in graph_keys:
+            self.graph[node_id] = list(zip(self._neighbors[node_id], self._weights[node_id]))
+        self.all_lines = []
+        self._scratch = threading.local()
+        self._closure_cache = _LRUCache(self.CLOSURE_CACHE_ENTRIES)
+        self.crowd_slots = {}
+        self.crowd_multipliers = None
+        self._crowd_offsets = []
+        self._crowd_cache = _LRUCache(self.CROWD_CACHE_SLOTS)
+        self._core = self._contract(self._neighbors, self._weights)
+    
+    def find_path(self, start_room, end_room, search_mode=None, departure=None):
+        """Find path with A* ('euclidean' or 'alt' heuristic, default self.search_mode)"""
+        best_path, cumulative = self.find_path_with_distances(start_room, end_room, search_mode,
+                                                              departure=departure)
+        best_distance = cumulative[-1] if best_path else float('inf')
+        return best_path, best_distance
+    
+    def find_path_with_distances(self, start_room, end_room, search_mode=None, closures=None, departure=None,
+                                 with_cost=False):
+        """
+        Find path with A* and return per-waypoint cumulative distances
+        
+        Args:
+            closures: FloorClosures to route around (closed nodes/edges/rooms are
+                      skipped, penalties add to the search cost but not to the
+                      reported distances)
+            departure: datetime of departure; corridors crowded by class changes
+                       in that time slot cost more to search (see load_crowd_weights)
+            with_cost: Also return the search cost of the path
+        
+        Returns:
+            (path, cumulative) where cumulative[i] is the distance from the
+            start to path[i], summed from the stored edge weights; with
+            with_cost, (path, cumulative, cost) where cost is the path's cost on
+            the penalized/crowd-weighted graph (inf when there is no path)
+        """
+        search_mode = search_mode or self.search_mode
+        if search_mode not in self.SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{search_mode}'. Available: {list(self.SEARCH_MODES)}")
+        if search_mode == 'alt' and not self.landmarks:
+            self.precompute_landmarks()
+        
         start_nodes = self.room_to_nodes.get(start_room, [])
         end_nodes = self.room_to_nodes.get(end_room, [])
         
@@ -245,25 +627,138 @@ class IndoorPathfinder:
         if not end_nodes:
             raise ValueError(f"Room '{end_room}' not found")
         
+        slot = crowd_weights.slot_key(departure) if departure is not None else None
+        if closures is not None:
+            _, _, closed, (neighbors, costs, via) = self._closure_index(closures, slot)
+            for room, nodes in ((start_room, start_nodes), (end_room, end_nodes)):
+                if all(node in closed for node in nodes):
+                    raise ValueError(f"Room '{room}' is closed")
+        else:
+            neighbors, costs, via = self._core_graph(slot)
+        
         print(f"\nFinding path: {start_room} -> {end_room}")
         
         best_path = None
-        best_distance = float('inf')
+        best_cumulative = []
+        best_cost = float('inf')
+        component = self.component
         
         for start_node in start_nodes:
             for end_node in end_nodes:
-                path, dist = self._astar(start_node, end_node)
-                if path and dist < best_distance:
+                if component[start_node] != component[end_node]:
+                    continue
+                path, cumulative = self._search(start_node, end_node, search_mode, neighbors, costs)
+                if path and cumulative[-1] < best_cost:
                     best_path = path
-                    best_distance = dist
+                    best_cost = cumulative[-1]
+        
+        if best_path:
+            # Searched on the contracted (maybe penalized/crowded) graph; report the full
+            # waypoint list with walking distances
+            best_path = self._expand_path(best_path, via)
+            best_cumulative = self._path_distances(best_path)
+            best_distance = best_cumulative[-1]
         
         if best_path:
-            labeled = sum(1 for nid in best_path if self.nodes[nid][2] and self.nodes[nid][2] != 'ori')
             print(f"[OK] Path: {len(best_path)} waypoints, {best_distance:.2f} units")
+        elif not self.can_reach(start_room, end_room):
+            print("[X] No path (rooms are in disconnected parts of the graph)")
         else:
             print("[X] No path")
         
-        return best_path, best_distance
+        if with_cost:
+            return best_path, best_cumulative, best_cost
+        return best_path, best_cumulative
+    
+    def _closure_index(self, closures, slot=None):
+        """
+        Search arrays with closures applied: (neighbors, costs, closed node ids, contracted graph)
+        
+        Closed nodes lose every edge, closed edges are dropped and penalties are
+        added to the cost of the edge (or of entering the node). Heuristics stay
+        admissible because costs only ever go up. Starts from the crowd costs of
+        slot when it has any. The last CLOSURE_CACHE_ENTRIES (closure set, slot)
+        pairs are cached, so requests for different departure slots do not keep
+        rebuilding each other's index.
+        """
+        key = (closures.key, slot)
+        cached = self._closure_cache.get(key)
+        if cached is not None:
+            return cached
+        crowd = self._crowd_graph(slot)
+        base_costs = crowd[0] if crowd else self._weights
+        
+        closed = set(closures.closed_nodes)
+        node_penalty = dict(closures.node_penalty)
+        for room in closures.closed_rooms:
+            closed.update(self.room_to_nodes.get(room, ()))
+        for room, penalty in closures.room_penalty.items():
+            for node_id in self.room_to_nodes.get(room, ()):
+                node_penalty[node_id] = node_penalty.get(node_id, 0.0) + penalty
+        closed_edges = closures.closed_edges
+        edge_penalty = closures.edge_penalty
+        
+        neighbors = list(self._neighbors)
+        costs = list(base_costs)
+        for node_id, node_neighbors in enumerate(self._neighbors):
+            if node_id in closed:
+                neighbors[node_id] = ()
+                costs[node_id] = ()
+                continue
+            kept = []
+            kept_costs = []
+            changed = False
+            for neighbor, weight in zip(node_neighbors, base_costs[node_id]):
+                edge = frozenset((node_id, neighbor))
+                if neighbor in closed or edge in closed_edges:
+                    changed = True
+                    continue
+                extra = edge_penalty.get(edge, 0.0) + node_penalty.get(neighbor, 0.0)
+                changed = changed or extra > 0
+                kept.append(neighbor)
+                kept_costs.append(weight + extra)
+            if changed:
+                neighbors[node_id] = tuple(kept)
+                costs[node_id] = tuple(kept_costs)
+        
+        index = (neighbors, costs, closed, self._contract(neighbors, costs))
+        self._closure_cache.put(key, index)
+        return index
+    
+    def load_crowd_weights(self, slots, multipliers):
+        """
+        Install precomputed crowd multipliers (see crowd_weights.py)
+        
+        The matrix is kept as stored (float32); a query with a departure time
+        builds its slot's edge costs from one row on first use (_crowd_graph).
+        Multipliers are >= 1, which keeps both heuristics admissible.
+        
+        Args:
+            slots: (weekday, slot) keys, one per row of multipliers
+            multipliers: [slots x directed edges] matrix in _neighbors order
+        """
+        offsets = [0]
+        for weights in self._weights:
+            offsets.append(offsets[-1] + len(weights))
+        if multipliers.shape[1:] != (offsets[-1],):
+            raise ValueError(f"Crowd weights cover {multipliers.shape[1:]} edges, graph has {offsets[-1]}")
+        
+        self.crowd_multipliers = np.asarray(multipliers)
+        self.crowd_slots = {tuple(slot): row for row, slot in enumerate(slots)}
+        self._crowd_offsets = offsets
+        self._crowd_cache.clear()
+        self._closure_cache.clear()
+        return len(self.crowd_slots)
+    
+    def _path_distances(self, path):
+        """Cumulative walking distances along a path, from the unpenalized edge weights"""
+        cumulative = [0.0] * len(path)
+        total = 0.0
+        for i in range(1, len(path)):
+            previous = path[i - 1]
+            total += self._weights[previous][self._neighbors[previous].index(path[i])]
+            cumulative[i] = total
+        return cumulative
     
     def _heuristic(self, node_id, goal_id):
         """A* heuristic"""
@@ -271,47 +766,199 @@ class IndoorPathfinder:
         x2, y2, _ = self.nodes[goal_id]
         return np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
     
-    def _astar(self, start, goal):
-        """A* algorithm"""
+    def precompute_landmarks(self, num_landmarks=4):
+        """
+        Pick landmark nodes and store exact distances from each to every node
+        
+        Landmarks are chosen by farthest-point selection so they sit at the
+        ends of the wings, which is where the triangle-inequality bound
+        |d(L, goal) - d(L, node)| beats straight-line distance the most.
+        """
+        candidates = [node_id for node_id, neighbors in enumerate(self._neighbors) if neighbors]
+        self.landmarks = []
+        self._landmark_dist = []
+        if not candidates:
+            return self.landmarks
+        
+        # Seed from the node farthest away from an arbitrary start
+        seed_dist = self._shortest_distances(candidates[0])
+        min_dist = [float('inf')] * len(self._xs)
+        next_landmark = max(candidates, key=lambda n: seed_dist[n] if seed_dist[n] < float('inf') else -1)
+        
+        while len(self.landmarks) < min(num_landmarks, len(candidates)):
+            dist = self._shortest_distances(next_landmark)
+            self.landmarks.append(next_landmark)
+            self._landmark_dist.append(dist)
+            
+            for node_id in candidates:
+                if dist[node_id] < min_dist[node_id]:
+                    min_dist[node_id] = dist[node_id]
+            
+            # Unreached nodes (other components) are skipped, not chosen
+            remaining = [n for n in candidates if n not in self.landmarks and min_dist[n] < float('inf')]
+            if not remaining:
+                break
+            next_landmark = max(remaining, key=lambda n: min_dist[n])
+        
+        print(f"  * {len(self.landmarks)} ALT landmarks precomputed")
+        return self.landmarks
+    
+    def _shortest_distances(self, source):
+        """Dijkstra from source to every node (inf where unreachable)"""
+        dist = [float('inf')] * len(self._xs)
+        dist[source] = 0.0
+        open_set = [(0.0, source)]
+        all_neighbors = self._neighbors
+        all_weights = self._weights
+        
+        while open_set:
+            current_dist, current = heapq.heappop(open_set)
+            if current_dist > dist[current]:
+                continue
+            for neighbor, edge_weight in zip(all_neighbors[current], all_weights[current]):
+                new_dist = current_dist + edge_weight
+                if new_dist < dist[neighbor]:
+                    dist[neighbor] = new_dist
+                    heapq.heappush(open_set, (new_dist, neighbor))
+        
+        return dist
+    
+    def get_search_stats(self):
+        """Searches and expanded-node counts per heuristic, with per-search averages"""
+        stats = {}
+        for mode, counts in self.search_stats.items():
+            searches = counts['searches']
+            stats[mode] = {
+                'searches': searches,
+                'expanded': counts['expanded'],
+                'avg_expanded': counts['expanded'] / searches if searches else 0.0
+            }
+        return stats
+    
+    def _astar(self, start, goal, search_mode='euclidean'):
+        """A* algorithm - returns (path, distance)"""
+        path, cumulative = self._search(start, goal, search_mode)
+        return path, (cumulative[-1] if path else float('inf'))
+    
+    def _search(self, start, goal, search_mode='euclidean', neighbors=None, weights=None):
+        """
+        A* kernel over integer node indices - returns (path, cumulative distances)
+        
+        neighbors/weights replace the flattened search index (e.g. with closures
+        applied); cumulative values are then sums of those weights.
+        """
+        state = self._search_state()
+        state.generation += 1
+        generation = state.generation
+        
+        g_score = state.g_score
+        came_from = state.came_from
+        came_weight = state.came_weight
+        seen = state.seen
+        closed = state.closed
+        
+        xs = self._xs
+        ys = self._ys
+        all_neighbors = self._neighbors if neighbors is None else neighbors
+        all_weights = self._weights if weights is None else weights
+        goal_x = xs[goal]
+        goal_y = ys[goal]
+        sqrt = math.sqrt
+        inf = math.inf
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        # ALT: (distances from landmark, distance landmark -> goal) pairs
+        landmark_bounds = None
+        if search_mode == 'alt':
+            landmark_bounds = [
+                (dist, dist[goal]) for dist in self._landmark_dist
+                if dist[goal] < inf
+            ]
+        
+        stats = self.search_stats[search_mode]
+        stats['searches'] += 1
+        expanded = 0
+        
         counter = 0
         open_set = [(0, counter, start)]
         counter += 1
         
-        g_score = {start: 0}
-        f_score = {start: self._heuristic(start, goal)}
-        came_from = {start: None}
-        visited = set()
+        g_score[start] = 0.0
+        came_from[start] = -1
+        seen[start] = generation
         
         while open_set:
-            current_f, _, current = heapq.heappop(open_set)
+            _, _, current = heappop(open_set)
             
-            if current in visited:
+            if closed[current] == generation:
                 continue
-            visited.add(current)
+            closed[current] = generation
+            expanded += 1
             
             if current == goal:
+                stats['expanded'] += expanded
                 path = []
+                steps = []
                 node = goal
-                while node is not None:
+                while node != -1:
                     path.append(node)
+                    steps.append(came_weight[node])
                     node = came_from[node]
-                return path[::-1], g_score[goal]
+                path.reverse()
+                steps.reverse()
+                
+                # Re-add the edge weights in path order (same sums as g_score)
+                cumulative = [0.0] * len(path)
+                total = 0.0
+                for i in range(1, len(path)):
+                    total += steps[i]
+                    cumulative[i] = total
+                return path, cumulative
             
-            for neighbor, edge_weight in self.graph[current]:
-                if neighbor in visited:
+            current_g = g_score[current]
+            for neighbor, edge_weight in zip(all_neighbors[current], all_weights[current]):
+                if closed[neighbor] == generation:
                     continue
                 
-                tentative_g = g_score[current] + edge_weight
+                tentative_g = current_g + edge_weight
                 
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                if seen[neighbor] != generation or tentative_g < g_score[neighbor]:
+                    seen[neighbor] = generation
                     came_from[neighbor] = current
+                    came_weight[neighbor] = edge_weight
                     g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + self._heuristic(neighbor, goal)
                     
-                    heapq.heappush(open_set, (f_score[neighbor], counter, neighbor))
+                    dx = goal_x - xs[neighbor]
+                    dy = goal_y - ys[neighbor]
+                    h = sqrt(dx * dx + dy * dy)
+                    if landmark_bounds:
+                        # max of admissible bounds is still admissible
+                        for dist, goal_dist in landmark_bounds:
+                            node_dist = dist[neighbor]
+                            if node_dist < inf:
+                                bound = goal_dist - node_dist
+                                if bound < 0:
+                                    bound = -bound
+                                if bound > h:
+                                    h = bound
+                    heappush(open_set, (tentative_g + h, counter, neighbor))
                     counter += 1
         
-        return [], float('inf')
+        stats['expanded'] += expanded
+        return [], []
+    
+    def nearest_room_label(self, x, y, max_distance=6.0):
+        """Closest room to a DXF point (for naming turns), None if nothing within max_distance"""
+        best_room = None
+        best_dist = max_distance
+        for room, door_nodes in self.room_to_nodes.items():
+            for node_id in door_nodes:
+                dist = math.hypot(self._xs[node_id] - x, self._ys[node_id] - y)
+                if dist <= best_dist:
+                    best_room = room
+                    best_dist = dist
+        return best_room
     
     def _load_calibration_points(self):
         """Load calibration reference points from CSV"""
@@ -337,65 +984,20 @@ class IndoorPathfinder:
         return origin_x, origin_y, ref_x, ref_y
     
     def visualize_path(self, path, start_room, end_room, output_file='navigation_path.png'):
-        """Generate clean floor plan image without path overlay (for frontend rendering)"""
-        print(f"Generating floor plan image...")
-        
-        img = imread(self.image_path)
-        img = np.fliplr(img)
-        img_height, img_width = img.shape[0], img.shape[1]
-        
-        # Load calibration points from CSV
-        origin_x, origin_y, ref_x, ref_y = self._load_calibration_points()
-        
-        # Calculate scale from reference points
-        dxf_width = ref_x - origin_x
-        dxf_height = ref_y - origin_y
+        """Render the route over the floor plan (PNG/WebP/JPEG by extension) and export path JSON"""
+        print(f"Generating route image...")
         
-        scale_x = img_width / dxf_width
-        scale_y = img_height / dxf_height
+        renderer = RouteRenderer(self)
+        renderer.render_to_file(path, output_file)
         
-        print(f"[Calibration] DXF bounds: ({origin_x}, {origin_y}) to ({ref_x}, {ref_y})")
-        print(f"[Calibration] Image size: {img_width}x{img_height}")
+        # Path JSON keeps full-resolution image calibration
+        origin_x, origin_y = renderer.origin_x, renderer.origin_y
+        scale_x = renderer.px_per_unit_x / renderer.scale
+        scale_y = renderer.px_per_unit_y / renderer.scale
         print(f"[Calibration] Scale: {scale_x:.4f} px/unit (X), {scale_y:.4f} px/unit (Y)")
         
-        def to_pixel(x, y):
-            # Map from DXF coords to image pixels
-            px = (x - origin_x) * scale_x
-            py = (y - origin_y) * scale_y
-            return px, py
-        
-        fig, ax = plt.subplots(figsize=(18, 14))
-        ax.imshow(img, extent=[0, img_width, 0, img_height], origin='lower')
-        
-        # Draw all connections in light gray (for reference)
-        for node_id, neighbors in self.graph.items():
-            x1, y1, label1 = self.nodes[node_id]
-            px1, py1 = to_pixel(x1, y1)
-            for neighbor_id, _ in neighbors:
-                if neighbor_id > node_id:
-                    x2, y2, label2 = self.nodes[neighbor_id]
-                    px2, py2 = to_pixel(x2, y2)
-                    
-                    is_door = (label1 and label1 != 'ori') or (label2 and label2 != 'ori')
-                    ax.plot([px1, px2], [py1, py2], 'gray', alpha=0.1, linewidth=0.5, linestyle='--' if is_door else '-')
-        
-        # Draw door nodes
-        for node_id, (x, y, label) in self.nodes.items():
-            if label and label != 'ori':
-                px, py = to_pixel(x, y)
-                ax.plot(px, py, 'o', color='lightblue', markersize=5, alpha=0.5)
-        
-        # Export path data to JSON separately
         self._export_path_to_json(path, start_room, end_room, origin_x, origin_y, scale_x, scale_y)
-        
-        ax.set_xlim(0, img_width)
-        ax.set_ylim(0, img_height)
-        ax.axis('off')
-        
-        plt.tight_layout()
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
         print(f"[OK] Saved: {output_file}")
-        plt.close()
     
     def _export_path_to_json(self, path, start_room, end_room, origin_x, origin_y, scale_x, scale_y):
         """Export path data to JSON for frontend rendering"""
@@ -2,35 +2,55 @@
 Indoor Navigation Pathfinding - Main Entry Point
 Unified interface for finding optimal routes between classrooms
 Usage: python pathfinding.py <floor> [start_room] [end_room]
+       python pathfinding.py batch <floor> (--to ROOM | --pairs FILE | --all) [--workers N]
+       python pathfinding.py components [floor ...] [--json FILE]
 """
 
 from pathfinder import IndoorPathfinder
+from route_renderer import RouteRenderer
+from route_instructions import simplify_route, DEFAULT_TOLERANCE
+from crowd_weights import apply_crowd_weights
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import csv
+import json
 import os
 import sys
+import time
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Floors, their input files and vertical connections (FLOOR_MANIFEST overrides the path)
+FLOOR_MANIFEST = os.environ.get('FLOOR_MANIFEST', os.path.join(BASE_DIR, 'data', 'floors.json'))
+
+
+def load_floor_manifest(path=FLOOR_MANIFEST):
+    """
+    Read the floor manifest
+
+    Returns:
+        {'building', 'name', 'calibration', 'floors': {name: config}, 'elevators', 'stairs'}
+        with floors in manifest order (bottom to top)
+    """
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    for name, config in manifest.get('floors', {}).items():
+        config.setdefault('dxf', None)
+        config.setdefault('image', None)
+        config.setdefault('labels', None)
+        config.setdefault('output_prefix', name)
+        config.setdefault('preload', False)
+    manifest.setdefault('calibration', {})
+    manifest.setdefault('elevators', {})
+    manifest.setdefault('stairs', {})
+    return manifest
 
 
 class FloorNavigationConfig:
-    """Configuration for all available floors"""
-    FLOORS = {
-        'basement': {
-            'dxf': 'basement-path-defined.DXF',
-            'image': 'scott-lab-basement.jpg',
-            'labels': 'basement_labels.csv',
-            'output_prefix': 'basement'
-        },
-        'floor_1': {
-            'dxf': 'floor_1.DXF',
-            'image': 'scott-lab-1st-floor.jpg',
-            'labels': 'floor_1_labels.csv',
-            'output_prefix': 'floor_1'
-        },
-        'floor_2': {
-            'dxf': 'floor_2.DXF',
-            'image': 'scott-lab-2nd-floor.jpg',
-            'labels': 'floor_2_labels.csv',
-            'output_prefix': 'floor_2'
-        },
-    }
+    """Configuration for all available floors (from data/floors.json)"""
+    MANIFEST = load_floor_manifest()
+    FLOORS = MANIFEST['floors']
     
     @classmethod
     def get_floor_config(cls, floor_name):
@@ -42,11 +62,44 @@ class FloorNavigationConfig:
     
     @classmethod
     def get_available_floors(cls):
-        """Get list of available floors"""
+        """Get list of floors with navigation data (DXF and labels)"""
         return [f for f, cfg in cls.FLOORS.items() if cfg['dxf'] is not None and cfg['labels'] is not None]
+    
+    @classmethod
+    def get_preload_floors(cls):
+        """Navigable floors built at startup; the rest are built on first request"""
+        return [f for f in cls.get_available_floors() if cls.FLOORS[f]['preload']]
+    
+    @classmethod
+    def pixels_per_unit(cls):
+        """Floor plan image pixels per DXF unit"""
+        return cls.MANIFEST['calibration'].get('pixels_per_unit', 25.4)
+
 
+def get_floor_files(floor_name):
+    """Absolute (dxf, image, labels) paths for a configured floor"""
+    config = FloorNavigationConfig.get_floor_config(floor_name)
+    if config['dxf'] is None or config['labels'] is None:
+        raise ValueError(f"Floor '{floor_name}' has no navigation data yet (plan image only)")
+    return floor_files(config, os.path.join(BASE_DIR, 'data'))
+
+
+def floor_files(config, data_dir):
+    """
+    (dxf, image, labels) paths for a manifest floor entry: plans under floor-plans/, labels beside the manifest
 
-def run_pathfinding(floor_name, start_room=None, end_room=None, export_json=True, generate_image=False):
+    Entries may use '..' to share another building's files (resolved even without a floor-plans/ directory).
+    """
+    return (
+        os.path.normpath(os.path.join(data_dir, 'floor-plans', config['dxf'])),
+        os.path.normpath(os.path.join(data_dir, 'floor-plans', config['image'])),
+        os.path.normpath(os.path.join(data_dir, config['labels']))
+    )
+
+
+def run_pathfinding(floor_name, start_room=None, end_room=None, export_json=True, generate_image=False,
+                    search_mode='euclidean', simplify=False, tolerance=DEFAULT_TOLERANCE, pathfinder=None,
+                    closures=None, departure=None):
     """
     Run pathfinding for a specific floor
     
@@ -55,6 +108,12 @@ def run_pathfinding(floor_name, start_room=None, end_room=None, export_json=True
         start_room (str): Starting room name
         end_room (str): Destination room name
         export_json (bool): Export navigation data to JSON
+        search_mode (str): A* heuristic - 'euclidean' or 'alt' (landmarks)
+        simplify (bool): Merge collinear waypoints and add turn-by-turn instructions
+        tolerance (float): Collinearity tolerance in DXF units (with simplify)
+        pathfinder (IndoorPathfinder): Loaded graph for this floor to reuse (skips the build)
+        closures (FloorClosures): Closed/penalized nodes, edges and rooms on this floor
+        departure (datetime): Departure time, to route around class-change crowds
     """
     print("\n" + "="*70)
     print(f"INDOOR NAVIGATION - {floor_name.upper()}")
@@ -64,9 +123,7 @@ def run_pathfinding(floor_name, start_room=None, end_room=None, export_json=True
     config = FloorNavigationConfig.get_floor_config(floor_name)
     
     # Build full file paths
-    dxf_file = os.path.join(base_path, 'data/floor-plans', config['dxf'])
-    image_file = os.path.join(base_path, 'data/floor-plans', config['image'])
-    labels_file = os.path.join(base_path, 'data', config['labels'])
+    dxf_file, image_file, labels_file = get_floor_files(floor_name)
     
     # Verify files exist
     if not os.path.exists(dxf_file):
@@ -82,9 +139,13 @@ def run_pathfinding(floor_name, start_room=None, end_room=None, export_json=True
     print(f"  Image:  {os.path.basename(image_file)}")
     print(f"  Labels: {os.path.basename(labels_file)}")
     
-    # Initialize pathfinder
-    pf = IndoorPathfinder(dxf_file, image_file, labels_file)
-    pf.load_data()
+    # Initialize pathfinder (or reuse an already loaded one)
+    pf = pathfinder
+    if pf is None:
+        pf = IndoorPathfinder(dxf_file, image_file, labels_file)
+        pf.load_data()
+        if departure is not None:
+            apply_crowd_weights(floor_name, pf)
     
     # Export navigation data to JSON
     if export_json:
@@ -97,7 +158,10 @@ def run_pathfinding(floor_name, start_room=None, end_room=None, export_json=True
             start_room = start_room.upper()
             end_room = end_room.upper()
             
-            path, distance = pf.find_path(start_room, end_room)
+            expanded_before = pf.search_stats[search_mode]['expanded']
+            path, cumulative = pf.find_path_with_distances(start_room, end_room, search_mode, closures,
+                                                           departure)
+            distance = cumulative[-1] if path else float('inf')
             
             if path:
                 # Only generate PNG if requested (slow, skip for API calls)
@@ -118,10 +182,12 @@ def run_pathfinding(floor_name, start_room=None, end_room=None, export_json=True
                 print(f"Route:     {start_room} -> {end_room}")
                 print(f"Distance:  {distance:.2f} units")
                 print(f"Waypoints: {len(path)}")
+                print(f"Expanded:  {pf.search_stats[search_mode]['expanded'] - expanded_before} nodes ({search_mode})")
                 print(f"Output:    {output_file}")
                 print(f"{'='*70}\n")
                 
                 # Build path data to return to API
+                pixels_per_unit = FloorNavigationConfig.pixels_per_unit()
                 waypoints = []
                 for idx, node_id in enumerate(path):
                     x, y, label = pf.nodes[node_id]  # Nodes are tuples (x, y, label)
@@ -133,10 +199,11 @@ def run_pathfinding(floor_name, start_room=None, end_room=None, export_json=True
                             'y': y
                         },
                         'pixel_coords': {
-                            'x': x * 25.4,  # Convert DXF to pixels
-                            'y': y * 25.4
+                            'x': x * pixels_per_unit,  # Convert DXF to pixels
+                            'y': y * pixels_per_unit
                         },
-                        'label': label
+                        'label': label,
+                        'distance_so_far': cumulative[idx]
                     })
                 
                 path_data = {
@@ -146,6 +213,13 @@ def run_pathfinding(floor_name, start_room=None, end_room=None, export_json=True
                     'waypoints': waypoints
                 }
                 
+                if simplify:
+                    simplify_route(
+                        path_data, tolerance,
+                        landmark_lookup=lambda _floor, x, y: pf.nearest_room_label(x, y),
+                        floor_order=list(FloorNavigationConfig.FLOORS)
+                    )
+                
                 # Return the path data for API use
                 return path_data
             else:
@@ -159,8 +233,213 @@ def run_pathfinding(floor_name, start_room=None, end_room=None, export_json=True
         return None
 
 
+# Calibration labels in the labels CSVs that are not real rooms
+CALIBRATION_LABELS = {'ORI', 'REF', 'ORI-TR', 'TR-ORI'}
+
+# Per-process state for batch export workers (set by _init_batch_worker)
+_batch_worker = {}
+
+
+def _init_batch_worker(floor_name, image_format):
+    """Process pool initializer: build the floor graph and base image once per worker"""
+    sys.stdout = open(os.devnull, 'w')
+    dxf_file, image_file, labels_file = get_floor_files(floor_name)
+    pf = IndoorPathfinder(dxf_file, image_file, labels_file)
+    pf.load_data()
+    renderer = RouteRenderer(pf)
+    renderer.base_layer()
+    
+    _batch_worker.update(floor=floor_name, pf=pf, renderer=renderer, format=image_format)
+
+
+def _export_batch_route(start_room, end_room, output_file):
+    """Find and render one route inside a batch worker"""
+    pf = _batch_worker['pf']
+    started = time.perf_counter()
+    entry = {'start_room': start_room, 'end_room': end_room, 'floor': _batch_worker['floor']}
+    
+    try:
+        path, distance = pf.find_path(start_room, end_room)
+        if not path:
+            entry.update(status='no_path')
+        else:
+            _batch_worker['renderer'].render_to_file(path, output_file)
+            entry.update(status='ok', file=os.path.basename(output_file),
+                         distance=round(distance, 3), waypoints=len(path))
+    except ValueError as e:
+        entry.update(status='error', error=str(e))
+    
+    entry['seconds'] = round(time.perf_counter() - started, 4)
+    return entry
+
+
+def list_floor_rooms(floor_name):
+    """Room names on a floor, read from the labels CSV (no graph build)"""
+    _, _, labels_file = get_floor_files(floor_name)
+    rooms = set()
+    with open(labels_file, 'r') as f:
+        for row in csv.DictReader(f):
+            room = row['room_name'].strip().split('_')[0].upper()
+            if room and room not in CALIBRATION_LABELS:
+                rooms.add(room)
+    return sorted(rooms)
+
+
+def batch_export(floor_name, pairs=None, to_room=None, workers=None, output_dir=None, image_format='png'):
+    """
+    Render many routes on one floor across a process pool
+    
+    Each worker loads the floor graph and base image once, then renders its
+    share of routes. Images and a JSON-lines manifest entry are written as
+    each route completes; manifest.json summarises the run at the end.
+    
+    Args:
+        floor_name (str): Floor name
+        pairs (list): (start_room, end_room) tuples
+        to_room (str): Instead of pairs, route every room on the floor to this room
+        workers (int): Process count (default: CPU count)
+        output_dir (str): Destination (default: output/batch/<floor>)
+        image_format (str): 'png', 'webp' or 'jpg'
+    
+    Returns:
+        List of manifest entries
+    """
+    if to_room:
+        to_room = to_room.upper()
+        pairs = [(room, to_room) for room in list_floor_rooms(floor_name) if room != to_room]
+    if not pairs:
+        raise ValueError("Nothing to export: pass pairs or to_room")
+    pairs = [(start.upper(), end.upper()) for start, end in pairs]
+    
+    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output_dir = output_dir or os.path.join(base_path, 'output', 'batch', floor_name)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pairs)))
+    
+    print(f"\n[BATCH] {len(pairs)} routes on {floor_name} with {workers} worker(s) -> {output_dir}")
+    started = time.perf_counter()
+    entries = []
+    
+    manifest_lines = os.path.join(output_dir, 'manifest.jsonl')
+    with open(manifest_lines, 'w') as manifest, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_batch_worker, initargs=(floor_name, image_format)
+    ) as pool:
+        futures = [
+            pool.submit(_export_batch_route, start, end, os.path.join(
+                output_dir, f'route_{floor_name}_{start}_to_{end}.{image_format}'))
+            for start, end in pairs
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            entry = future.result()
+            entries.append(entry)
+            manifest.write(json.dumps(entry) + '\n')
+            manifest.flush()
+            mark = 'OK' if entry['status'] == 'ok' else 'X'
+            print(f"  [{mark}] {done}/{len(pairs)} {entry['start_room']} -> {entry['end_room']}")
+    
+    elapsed = time.perf_counter() - started
+    summary = {
+        'floor': floor_name,
+        'format': image_format,
+        'workers': workers,
+        'total': len(entries),
+        'ok': sum(1 for e in entries if e['status'] == 'ok'),
+        'seconds': round(elapsed, 3),
+        'routes': sorted(entries, key=lambda e: (e['start_room'], e['end_room']))
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    
+    print(f"[OK] {summary['ok']}/{summary['total']} routes rendered in {elapsed:.2f}s")
+    return entries
+
+
+def batch_main(argv):
+    """Command-line interface for batch export"""
+    parser = argparse.ArgumentParser(prog='pathfinding.py batch', description='Batch route-image export')
+    parser.add_argument('floor', help='Floor name (basement, floor_1, floor_2, ...)')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--to', dest='to_room', help='Route every room on the floor to this room')
+    target.add_argument('--pairs', help='CSV/text file with one "start,end" pair per line')
+    target.add_argument('--all', action='store_true', help='Every ordered room pair on the floor')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--format', default='png', choices=['png', 'webp', 'jpg'])
+    parser.add_argument('--output', default=None, help='Output directory (default: output/batch/<floor>)')
+    args = parser.parse_args(argv)
+    
+    pairs = None
+    if args.pairs:
+        pairs = []
+        with open(args.pairs, 'r') as f:
+            for row in csv.reader(f):
+                if len(row) >= 2 and row[0].strip() and row[0].strip().lower() != 'start':
+                    pairs.append((row[0].strip(), row[1].strip()))
+    elif args.all:
+        rooms = list_floor_rooms(args.floor)
+        pairs = [(a, b) for a in rooms for b in rooms if a != b]
+    
+    batch_export(args.floor, pairs=pairs, to_room=args.to_room, workers=args.workers,
+                 output_dir=args.output, image_format=args.format)
+
+
+def components_main(argv):
+    """Command-line interface for the connectivity report"""
+    from multi_floor_pathfinder import MultiFloorPathfinder
+    
+    parser = argparse.ArgumentParser(prog='pathfinding.py components',
+                                     description='Connected components, orphaned doors and rooms, search graph size per floor')
+    parser.add_argument('floors', nargs='*', help='Floor names (default: every floor with navigation data)')
+    parser.add_argument('--json', default=None, help='Also write the report to this file')
+    args = parser.parse_args(argv)
+    
+    pathfinders = {}
+    for floor_name in args.floors or FloorNavigationConfig.get_available_floors():
+        pf = IndoorPathfinder(*get_floor_files(floor_name))
+        pf.load_data()
+        pathfinders[floor_name] = pf
+    report = MultiFloorPathfinder(pathfinders=pathfinders).connectivity_report(CALIBRATION_LABELS)
+    report['search_graph'] = {floor_name: pf.contraction_stats for floor_name, pf in pathfinders.items()}
+    
+    print("\n" + "="*70)
+    print("CONNECTIVITY REPORT")
+    print("="*70)
+    for floor_name, floor_report in report['floors'].items():
+        sizes = ', '.join(str(size) for size in floor_report['component_sizes'][:6])
+        print(f"\n{floor_name}: {floor_report['components']} components (nodes: {sizes}"
+              f"{', ...' if floor_report['components'] > 6 else ''})")
+        stats = report['search_graph'][floor_name]
+        print(f"  Search graph: {stats['nodes']} -> {stats['search_nodes']} nodes, "
+              f"{stats['edges']} -> {stats['search_edges']} edges after corridor chain contraction")
+        for door in floor_report['orphaned_doors']:
+            print(f"  [X] Orphaned door {door['label']} ({door['x']:.2f}, {door['y']:.2f}) "
+                  f"component {door['component']}, {door['degree']} edge(s)")
+        if floor_report['orphaned_rooms']:
+            print(f"  [X] Unreachable rooms: {', '.join(floor_report['orphaned_rooms'])}")
+        if floor_report['partially_connected_rooms']:
+            print(f"  [WARNING] Rooms with a cut-off door: {', '.join(floor_report['partially_connected_rooms'])}")
+        if not floor_report['orphaned_doors']:
+            print("  [OK] Every door is in the main component")
+    print(f"\nAcross floors: {report['groups']} groups after joining stairs and elevators")
+    for entry in report['unreachable']:
+        print(f"  [X] {entry['floor']} component {entry['component']} ({entry['size']} nodes) "
+              f"has no stair/elevator link: {', '.join(entry['rooms'])}")
+    print("="*70)
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"[OK] Report saved to {args.json}")
+
+
 def main():
     """Command-line interface"""
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        batch_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'components':
+        components_main(sys.argv[2:])
+        return
+    
     if len(sys.argv) < 2:
         print("\n" + "="*70)
         print("INDOOR NAVIGATION PATHFINDING")
@@ -174,6 +453,8 @@ def main():
         print("  python pathfinding.py floor_1")
         print("  python pathfinding.py floor_1 E100 W170")
         print("  python pathfinding.py floor_2 E200 N250")
+        print("  python pathfinding.py batch floor_1 --to E100 --workers 4")
+        print("  python pathfinding.py components            # orphaned doors/rooms report")
         print("\nSEE: README.md for detailed documentation")
         print("="*70 + "\n")
         sys.exit(1)
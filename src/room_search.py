@@ -0,0 +1,238 @@
+"""
+Room Search Index
+Prefix trie plus bounded edit-distance lookup over room names, label notes and aliases
+
+Usage: python room_search.py <query> [floor_name]
+"""
+
+import csv
+import re
+import sys
+
+from pathfinding import FloorNavigationConfig, get_floor_files, CALIBRATION_LABELS
+
+
+# Alternative names for room kinds (matched against the '(Kind)' suffix of label notes)
+KIND_ALIASES = {
+    'restroom': ('bathroom', 'toilet', 'washroom', 'wc'),
+    'elevator': ('lift',),
+    'stairwell': ('stairs', 'staircase'),
+    'lounge': ('study', 'seating'),
+}
+
+# Words in notes that do not help find a room
+STOP_WORDS = {'door', 'floor', 'basement', 'of', 'the', 'and'}
+
+DEFAULT_LIMIT = 10
+
+
+def max_edits(query):
+    """Edit distance allowed for a query: 0 up to 2 characters, 1 up to 5, then 2"""
+    return 0 if len(query) <= 2 else 1 if len(query) <= 5 else 2
+
+
+class _TrieNode:
+    __slots__ = ('children', 'entries')
+
+    def __init__(self):
+        self.children = {}
+        self.entries = None
+
+
+class RoomTrie:
+    """
+    Trie of search keys, each leading to the set of room entries it names
+
+    Keys are lowercase. A key can name several rooms (the alias 'restroom' names
+    every restroom) and a room has several keys (its name, note words, aliases).
+    """
+
+    def __init__(self):
+        self.root = _TrieNode()
+        self.keys = 0
+
+    def insert(self, key, entry):
+        node = self.root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+        if node.entries is None:
+            node.entries = set()
+            self.keys += 1
+        node.entries.add(entry)
+
+    def exact(self, key):
+        node = self._walk(key)
+        return set(node.entries) if node is not None and node.entries else set()
+
+    def prefix(self, prefix, limit=None):
+        """
+        Entries under every key starting with prefix, shortest keys first
+
+        Returns:
+            {entry: key} for up to limit entries
+        """
+        node = self._walk(prefix)
+        found = {}
+        if node is None:
+            return found
+        level = [(prefix, node)]
+        while level and (limit is None or len(found) < limit):
+            next_level = []
+            for key, node in level:
+                for entry in sorted(node.entries or ()):
+                    found.setdefault(entry, key)
+                next_level.extend((key + char, child) for char, child in sorted(node.children.items()))
+            level = next_level
+        return found if limit is None else dict(list(found.items())[:limit])
+
+    def fuzzy(self, query, max_distance):
+        """
+        Entries whose key is within max_distance edits of query (Levenshtein)
+
+        Walks the trie carrying one row of the edit-distance table per node, so
+        keys sharing a prefix share the work and any branch whose row minimum
+        exceeds max_distance is cut off.
+
+        Returns:
+            {entry: (distance, key)} keeping the closest key per entry
+        """
+        found = {}
+        first_row = list(range(len(query) + 1))
+        stack = [(child, char, char, first_row) for char, child in self.root.children.items()]
+        while stack:
+            node, char, key, previous = stack.pop()
+            row = [previous[0] + 1]
+            for i in range(1, len(query) + 1):
+                cost = 0 if query[i - 1] == char else 1
+                row.append(min(row[i - 1] + 1, previous[i] + 1, previous[i - 1] + cost))
+            if node.entries and row[-1] <= max_distance:
+                for entry in node.entries:
+                    if entry not in found or row[-1] < found[entry][0]:
+                        found[entry] = (row[-1], key)
+            if min(row) <= max_distance:
+                stack.extend((child, c, key + c, row) for c, child in node.children.items())
+        return found
+
+    def _walk(self, key):
+        node = self.root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+
+class RoomIndex:
+    """
+    Search over every floor's rooms, built once from the labels CSVs
+
+    Entries are (floor, room) pairs. Room names are indexed whole ('e100'),
+    note words and kind aliases ('restroom', 'bathroom') are indexed per word.
+    """
+
+    def __init__(self, floors=None):
+        self.trie = RoomTrie()
+        self.rooms = {}
+        self.floors = []
+        for floor_name in floors or FloorNavigationConfig.get_available_floors():
+            try:
+                self.add_floor(floor_name)
+            except (OSError, ValueError) as e:
+                print(f"[WARNING] Room index: skipping {floor_name} ({e})")
+
+    def add_floor(self, floor_name):
+        """Index the rooms in a floor's labels CSV"""
+        _, _, labels_file = get_floor_files(floor_name)
+        with open(labels_file, 'r') as f:
+            for row in csv.DictReader(f):
+                room = row['room_name'].strip().split('_')[0].upper()
+                if not room or room in CALIBRATION_LABELS:
+                    continue
+                entry = (floor_name, room)
+                info = self.rooms.setdefault(entry, {'room': room, 'floor': floor_name, 'kind': None})
+                kind = re.search(r'\(([^)]+)\)', row.get('notes') or '')
+                if kind:
+                    info['kind'] = kind.group(1)
+                for key in self._keys(room, row.get('notes') or '', info['kind']):
+                    self.trie.insert(key, entry)
+        self.floors.append(floor_name)
+
+    @staticmethod
+    def _keys(room, notes, kind):
+        keys = {room.lower()}
+        # Notes read 'Floor 1 - E100A' or 'Basement - E014T (Restroom)'
+        text = notes.split(' - ', 1)[-1]
+        keys.update(word for word in re.findall(r'[a-z]+', text.lower().replace(room.lower(), ''))
+                    if len(word) > 1 and word not in STOP_WORDS)
+        if kind:
+            keys.update(KIND_ALIASES.get(kind.lower(), ()))
+        return keys
+
+    def contains(self, floor_name, room):
+        return (floor_name, room.upper()) in self.rooms
+
+    def search(self, query, floor_name=None, limit=DEFAULT_LIMIT, max_distance=None):
+        """
+        Rooms matching a partial or misspelled query
+
+        Exact key matches come first, then prefix matches (as typed so far),
+        then fuzzy matches within max_edits(query), closest first.
+
+        Args:
+            query: Text typed so far ('e10', 'E1O0', 'bathroom')
+            floor_name: Only rooms on this floor
+            limit: Maximum results
+            max_distance: Edits allowed for fuzzy matches (default: max_edits(query))
+
+        Returns:
+            List of {'room', 'floor', 'kind', 'match', 'distance'}
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        ranked = {}
+
+        def keep(entry, rank):
+            if floor_name and entry[0] != floor_name:
+                return
+            if entry not in ranked or rank < ranked[entry]:
+                ranked[entry] = rank
+
+        for entry in self.trie.exact(query):
+            keep(entry, (0, 0, 'exact'))
+        for entry, key in self.trie.prefix(query).items():
+            keep(entry, (1, len(key) - len(query), 'prefix'))
+        if max_distance is None:
+            max_distance = max_edits(query)
+        if len(ranked) < limit:
+            for entry, (distance, key) in self.trie.fuzzy(query, max_distance).items():
+                keep(entry, (2, distance, 'fuzzy'))
+
+        order = sorted(ranked, key=lambda entry: (ranked[entry][:2], entry[1], entry[0]))
+        results = []
+        for entry in order[:limit]:
+            info = self.rooms[entry]
+            rank = ranked[entry]
+            results.append(dict(info, match=rank[2], distance=rank[1] if rank[0] == 2 else 0))
+        return results
+
+    def suggest(self, room, floor_name=None, limit=3):
+        """Closest room names to one that was not found (one edit more lenient than search)"""
+        results = self.search(room, floor_name, limit, max_edits(room.strip()) + 1)
+        return [result['room'] for result in results if result['match'] != 'exact']
+
+
+def main():
+    """Command-line interface"""
+    if len(sys.argv) < 2:
+        print("Usage: python room_search.py <query> [floor_name]")
+        sys.exit(1)
+    index = RoomIndex()
+    print(f"[OK] {len(index.rooms)} rooms, {index.trie.keys} search keys on {', '.join(index.floors)}")
+    for result in index.search(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None):
+        kind = f" ({result['kind']})" if result['kind'] else ''
+        print(f"  {result['floor']:<10} {result['room']:<8}{kind:<14} {result['match']} {result['distance'] or ''}")
+
+
+if __name__ == "__main__":
+    main()
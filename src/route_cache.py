@@ -0,0 +1,98 @@
+"""
+Route Response Cache
+Bounded LRU of encoded route responses, invalidated per floor on graph reload
+"""
+
+from collections import OrderedDict
+import threading
+
+
+# Entries kept (0 disables caching: every put is evicted at once)
+DEFAULT_MAX_ENTRIES = 2048
+
+
+class RouteCache:
+    """
+    Encoded responses keyed by request parameters
+
+    Each entry remembers the floors it was computed on, so a reload of one
+    floor drops only the routes that touch it, and its footprint (see
+    route_footprint) so a closure drops only the routes passing through the
+    closed element. Keys should include the floor versions (FloorSnapshot.etag)
+    so a response computed on an old graph can never be stored under the new one.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Cached encoded response body, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, floors, value, footprint=frozenset(), still_valid=None):
+        """
+        Store a response; with still_valid, only if still_valid() is true
+
+        still_valid() is checked under the cache lock, so a value computed on
+        state that changed mid-search (e.g. the closures) is either stored
+        before the change's invalidation runs, and dropped by it, or not at all.
+        """
+        with self._lock:
+            if still_valid is not None and not still_valid():
+                return
+            self._entries[key] = (frozenset(floors), value, footprint)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_floor(self, floor_name):
+        """Drop every cached route that touches a floor; returns the count dropped"""
+        return self.invalidate_where(lambda floors, footprint: floor_name in floors)
+
+    def invalidate_where(self, predicate):
+        """Drop entries for which predicate(floors, footprint) is true; returns the count dropped"""
+        with self._lock:
+            stale = [key for key, (floors, _, footprint) in self._entries.items() if predicate(floors, footprint)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+def route_footprint(result, floor_name, exact=True):
+    """
+    What a route passes through: {('node', floor, node_id), ..., ('transition', NAME)}
+
+    Args:
+        result: Route dict from run_pathfinding or find_multi_floor_path
+        floor_name: Floor of single-floor results (their waypoints carry no 'floor')
+        exact: False when waypoints were simplified away; the footprint then
+               holds ('floor', name) for every floor, matching any closure on it
+    """
+    footprint = set()
+    for waypoint in result.get('waypoints', []):
+        if 'node_id' in waypoint:
+            floor = waypoint.get('floor', floor_name)
+            footprint.add(('node', floor, waypoint['node_id']) if exact else ('floor', floor))
+    transition = result.get('transition')
+    if transition:
+        footprint.add(('transition', transition['exit_point'].upper()))
+        footprint.add(('transition', transition['arrive_point'].upper()))
+    return frozenset(footprint)
@@ -0,0 +1,246 @@
+"""
+Route Post-Processing - Waypoint Simplification and Turn-by-Turn Steps
+Merges collinear corridor points and describes the route as compact instructions
+"""
+
+import math
+
+
+# Max perpendicular deviation (DXF units) for a point to count as collinear
+DEFAULT_TOLERANCE = 0.5
+
+# Turn classification thresholds (degrees)
+STRAIGHT_ANGLE = 25
+SLIGHT_ANGLE = 60
+SHARP_ANGLE = 150
+
+
+def display_label(label):
+    """Door label -> room name ('E100_2' -> 'E100'), None for pathway/calibration nodes"""
+    if not label or label in ('ori', 'ref', 'ori-tr', 'tr-ori'):
+        return None
+    return label.split('_')[0]
+
+
+def _xy(waypoint):
+    coords = waypoint['dxf_coords']
+    return float(coords['x']), float(coords['y'])
+
+
+def _distance_to_segment(point, seg_start, seg_end):
+    """Perpendicular distance from point to segment"""
+    px, py = point
+    ax, ay = seg_start
+    bx, by = seg_end
+    vx, vy = bx - ax, by - ay
+    length_sq = vx * vx + vy * vy
+    if length_sq < 1e-20:
+        return math.hypot(px - ax, py - ay)
+    t = max(0.0, min(1.0, ((px - ax) * vx + (py - ay) * vy) / length_sq))
+    return math.hypot(px - (ax + t * vx), py - (ay + t * vy))
+
+
+def simplify_waypoints(waypoints, tolerance=DEFAULT_TOLERANCE):
+    """
+    Drop pathway waypoints that lie on the straight run between their neighbours
+
+    Endpoints and labeled waypoints (doors, stairs, elevators) are always kept.
+    A run is merged only while every skipped point stays within `tolerance`
+    of the segment that replaces it.
+    """
+    if len(waypoints) <= 2:
+        return list(waypoints)
+
+    points = [_xy(wp) for wp in waypoints]
+    kept = [0]
+    anchor = 0
+    i = 1
+
+    while i < len(waypoints) - 1:
+        if display_label(waypoints[i].get('label')):
+            kept.append(i)
+            anchor = i
+            i += 1
+            continue
+
+        # Can the run anchor -> i+1 absorb every point in between?
+        end = i + 1
+        if all(_distance_to_segment(points[k], points[anchor], points[end]) <= tolerance
+               for k in range(anchor + 1, end)):
+            i += 1
+            continue
+
+        kept.append(i)
+        anchor = i
+        i += 1
+
+    kept.append(len(waypoints) - 1)
+    return [waypoints[k] for k in kept]
+
+
+def turn_angle(a, b, c):
+    """Signed heading change at b in degrees (positive = left, negative = right)"""
+    heading_in = math.atan2(b[1] - a[1], b[0] - a[0])
+    heading_out = math.atan2(c[1] - b[1], c[0] - b[0])
+    angle = math.degrees(heading_out - heading_in)
+    while angle > 180:
+        angle -= 360
+    while angle <= -180:
+        angle += 360
+    return angle
+
+
+def classify_turn(angle):
+    """Map a signed angle to a direction, or None when it is effectively straight"""
+    magnitude = abs(angle)
+    if magnitude < STRAIGHT_ANGLE:
+        return None
+    if magnitude >= SHARP_ANGLE:
+        return 'around'
+    side = 'left' if angle > 0 else 'right'
+    return f'slight {side}' if magnitude < SLIGHT_ANGLE else side
+
+
+def _turn_text(direction, at):
+    verb = 'Turn around' if direction == 'around' else f'Turn {direction}'
+    return f'{verb} at {at}' if at else verb
+
+
+def _segment_steps(waypoints, floor, landmark_lookup):
+    """Turn steps along one floor's simplified waypoints"""
+    steps = []
+    points = [_xy(wp) for wp in waypoints]
+    travelled = 0.0
+
+    for i in range(1, len(points)):
+        travelled += math.hypot(points[i][0] - points[i - 1][0], points[i][1] - points[i - 1][1])
+        if i == len(points) - 1:
+            break
+
+        angle = turn_angle(points[i - 1], points[i], points[i + 1])
+        direction = classify_turn(angle)
+        if direction is None:
+            continue
+
+        at = display_label(waypoints[i].get('label'))
+        if at is None and landmark_lookup is not None:
+            at = landmark_lookup(floor, points[i][0], points[i][1])
+
+        steps.append({
+            'type': 'turn',
+            'direction': direction,
+            'angle': round(angle, 1),
+            'floor': floor,
+            'at': at,
+            'node_id': waypoints[i].get('node_id'),
+            'distance': round(travelled, 2),
+            'text': _turn_text(direction, at)
+        })
+        travelled = 0.0
+
+    return steps, travelled
+
+
+def _transition_text(transition, floor_order):
+    point = transition['exit_point']
+    from_floor = transition['from_floor']
+    to_floor = transition['to_floor']
+
+    direction = ''
+    if from_floor in floor_order and to_floor in floor_order:
+        direction = ' up' if floor_order.index(to_floor) > floor_order.index(from_floor) else ' down'
+
+    if transition.get('type') == 'elevator':
+        return f'Take elevator {point}{direction} to {to_floor}'
+    if transition['arrive_point'] != point:
+        return f"Take {point}{direction} to {to_floor}, arrive at {transition['arrive_point']}"
+    return f'Take {point}{direction} to {to_floor}'
+
+
+def simplify_route(route, tolerance=DEFAULT_TOLERANCE, landmark_lookup=None, floor_order=()):
+    """
+    Simplify a route result in place and attach turn-by-turn instructions
+
+    Accepts both single-floor results (top-level 'waypoints') and multi-floor
+    results ('segments' + optional 'transition'). Waypoints are re-indexed
+    after merging; 'node_id' still refers to the floor graph.
+
+    Args:
+        route: Route dict from run_pathfinding or MultiFloorPathfinder
+        tolerance: Collinearity tolerance in DXF units
+        landmark_lookup: Optional fn(floor, x, y) -> nearby room name for unlabeled turns
+        floor_order: Floor names bottom to top, used for "up"/"down"
+    """
+    if 'segments' in route:
+        segments = route['segments']
+    else:
+        segments = [{'floor': route.get('floor'), 'waypoints': route['waypoints']}]
+
+    original_count = sum(len(segment['waypoints']) for segment in segments)
+    transition = route.get('transition')
+    instructions = []
+    all_waypoints = []
+    index = 0
+
+    for seg_idx, segment in enumerate(segments):
+        simplified = simplify_waypoints(segment['waypoints'], tolerance)
+        for waypoint in simplified:
+            waypoint['index'] = index
+            all_waypoints.append(waypoint)
+            index += 1
+        segment['waypoints'] = simplified
+
+        floor = segment.get('floor')
+        if seg_idx == 0 and simplified:
+            start = display_label(simplified[0].get('label')) or route.get('start_room')
+            instructions.append({
+                'type': 'start', 'floor': floor, 'at': start,
+                'node_id': simplified[0].get('node_id'), 'distance': 0.0,
+                'text': f'Start at {start}'
+            })
+
+        steps, remaining = _segment_steps(simplified, floor, landmark_lookup)
+        instructions.extend(steps)
+
+        if transition and seg_idx < len(segments) - 1:
+            all_waypoints.append({
+                'floor': 'transition',
+                'index': index,
+                'transition_type': transition.get('type'),
+                'from_floor': transition['from_floor'],
+                'to_floor': transition['to_floor'],
+                'exit_point': transition['exit_point'],
+                'arrive_point': transition['arrive_point'],
+                'distance_so_far': simplified[-1].get('distance_so_far') if simplified else None
+            })
+            index += 1
+            instructions.append({
+                'type': 'transition',
+                'transition_type': transition.get('type'),
+                'from_floor': transition['from_floor'],
+                'to_floor': transition['to_floor'],
+                'at': transition['exit_point'],
+                'distance': round(remaining, 2),
+                'text': _transition_text(transition, list(floor_order))
+            })
+        elif seg_idx == len(segments) - 1 and simplified:
+            end = display_label(simplified[-1].get('label')) or route.get('end_room')
+            instructions.append({
+                'type': 'arrive', 'floor': floor, 'at': end,
+                'node_id': simplified[-1].get('node_id'), 'distance': round(remaining, 2),
+                'text': f'Arrive at {end}'
+            })
+
+    if 'segments' in route:
+        if 'waypoints' in route:
+            route['waypoints'] = all_waypoints
+    else:
+        route['waypoints'] = segments[0]['waypoints']
+
+    route['instructions'] = instructions
+    route['simplification'] = {
+        'tolerance': tolerance,
+        'original_waypoints': original_count,
+        'simplified_waypoints': sum(len(segment['waypoints']) for segment in segments)
+    }
+    return route
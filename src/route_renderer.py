@@ -0,0 +1,178 @@
+"""
+Route Image Renderer
+Raster replacement for the matplotlib route plot with a cached per-floor base layer
+"""
+
+from PIL import Image, ImageDraw
+from collections import OrderedDict
+import io
+import os
+import threading
+
+
+# Output scale relative to the floor plan image (0.5 keeps encodes in the tens of ms)
+DEFAULT_SCALE = 0.5
+
+# DXF units -> pixels when there is no floor plan image to calibrate against
+FALLBACK_PIXELS_PER_UNIT = 25.4
+
+ENCODERS = {
+    'png': ('PNG', {'compress_level': 1}),
+    'webp': ('WEBP', {'quality': 80, 'method': 0}),
+    'jpg': ('JPEG', {'quality': 85}),
+    'jpeg': ('JPEG', {'quality': 85}),
+}
+
+CORRIDOR_COLOR = (128, 128, 128, 60)
+DOOR_COLOR = (173, 216, 230, 128)
+PATH_COLOR = (220, 20, 60)
+START_COLOR = (34, 139, 34)
+END_COLOR = (30, 80, 220)
+
+# Base layers kept per process (one per floor and scale; a few MB each)
+BASE_CACHE_ENTRIES = 8
+
+# (input paths, scale) -> (input mtimes, base layer), least recently used first
+_base_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _mtime(path):
+    return os.path.getmtime(path) if path and os.path.exists(path) else None
+
+
+class RouteRenderer:
+    """
+    Draws routes for one floor onto a cached base layer
+
+    The base layer is the floor plan with the same orientation as the old
+    matplotlib output (image mirrored, then shown with origin='lower', i.e.
+    rotated 180 degrees), pre-scaled, with the corridor network and door
+    markers already drawn. It is cached per process by the input files'
+    paths and checked against their mtimes, so a new route only copies it
+    and draws the path. An edited file replaces the floor's entry, and at
+    most BASE_CACHE_ENTRIES layers are kept.
+    """
+
+    def __init__(self, pathfinder, scale=DEFAULT_SCALE):
+        self.pf = pathfinder
+        self.scale = scale
+        (self.origin_x, self.origin_y, self.px_per_unit_x, self.px_per_unit_y,
+         self.width, self.height) = self._calibrate()
+
+    def _cache_key(self):
+        """(cache slot, version): the inputs' paths and scale, and their mtimes"""
+        pf = self.pf
+        paths = (pf.image_path, pf.labels_csv, pf.dxf_path)
+        return paths + (self.scale,), tuple(_mtime(path) for path in paths)
+
+    def _calibrate(self):
+        """Scale factors from the CSV calibration points and image size"""
+        origin_x, origin_y, ref_x, ref_y = self.pf._load_calibration_points()
+        dxf_width = ref_x - origin_x
+        dxf_height = ref_y - origin_y
+
+        if self.pf.image_path and os.path.exists(self.pf.image_path):
+            with Image.open(self.pf.image_path) as img:
+                img_width, img_height = img.size
+        else:
+            img_width = round(dxf_width * FALLBACK_PIXELS_PER_UNIT)
+            img_height = round(dxf_height * FALLBACK_PIXELS_PER_UNIT)
+
+        return (origin_x, origin_y,
+                img_width / dxf_width * self.scale, img_height / dxf_height * self.scale,
+                round(img_width * self.scale), round(img_height * self.scale))
+
+    def to_pixel(self, x, y):
+        """DXF coordinates -> (column, row) in the rendered image"""
+        px = (x - self.origin_x) * self.px_per_unit_x
+        py = (y - self.origin_y) * self.px_per_unit_y
+        return px, self.height - py
+
+    def base_layer(self):
+        """Cached floor plan + corridor network for this floor"""
+        key, version = self._cache_key()
+        with _cache_lock:
+            entry = _base_cache.get(key)
+            if entry is not None and entry[0] == version:
+                _base_cache.move_to_end(key)
+                return entry[1]
+        base = self._build_base_layer()
+        with _cache_lock:
+            _base_cache[key] = (version, base)
+            _base_cache.move_to_end(key)
+            while len(_base_cache) > BASE_CACHE_ENTRIES:
+                _base_cache.popitem(last=False)
+        return base
+
+    def _build_base_layer(self):
+        pf = self.pf
+        if pf.image_path and os.path.exists(pf.image_path):
+            with Image.open(pf.image_path) as src:
+                img = src.convert('RGB')
+            img = img.resize((self.width, self.height), Image.BILINEAR).transpose(Image.ROTATE_180)
+        else:
+            img = Image.new('RGB', (self.width, self.height), 'white')
+
+        overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(overlay)
+        line_width = max(1, round(2 * self.scale))
+
+        for node_id, neighbors in pf.graph.items():
+            x1, y1, _ = pf.nodes[node_id]
+            start = self.to_pixel(x1, y1)
+            for neighbor_id, _ in neighbors:
+                if neighbor_id > node_id:
+                    x2, y2, _ = pf.nodes[neighbor_id]
+                    draw.line([start, self.to_pixel(x2, y2)], fill=CORRIDOR_COLOR, width=line_width)
+
+        radius = max(2, round(8 * self.scale))
+        for x, y, label in pf.nodes.values():
+            if label and label != 'ori':
+                px, py = self.to_pixel(x, y)
+                draw.ellipse([px - radius, py - radius, px + radius, py + radius], fill=DOOR_COLOR)
+
+        return Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
+
+    def render(self, path, fmt='png'):
+        """
+        Draw a route onto a copy of the base layer and encode it
+
+        Args:
+            path: Node ids along the route
+            fmt: 'png', 'webp' or 'jpg'
+
+        Returns:
+            Encoded image bytes
+        """
+        fmt = fmt.lower()
+        if fmt not in ENCODERS:
+            raise ValueError(f"Unsupported image format '{fmt}'. Available: {list(ENCODERS)}")
+
+        img = self.base_layer().copy()
+        draw = ImageDraw.Draw(img)
+        points = [self.to_pixel(*self.pf.nodes[node_id][:2]) for node_id in path]
+
+        if len(points) > 1:
+            width = max(2, round(10 * self.scale))
+            draw.line(points, fill=PATH_COLOR, width=width, joint='curve')
+
+        if points:
+            radius = max(4, round(22 * self.scale))
+            sx, sy = points[0]
+            ex, ey = points[-1]
+            draw.ellipse([sx - radius, sy - radius, sx + radius, sy + radius], fill=START_COLOR, outline='white')
+            draw.rectangle([ex - radius, ey - radius, ex + radius, ey + radius], fill=END_COLOR, outline='white')
+
+        pil_format, options = ENCODERS[fmt]
+        buffer = io.BytesIO()
+        img.save(buffer, pil_format, **options)
+        return buffer.getvalue()
+
+    def render_to_file(self, path, output_file):
+        """Render a route and write it; format follows the file extension"""
+        fmt = os.path.splitext(output_file)[1].lstrip('.') or 'png'
+        data = self.render(path, fmt)
+        with open(output_file, 'wb') as f:
+            f.write(data)
+        return output_file
@@ -0,0 +1,253 @@
+"""
+Search Pool
+Runs route searches in warm worker processes so CPU-heavy queries do not
+serialize on the GIL of the web process
+"""
+
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+from pathfinding import run_pathfinding
+from multi_floor_pathfinder import find_multi_floor_path
+from floor_registry import FloorRegistry, floor_fingerprint
+
+
+# Searches queued or running before new ones are turned away, per worker
+QUEUE_PER_WORKER = 4
+
+# Seconds a request waits for its search
+DEFAULT_TIMEOUT = 10.0
+
+# Seconds the startup check waits for every worker to finish building its floors
+WARMUP_TIMEOUT = 300.0
+
+
+class SearchPoolBusy(Exception):
+    """Every queue slot is taken; the caller should answer 503"""
+
+
+class SearchTimeout(Exception):
+    """The search did not finish within the request timeout; the caller should answer 504"""
+
+
+# Per-process state for search workers (set by _init_search_worker)
+_search_worker = {}
+
+
+def _init_search_worker(floors, preload, barrier):
+    """Process pool initializer: build and index the preload floors once per worker"""
+    sys.stdout = open(os.devnull, 'w')
+    registry = FloorRegistry(floors, load_workers=1, preload=preload)
+    registry.warmup()
+    _search_worker.update(registry=registry, barrier=barrier)
+
+
+def _worker_snapshot(fingerprints):
+    """
+    Worker's floor snapshot, brought in line with the web process
+
+    Lazy floors are built on first use. A floor whose fingerprint (or, if its
+    build failed, the fingerprint of the files it failed on) differs from the
+    one the request was keyed on is rebuilt first, unless the files still
+    match the worker's copy (the web process has not caught up yet).
+    """
+    registry = _search_worker['registry']
+    snapshot = registry.ensure(*fingerprints)
+    stale = []
+    for floor, fingerprint in fingerprints.items():
+        known = snapshot.fingerprints.get(floor) or registry.status.get(floor, {}).get('fingerprint')
+        if fingerprint and known and known != fingerprint and floor_fingerprint(floor) != known:
+            stale.append(floor)
+    for floor_name in stale:
+        registry.reload(floor_name)
+    return registry.snapshot
+
+
+def _ping(timeout):
+    """Startup check; the barrier makes each worker take exactly one ping"""
+    _search_worker['barrier'].wait(timeout)
+    return os.getpid()
+
+
+def _run_search(fingerprints, start_floor, start_room, end_floor, end_room, options):
+    """Run one single- or multi-floor search inside a search worker"""
+    snapshot = _worker_snapshot(fingerprints)
+    closures = options['closures']
+    if start_floor != end_floor:
+        return find_multi_floor_path(start_floor, start_room, end_floor, end_room, options['ada_compliance'],
+                                     options['simplify'], multi_floor=snapshot.multi_floor_for(fingerprints),
+                                     closures=closures, departure=options['departure'])
+    return run_pathfinding(start_floor, start_room, end_room, export_json=False, generate_image=False,
+                           simplify=options['simplify'], pathfinder=snapshot.get(start_floor),
+                           closures=closures.for_floor(start_floor) if closures else None,
+                           departure=options['departure'])
+
+
+class SearchPool:
+    """
+    Pool of worker processes that each hold every floor graph
+
+    start() forks the workers, which build their floors (landmarks and crowd
+    weights included) before taking the first search. search() takes one of
+    max_pending slots or raises SearchPoolBusy at once, so a burst of slow
+    cross-floor queries cannot build an unbounded backlog. A slot is held
+    until the worker has actually finished: a search that outlives its
+    request timeout (SearchTimeout) still occupies a worker, and still counts.
+
+    Each request carries the floors' fingerprints from the web process's
+    snapshot; a worker whose copy of a floor is older rebuilds it before
+    searching, so hot reloads reach the workers without a restart.
+    """
+
+    def __init__(self, workers, floors, preload, max_pending=None, timeout=DEFAULT_TIMEOUT):
+        """
+        Args:
+            workers: Worker process count
+            floors: Floors the workers serve
+            preload: Floors each worker builds at startup (the rest on first use)
+            max_pending: Searches queued or running before SearchPoolBusy (default QUEUE_PER_WORKER per worker)
+            timeout: Seconds search() waits for a result
+        """
+        self.workers = workers
+        self.floors = list(floors)
+        self.preload = list(preload)
+        self.max_pending = max_pending or workers * QUEUE_PER_WORKER
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._pool = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.restarts = 0
+        self.warmup_seconds = None
+
+    def start(self):
+        """
+        Start the workers; they build their floors in the background
+
+        The processes are forked here, in the calling thread, so call this
+        before starting other threads (e.g. the floor registry warmup).
+        """
+        started = time.perf_counter()
+        self._pool = self._new_pool()
+        pings = [self._pool.submit(_ping, WARMUP_TIMEOUT) for _ in range(self.workers)]
+        threading.Thread(target=self._warmed, args=(pings, started), name='search-pool-warmup', daemon=True).start()
+        return self
+
+    def _warmed(self, pings, started):
+        try:
+            pids = set(future.result() for future in pings)
+        except (BrokenProcessPool, threading.BrokenBarrierError) as e:
+            print(f"[ERROR] Search pool workers failed to start: {e}")
+            return
+        self.warmup_seconds = round(time.perf_counter() - started, 3)
+        print(f"[OK] Search pool: {len(pids)} worker(s) warm in {self.warmup_seconds:.2f}s, "
+              f"queue depth {self.max_pending}, timeout {self.timeout:g}s")
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_search_worker,
+                                   initargs=(self.floors, self.preload, multiprocessing.Barrier(self.workers)))
+
+    def search(self, snapshot, start_floor, start_room, end_floor, end_room, ada_compliance=False,
+               simplify=False, closures=None, departure=None):
+        """
+        Route between two rooms in a worker process
+
+        Args:
+            snapshot: The request's FloorSnapshot (its fingerprints pin the graph version)
+            closures: ClosureOverlay for the request (its floor part is applied on a single floor)
+            Other args as find_multi_floor_path / run_pathfinding
+
+        Returns:
+            Route result dict, or None if no path exists
+
+        Raises:
+            SearchPoolBusy, SearchTimeout; ValueError from the search itself
+
+        A timeout only stops the wait: a search a worker has already started
+        cannot be interrupted and runs to completion, holding its worker and
+        queue slot until then (one still queued is dropped).
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise SearchPoolBusy(f'Search queue full ({self.max_pending} pending)')
+        with self._lock:
+            self.pending += 1
+
+        fingerprints = {floor: snapshot.fingerprints.get(floor) for floor in (start_floor, end_floor)}
+        options = {'ada_compliance': ada_compliance, 'simplify': simplify,
+                   'closures': closures, 'departure': departure}
+        try:
+            pool, future = self._submit(fingerprints, start_floor, start_room, end_floor, end_room, options)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # Drops the search if it is still queued; a running one cannot be stopped
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise SearchTimeout(f'No result within {self.timeout:g}s '
+                                f'(a search already running finishes in its worker)')
+        except BrokenProcessPool:
+            # A worker died mid-search (e.g. killed for memory); later requests get a fresh pool
+            self._restart(pool)
+            raise SearchTimeout('Search worker exited unexpectedly')
+
+    def _submit(self, *args):
+        """(pool used, future) for one search; replaces the pool once if it is found broken"""
+        pool = self._pool
+        try:
+            return pool, pool.submit(_run_search, *args)
+        except BrokenProcessPool:
+            self._restart(pool)
+        pool = self._pool
+        return pool, pool.submit(_run_search, *args)
+
+    def _release(self, future=None):
+        with self._lock:
+            self.pending -= 1
+            if future is not None and not future.cancelled():
+                self.completed += 1
+        self._slots.release()
+
+    def _restart(self, broken):
+        """Replace a pool that raised BrokenProcessPool (once, however many requests saw it fail)"""
+        with self._lock:
+            if self._pool is not broken:
+                return  # already replaced
+            print("[WARNING] Search pool broken, starting new workers")
+            self._pool = self._new_pool()
+            self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        """Counters for /ready"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'timeout': self.timeout,
+                'pending': self.pending,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+                'restarts': self.restarts,
+                'warmup_seconds': self.warmup_seconds,
+            }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
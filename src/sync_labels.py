@@ -0,0 +1,234 @@
+"""
+Label Synchronization
+Carries room names from a floor's labels CSV over to the POINTs of a new DXF export,
+matching by position (nearest neighbour) instead of by list index
+
+Usage: python sync_labels.py <floor_name> [--dxf FILE] [--threshold D] [--dry-run] [--report FILE]
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import math
+import os
+import sys
+
+from extract_rooms import scan_dxf, TEMPLATE_FIELDS
+from pathfinding import BASE_DIR, FloorNavigationConfig
+
+
+# Farthest a point may move (DXF units) and still keep its label
+MATCH_THRESHOLD = 1.0
+
+# Below this a matched point counts as unchanged (its CSV coordinates are kept as written)
+MOVE_EPSILON = 1e-6
+
+# Nearest DXF points considered per label
+CANDIDATES = 4
+
+
+class KDTree:
+    """
+    2-d tree over (x, y) points for k-nearest queries
+
+    Built once in O(n log n) by median splits on alternating axes; a query
+    descends to the leaf region first, then only visits the other side of a
+    split when it could hold something nearer than the current k-th best.
+    """
+
+    def __init__(self, points):
+        self.points = points
+        self.root = self._build(list(range(len(points))), 0)
+
+    def _build(self, indices, depth):
+        if not indices:
+            return None
+        axis = depth % 2
+        indices.sort(key=lambda i: self.points[i][axis])
+        middle = len(indices) // 2
+        return (indices[middle], axis,
+                self._build(indices[:middle], depth + 1),
+                self._build(indices[middle + 1:], depth + 1))
+
+    def nearest(self, x, y, k=1, max_distance=math.inf):
+        """
+        Up to k points within max_distance of (x, y)
+
+        Returns:
+            [(distance, point index)] nearest first
+        """
+        best = []   # max-heap of (-distance, index)
+        stack = [self.root]
+        target = (x, y)
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            index, axis, left, right = node
+            px, py = self.points[index]
+            distance = math.hypot(px - x, py - y)
+            if distance <= max_distance:
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, index))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, index))
+            offset = target[axis] - self.points[index][axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            limit = -best[0][0] if len(best) == k else max_distance
+            if abs(offset) <= limit:
+                stack.append(far)
+            stack.append(near)
+        return sorted((-d, i) for d, i in best)
+
+
+def match_points(labels, points, threshold=MATCH_THRESHOLD):
+    """
+    Pair labels with DXF points, closest pairs first
+
+    Every label proposes its CANDIDATES nearest points within threshold;
+    proposals are taken in order of distance, each label and point used at
+    most once. An inserted or deleted point therefore only affects itself.
+
+    Args:
+        labels: [(x, y)] positions of the existing labels
+        points: [(x, y)] DXF POINT positions
+        threshold: Maximum distance for a match
+
+    Returns:
+        ({label index: (point index, distance)}, unmatched label indices, unmatched point indices)
+    """
+    tree = KDTree(points)
+    proposals = []
+    for label_index, (x, y) in enumerate(labels):
+        for distance, point_index in tree.nearest(x, y, CANDIDATES, threshold):
+            proposals.append((distance, label_index, point_index))
+    proposals.sort()
+
+    matches = {}
+    taken = set()
+    for distance, label_index, point_index in proposals:
+        if label_index in matches or point_index in taken:
+            continue
+        matches[label_index] = (point_index, distance)
+        taken.add(point_index)
+    unmatched_labels = [i for i in range(len(labels)) if i not in matches]
+    unmatched_points = [i for i in range(len(points)) if i not in taken]
+    return matches, unmatched_labels, unmatched_points
+
+
+def sync_labels(labels_file, dxf_file, threshold=MATCH_THRESHOLD):
+    """
+    New labels rows for a DXF's POINTs, keeping names and notes of matched labels
+
+    Rows follow the DXF point order (point_id = DXF index). Points with no
+    label within threshold become NEW_POINT_<id> rows; labels with no point
+    are left out and reported.
+
+    Returns:
+        (rows, report) where report has 'matched', 'moved', 'new_points', 'unmatched_labels'
+    """
+    with open(labels_file, 'r') as f:
+        old_rows = list(csv.DictReader(f))
+    labels = [(float(row['x']), float(row['y'])) for row in old_rows]
+    points = scan_dxf(dxf_file)['points']
+    matches, unmatched_labels, unmatched_points = match_points(labels, points, threshold)
+
+    by_point = {point_index: (label_index, distance) for label_index, (point_index, distance) in matches.items()}
+    rows = []
+    moved = []
+    for point_index, (x, y) in enumerate(points):
+        if point_index not in by_point:
+            rows.append({'point_id': point_index, 'x': f'{x:.10f}', 'y': f'{y:.10f}',
+                         'room_name': f'NEW_POINT_{point_index}', 'notes': 'Needs label'})
+            continue
+        label_index, distance = by_point[point_index]
+        old = old_rows[label_index]
+        row = {'point_id': point_index, 'x': old['x'], 'y': old['y'],
+               'room_name': old['room_name'], 'notes': old['notes']}
+        if distance > MOVE_EPSILON:
+            row.update(x=f'{x:.10f}', y=f'{y:.10f}')
+            moved.append({'room_name': old['room_name'], 'from': labels[label_index], 'to': (x, y),
+                          'distance': round(distance, 6)})
+        rows.append(row)
+
+    report = {
+        'labels': len(old_rows),
+        'points': len(points),
+        'threshold': threshold,
+        'matched': len(matches),
+        'moved': moved,
+        'new_points': [{'point_id': i, 'x': points[i][0], 'y': points[i][1]} for i in unmatched_points],
+        'unmatched_labels': [{'room_name': old_rows[i]['room_name'], 'x': labels[i][0], 'y': labels[i][1]}
+                             for i in unmatched_labels],
+    }
+    return rows, report
+
+
+def floor_sync_files(floor_name):
+    """(labels CSV, DXF) of a manifest floor"""
+    config = FloorNavigationConfig.get_floor_config(floor_name)
+    if config['labels'] is None:
+        raise ValueError(f"Floor '{floor_name}' has no labels CSV to sync (use extract_rooms.py)")
+    dxf = config['dxf'] or f'{floor_name}.DXF'
+    return os.path.join(BASE_DIR, 'data', config['labels']), os.path.join(BASE_DIR, 'data', 'floor-plans', dxf)
+
+
+def print_report(floor_name, report):
+    print("\n" + "="*70)
+    print(f"LABEL SYNC: {floor_name.upper()}")
+    print("="*70)
+    print(f"  Labels: {report['labels']}   DXF points: {report['points']}   "
+          f"Matched: {report['matched']} (threshold {report['threshold']})")
+    if report['moved']:
+        print(f"\n[MOVED] {len(report['moved'])} points")
+        for entry in report['moved']:
+            print(f"  {entry['room_name']:<14} ({entry['from'][0]:.3f}, {entry['from'][1]:.3f}) -> "
+                  f"({entry['to'][0]:.3f}, {entry['to'][1]:.3f})  {entry['distance']:.3f}")
+    if report['new_points']:
+        print(f"\n[WARNING] {len(report['new_points'])} DXF points have no label (NEW_POINT_<id> rows):")
+        for entry in report['new_points']:
+            print(f"  point {entry['point_id']:<5} ({entry['x']:.3f}, {entry['y']:.3f})")
+    if report['unmatched_labels']:
+        print(f"\n[WARNING] {len(report['unmatched_labels'])} labels have no DXF point and are dropped:")
+        for entry in report['unmatched_labels']:
+            print(f"  {entry['room_name']:<14} ({entry['x']:.3f}, {entry['y']:.3f})")
+    print("="*70)
+
+
+def main(argv=None):
+    """Command-line interface"""
+    parser = argparse.ArgumentParser(description='Match new DXF POINTs to existing room labels by position')
+    parser.add_argument('floor', help='Floor name (basement, floor_1, floor_2, ...)')
+    parser.add_argument('--dxf', default=None, help="DXF to sync from (default: the floor's manifest DXF)")
+    parser.add_argument('--threshold', type=float, default=MATCH_THRESHOLD,
+                        help=f'Maximum move in DXF units to keep a label (default {MATCH_THRESHOLD})')
+    parser.add_argument('--dry-run', action='store_true', help='Report only; do not rewrite the labels CSV')
+    parser.add_argument('--report', default=None, help='Also write the report as JSON')
+    args = parser.parse_args(argv)
+
+    floor_name = args.floor.lower()
+    try:
+        labels_file, dxf_file = floor_sync_files(floor_name)
+        rows, report = sync_labels(labels_file, args.dxf or dxf_file, args.threshold)
+    except (OSError, ValueError) as e:
+        print(f"\n[ERROR] {e}")
+        sys.exit(1)
+
+    print_report(floor_name, report)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"[OK] Report saved to {args.report}")
+    if args.dry_run:
+        print("[OK] Dry run, labels unchanged")
+        return
+    with open(labels_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=TEMPLATE_FIELDS, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"[OK] Updated {os.path.basename(labels_file)} with {len(rows)} points")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Tests for campus_router.py on the two-building fixture (data/fixtures/campus_two_buildings.json)
+
+Run: python -m pytest src/test_campus_router.py
+"""
+
+from unittest import mock
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import campus_router
+from campus_router import CampusRouter
+from pathfinding import BASE_DIR
+
+
+FIXTURE = os.path.join(BASE_DIR, 'data', 'fixtures', 'campus_two_buildings.json')
+
+
+class CampusRouterTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.router = CampusRouter(FIXTURE)
+
+    def route(self, **options):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.router.find_route('scott_lab', 'floor_1', 'E100', 'annex', 'floor_1', 'E125', **options)
+
+    def test_fixture_entrances(self):
+        self.assertEqual(sorted(self.router.building_entrances('annex')), ['annex:W101E', 'annex:W102E'])
+        self.assertFalse(self.router.is_home('annex'))
+        self.assertTrue(self.router.is_home('scott_lab'))
+
+    def test_route_through_outdoor_leg(self):
+        result = self.route()
+        self.assertEqual([leg['type'] for leg in result['legs']], ['indoor', 'outdoor', 'indoor'])
+        first, outdoor, last = result['legs']
+        self.assertEqual((first['building'], last['building']), ('scott_lab', 'annex'))
+        self.assertEqual(outdoor['points'][0]['id'], result['entrances']['exit'])
+        self.assertEqual(outdoor['points'][-1]['id'], result['entrances']['arrive'])
+        self.assertIn('quad', [point['id'] for point in outdoor['points']])
+        self.assertEqual(first['route']['end_room'], self.router.entrances[result['entrances']['exit']]['room'])
+        self.assertEqual(last['route']['start_room'], self.router.entrances[result['entrances']['arrive']]['room'])
+        self.assertAlmostEqual(result['total_distance'], first['route']['total_distance'] + outdoor['distance']
+                               + last['route']['total_distance'], places=6)
+
+    def test_ada_route_avoids_steps(self):
+        self.assertEqual(self.route()['entrances']['arrive'], 'annex:W102E')
+        ada = self.route(ada_compliance=True)
+        self.assertEqual(ada['entrances']['arrive'], 'annex:W101E')
+        self.assertGreater(ada['total_distance'], self.route()['total_distance'])
+
+    def test_floor_rebuilt_when_files_change(self):
+        self.route()
+        key = ('annex', 'floor_1')
+        built = self.router._floors[key][1]
+        self.route()
+        self.assertIs(self.router._floors[key][1], built)
+
+        with mock.patch.object(campus_router, 'files_fingerprint', return_value='changed'):
+            self.route()
+        self.assertIsNot(self.router._floors[key][1], built)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests for the departure-time handling in crowd_weights.py
+
+Run: python -m pytest src/test_crowd_weights.py
+"""
+
+from datetime import datetime, timezone
+from unittest import mock
+from zoneinfo import ZoneInfo
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import crowd_weights
+from crowd_weights import parse_departure, slot_key
+
+
+NEW_YORK = ZoneInfo('America/New_York')
+
+
+class DepartureTimeTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(crowd_weights, 'CAMPUS_TZ', NEW_YORK)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_utc_instant_uses_campus_slot(self):
+        # 14:10 UTC on Monday 2025-10-20 is 10:10 EDT
+        departure = parse_departure('2025-10-20T14:10:00+00:00')
+        self.assertEqual(departure.tzinfo, NEW_YORK)
+        self.assertEqual((departure.hour, departure.minute), (10, 10))
+        self.assertEqual(slot_key(departure), (0, 122))
+
+    def test_utc_instant_in_standard_time(self):
+        # 15:10 UTC on Monday 2025-12-01 is 10:10 EST
+        self.assertEqual(slot_key(parse_departure('2025-12-01T15:10:00Z')), (0, 122))
+
+    def test_slot_key_converts_aware_datetimes(self):
+        # Saturday 02:30 UTC is still Friday evening on campus
+        moment = datetime(2025, 10, 25, 2, 30, tzinfo=timezone.utc)
+        self.assertEqual(slot_key(moment), (4, (22 * 60 + 30) // crowd_weights.SLOT_MINUTES))
+
+    def test_naive_time_is_campus_local(self):
+        self.assertEqual(slot_key(parse_departure('2025-10-20T10:10')), (0, 122))
+
+    def test_now_is_campus_time(self):
+        frozen = datetime(2025, 10, 20, 14, 10, tzinfo=timezone.utc)
+        with mock.patch.object(crowd_weights, 'datetime', wraps=datetime) as clock:
+            clock.now.side_effect = lambda tz=None: frozen.astimezone(tz)
+            departure = parse_departure('now')
+        self.assertEqual(departure.tzinfo, NEW_YORK)
+        self.assertEqual(slot_key(departure), (0, 122))
+
+    def test_invalid_time(self):
+        with self.assertRaises(ValueError):
+            parse_departure('next tuesday')
+
+
+if __name__ == '__main__':
+    unittest.main()
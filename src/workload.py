@@ -0,0 +1,59 @@
+"""
+Workload Capture
+Compact JSON-lines log of routing API requests for offline replay
+"""
+
+import json
+import threading
+import time
+
+
+# Endpoints worth replaying (static files and debug routes are skipped)
+CAPTURED_ENDPOINTS = ('/api/pathfinding', '/api/find-closest-node')
+
+
+class WorkloadRecorder:
+    """
+    Appends one line per captured request: {"t": seconds since start, "path": ..., "args": {...}}
+
+    Lines are flushed as they are written so a crashed or killed server still
+    leaves a usable log. Safe to share between request threads.
+    """
+
+    def __init__(self, log_file, endpoints=CAPTURED_ENDPOINTS):
+        self.log_file = log_file
+        self.endpoints = set(endpoints)
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._file = open(log_file, 'a')
+        self.count = 0
+
+    def record(self, path, args):
+        """Record one request if its endpoint is captured"""
+        if path not in self.endpoints:
+            return False
+        line = json.dumps({
+            't': round(time.time() - self.started, 3),
+            'path': path,
+            'args': dict(args)
+        }, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.count += 1
+        return True
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def load_workload(log_file):
+    """Read a captured workload as a list of {'t', 'path', 'args'} dicts"""
+    entries = []
+    with open(log_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    return entries